@@ -0,0 +1,100 @@
+# brand_navigator/agents/clients.py
+
+import atexit
+import functools
+import hashlib
+import importlib.util
+import logging
+
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# The openai package (and the pydantic/anyio stack under it) is imported on first use rather than at startup:
+# app boot and test collection don't pay for it until an LLM call is actually made.
+# The agents check `openai_available` and report a missing library themselves.
+openai_available = importlib.util.find_spec("openai") is not None
+_openai = None
+
+
+def import_openai():
+    """Returns the `openai` module, importing it on the first call."""
+    global _openai
+    if _openai is None:
+        import openai
+        _openai = openai
+    return _openai
+
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None # Token counts are then estimated at ~4 characters per token
+
+try:
+    import httpx
+except ImportError:
+    httpx = None # OpenAI clients then manage their own default connection pools
+
+# HTTP/2 lets concurrent requests share one connection; httpx only enables it when `h2` is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Pool sizing shared by the sync and async OpenAI transports
+_LIMITS = dict(max_connections=64, max_keepalive_connections=32)
+
+# Persistent connection pool shared by every sync OpenAI client built here (evaluator and QA alike),
+# so repeated calls reuse open TCP/TLS connections instead of handshaking per call.
+_HTTPX = None
+if openai_available and httpx:
+    _HTTPX = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(**_LIMITS),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    )
+    atexit.register(_HTTPX.close)
+
+
+# Sync clients keyed by the SHA-256 of their API key, so the raw key never appears in cache
+# keys, reprs or tracebacks (unlike an lru_cache on the key itself)
+_CLIENTS = TTLCache(maxsize=16)
+
+
+def build_openai_client(api_key: str):
+    """Returns the cached OpenAI client for this key, building it on the shared connection pool on first use."""
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    client = _CLIENTS.get(key_hash)
+    if client is None:
+        client = import_openai().OpenAI(api_key=api_key, http_client=_HTTPX)
+        _CLIENTS.set(key_hash, client)
+    return client
+
+
+def build_async_openai_client(api_key: str):
+    """
+    Builds a new AsyncOpenAI client with a tuned connection pool. Async pools are bound to the event loop
+    that opened them, so these are not cached: callers create one per batch and close it when done.
+    """
+    http_client = None
+    if httpx:
+        http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(**_LIMITS),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+    return import_openai().AsyncOpenAI(api_key=api_key, http_client=http_client)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoder(model: str):
+    """Loads (once per model, shared by every agent) the tiktoken encoding; loading the BPE ranks is slow."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base") # Unknown model names: use the GPT-4o encoding
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Counts tokens with the model's tiktoken encoding, or estimates them if tiktoken is missing."""
+    if tiktoken is None:
+        return len(text) // 4
+    return len(_get_encoder(model).encode(text))
@@ -1,18 +1,160 @@
+import asyncio
+import dataclasses
+import datetime
+import decimal
+import hashlib
 import logging
 import os
 import json
+import random
+import re
+import string
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from agents.clients import build_async_openai_client, build_openai_client, count_tokens, import_openai, openai_available
+from utils.cache import SemanticCache, TTLCache
+
+# Logging is configured by the application (or the __main__ block below)
 logger = logging.getLogger(__name__)
 
+# openai itself is imported lazily (on the first client or error), see agents.clients
+if not openai_available:
+    logger.warning("OpenAI library not found. Please install it (`pip install openai`). EvaluatorAgent will not function.")
+
 try:
-    from openai import OpenAI, RateLimitError, APIError
-    openai_available = True
+    import orjson
 except ImportError:
-    openai_available = False
-    logger.warning("OpenAI library not found. Please install it (`pip install openai`). EvaluatorAgent will not function.")
-    OpenAI = None # Define OpenAI as None if import fails
+    orjson = None # Falls back to the stdlib json module
+
+# Response parser; orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared
+_loads = orjson.loads if orjson else json.loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None # Responses are then validated with the dict-based checks only
+
+try:
+    import ijson
+except ImportError:
+    ijson = None # Streamed evaluations then report fields once the full response has arrived
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None # Persistent evaluation cache is optional; the in-memory LRU still applies
+
+try:
+    from dotenv import load_dotenv
+    # Same .env as app.py (repo root), so the default key is known even when the agent is used standalone
+    load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+except ImportError:
+    pass # Environment variables set by the shell still apply
+
+# Environment key, read once at import; used whenever a caller passes no key of its own
+_DEFAULT_API_KEY = os.environ.get("OPENAI_API_KEY")
+
+# Where evaluations are persisted across runs (only used when `diskcache` is installed)
+EVAL_CACHE_DIR = os.path.expanduser(os.getenv("BRANDNAV_EVAL_CACHE_DIR", "~/.cache/brandnav_eval"))
+
+def _retryable_errors() -> tuple:
+    """
+    Errors worth retrying (429s, dropped connections, 5xx). A function rather than a constant so openai
+    is only imported once an exception is actually being matched (except clauses evaluate lazily).
+    """
+    openai = import_openai()
+    return (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def _normalize(value):
+    """
+    Recursively converts research data to plain JSON types in one pass: datetimes become ISO 8601 strings,
+    Decimals become floats, dataclasses become dicts and sets/tuples become lists. Serializers can then
+    run without a per-value `default=` callback, and the model always sees the same formatting.
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(v) for v in value), key=str) # Stable order keeps prompts (and cache keys) stable
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _normalize(dataclasses.asdict(value))
+    return str(value) # Anything else is rendered as text, as json.dumps(default=str) used to do
+
+
+# The model answers with short keys (fewer output tokens, which dominate latency); they are
+# expanded to the public names before anything leaves this module
+_SHORT_KEYS = {
+    "la": "linguistic_analysis",
+    "md": "memorability_distinctiveness",
+    "rel": "relevance",
+    "av": "availability_summary",
+    "s": "overall_score",
+}
+
+# Analysis texts kept from responses whose keys don't match the schema (see `_parse_evaluation`)
+_TEXT_FIELDS = frozenset(name for name in _SHORT_KEYS.values() if name != "overall_score")
+
+# Salvages the score from responses whose keys don't match the schema
+_SCORE_RE = re.compile(rb'"(?:s|overall_score)"\s*:\s*(\d+)')
+
+if msgspec:
+    class EvaluationResult(msgspec.Struct, forbid_unknown_fields=True):
+        """
+        Schema of a valid evaluation. Decoding validates the (short) keys, coerces the score and
+        expands the names in one C pass.
+        """
+        linguistic_analysis: str = msgspec.field(name="la")
+        memorability_distinctiveness: str = msgspec.field(name="md")
+        relevance: str = msgspec.field(name="rel")
+        availability_summary: str = msgspec.field(name="av")
+        overall_score: int = msgspec.field(name="s")
+
+    # strict=False coerces e.g. "7" -> 7, matching the int() cast of the dict-based path
+    _EVALUATION_DECODER = msgspec.json.Decoder(EvaluationResult, strict=False)
+else:
+    _EVALUATION_DECODER = None
+
+
+class _AsyncRateLimiter:
+    """
+    Token bucket that paces requests and prompt tokens per minute, modelled on the
+    OpenAI cookbook's `api_request_parallel_processor.py`. Must be created inside the running event loop.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self._requests_available = float(max_requests_per_minute)
+        self._tokens_available = float(max_tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, token_cost: int):
+        """Waits until both buckets have capacity for one request of `token_cost` tokens."""
+        token_cost = min(token_cost, self.max_tokens_per_minute) # Never wait on a request larger than the bucket
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last_update
+                self._last_update = now
+                self._requests_available = min(self.max_requests_per_minute, self._requests_available + self.max_requests_per_minute * elapsed / 60)
+                self._tokens_available = min(self.max_tokens_per_minute, self._tokens_available + self.max_tokens_per_minute * elapsed / 60)
+                if self._requests_available >= 1 and self._tokens_available >= token_cost:
+                    self._requests_available -= 1
+                    self._tokens_available -= token_cost
+                    return
+            await asyncio.sleep(0.05)
+
 
 class EvaluatorAgent:
     """
@@ -20,147 +162,614 @@ class EvaluatorAgent:
     using an LLM (e.g., GPT-4o).
     """
 
-    def __init__(self, model: str = "gpt-4o"):
+    # Static prompt scaffolding, built once at class creation; see _construct_prompt
+    _PROMPT_TEMPLATE = (
+        "**Brand Name Evaluation Request**\n"
+        "\n"
+        "**Brand Name:** {brand_name}\n"
+        "\n"
+        "**Market Research Summary:**\n"
+        "Please evaluate the brand name '{brand_name}' based on the following market research data. Consider aspects like:\n"
+        "1.  **Linguistic Qualities:** Is it easy to pronounce, spell, and remember? Does it sound appealing? Any potential negative connotations (globally or culturally)?\n"
+        "2.  **Memorability & Distinctiveness:** How memorable and unique is the name itself? How does its distinctiveness compare considering the potential conflicts found in the research data?\n"
+        "3.  **Relevance:** Does the name hint at the potential product/service category or target audience? Is it abstract or descriptive? (State assumptions if made).\n"
+        "4.  **Availability Issues:** Briefly summarize the potential conflicts found in web search, social media, domains, and trademarks based *only* on the provided data. Assess the likely severity (e.g., high conflict if exact .com and social handles taken, low if only obscure mentions).\n"
+        "5.  **Overall Potential Score:** Provide an overall potential score from 1 (very poor) to 10 (excellent), considering all factors, especially availability.\n"
+        "\n"
+        "**Research Data (JSON):**\n"
+        "```json\n"
+        "{research_json}\n"
+        "```\n"
+        "Note: 'potentially_available' domain status means it might be available but requires manual verification.\n"
+        "Note: Trademark check via web search is basic; 'potential_conflict_found_on_site' requires deeper investigation.\n"
+        "\n"
+        "**Evaluation Output Format:**\n"
+        "Provide your evaluation strictly in JSON format with the following keys ONLY:\n"
+        "- \"la\" (string: detailed linguistic analysis)\n"
+        "- \"md\" (string: memorability & distinctiveness analysis)\n"
+        "- \"rel\" (string: relevance analysis, state assumptions if made)\n"
+        "- \"av\" (string: availability summary of potential issues based on data and severity assessment)\n"
+        "- \"s\" (integer: overall score 1-10)\n"
+        "\n"
+        "**JSON Evaluation Output:**\n"
+    )
+    # The template pre-parsed into (literal, field) pairs, so building a prompt is a single join
+    # instead of re-scanning the format string on every call
+    _PROMPT_PARTS = tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(_PROMPT_TEMPLATE))
+
+    # Shared by every request; treat as read-only (a plain dict so the SDK and json.dumps can serialize it)
+    _SYSTEM_MSG = {"role": "system", "content": "You are an AI assistant specialized in brand name evaluation. Provide analysis strictly in the requested JSON format."}
+
+    def __init__(self, model: str = "gpt-4o", max_attempts: int = 5,
+                 max_requests_per_minute: int = 500, max_tokens_per_minute: int = 30000,
+                 cache_size: int = 512, cache_dir: str | None = EVAL_CACHE_DIR, compact: bool = True,
+                 max_input_tokens: int = 12000, semantic_threshold: float | None = None,
+                 embedding_model: str = "text-embedding-3-small"):
         """
         Initialize the Evaluator Agent.
         (OpenAI client is no longer initialized here)
 
         Args:
             model (str): The OpenAI model to use for evaluation.
+            max_attempts (int): Attempts per brand before giving up on rate-limit/transient errors.
+            max_requests_per_minute (int): Request budget used to pace `evaluate_batch`.
+            max_tokens_per_minute (int): Prompt-token budget used to pace `evaluate_batch`.
+            cache_size (int): Number of evaluations kept in the in-memory response cache.
+            cache_dir (str | None): Directory for the persistent response cache (requires `diskcache`). None disables it.
+            compact (bool): Embed research data as compact JSON (fewer input tokens). Set False to indent it for debugging.
+            max_input_tokens (int): Prompt token cap; larger research data is trimmed before sending.
+            semantic_threshold (float | None): Enables the semantic cache: on an exact-cache miss, reuse the
+                evaluation of the same brand whose research embedding has at least this cosine similarity
+                (e.g. 0.97). None (default) disables it.
+            embedding_model (str): OpenAI embedding model used by the semantic cache.
         """
         # self.client = None # Client will be created per-request
         self.model = model
+        self.max_attempts = max_attempts
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.compact = compact
+        self.max_input_tokens = max_input_tokens
+        # Response cache keyed by SHA-256 of model + prompts: repeat evaluations cost no tokens or round trips
+        self._cache = TTLCache(maxsize=cache_size)
+        self.embedding_model = embedding_model
+        # Near-duplicate cache: catches re-runs whose research differs only by noise (reordered links, new snippets)
+        self._semantic_cache = SemanticCache(maxsize=cache_size, threshold=semantic_threshold) if semantic_threshold else None
+        self._disk_cache = None
+        if diskcache and cache_dir:
+            try:
+                self._disk_cache = diskcache.Cache(cache_dir)
+            except Exception as e:
+                logger.warning("Could not open persistent evaluation cache at %s: %s", cache_dir, e)
         if not openai_available:
              logger.error("EvaluatorAgent cannot run: OpenAI library is missing.")
              self.model = None # Indicate agent is unusable
              return
-        logger.info(f"EvaluatorAgent initialized, will use model: {self.model}")
+        logger.info("EvaluatorAgent initialized, will use model: %s", self.model)
 
     def _get_openai_client(self, api_key: str | None):
          """Safely creates an OpenAI client with the provided key."""
          if not openai_available:
              logger.error("OpenAI library not available.")
              return None
+         api_key = api_key or _DEFAULT_API_KEY
+         if not api_key:
+             logger.error("OpenAI API key was not provided.")
+             return None
+         try:
+             return build_openai_client(api_key)
+         except Exception as e:
+             logger.exception("Failed to initialize OpenAI client with provided key: %s", e)
+             return None
+
+    def _get_async_openai_client(self, api_key: str | None):
+         """
+         Safely creates an AsyncOpenAI client with the provided key (one per batch, shared by its tasks).
+         Async pools are bound to the event loop that opened them, so they are not cached across batches.
+         """
+         if not openai_available:
+             logger.error("OpenAI library not available.")
+             return None
+         api_key = api_key or _DEFAULT_API_KEY
          if not api_key:
              logger.error("OpenAI API key was not provided.")
              return None
          try:
-             return OpenAI(api_key=api_key)
+             return build_async_openai_client(api_key)
          except Exception as e:
-             logger.exception(f"Failed to initialize OpenAI client with provided key: {e}")
+             logger.exception("Failed to initialize AsyncOpenAI client with provided key: %s", e)
              return None
 
+    def _serialize_research(self, research_data: dict) -> str:
+        """Serializes research data (already passed through `_normalize`) for embedding in the prompt."""
+        # Compact JSON by default: indentation costs input tokens the model doesn't need
+        if orjson:
+            option = None if self.compact else orjson.OPT_INDENT_2
+            return orjson.dumps(research_data, option=option).decode()
+        if self.compact:
+            return json.dumps(research_data, separators=(",", ":"), ensure_ascii=False)
+        return json.dumps(research_data, indent=2)
+
+    def _count_tokens(self, text: str) -> int:
+        """Counts tokens with the model's tiktoken encoding, or estimates them if tiktoken is missing."""
+        return count_tokens(text, self.model)
+
+    def _shrink(self, research_data: dict, research_json: str, budget: int) -> str:
+        """
+        Drops the least informative research fields, in priority order, until the serialized
+        data fits in `budget` tokens. Works on copies; the caller's dict is never mutated.
+        """
+        data = dict(research_data)
+        web = dict(data.get('web_search') or {})
+        social = dict(data.get('social_media_search') or {})
+        trademark = dict(data.get('trademark_check') or {})
+        data['web_search'], data['social_media_search'], data['trademark_check'] = web, social, trademark
+
+        for step in ('top_web_links', 'snippets', 'social_queries', 'trademark_details'):
+            if self._count_tokens(research_json) <= budget:
+                break
+            if step == 'top_web_links':
+                web['web_links'] = list(web.get('web_links') or [])[:10]
+            elif step == 'snippets':
+                web['web_links'] = [{k: v for k, v in link.items() if k != 'snippet'} if isinstance(link, dict) else link
+                                    for link in web.get('web_links') or []]
+            elif step == 'social_queries':
+                social.pop('queries_used', None)
+            elif step == 'trademark_details':
+                trademark['details'] = list(trademark.get('details') or [])[:2]
+            research_json = self._serialize_research(data)
+        return research_json
+
     def _construct_prompt(self, brand_name: str, research_data: dict) -> str:
-        """Constructs the prompt for the LLM evaluation."""
-        prompt = f"""
-        **Brand Name Evaluation Request**
-
-        **Brand Name:** {brand_name}
-
-        **Market Research Summary:**
-        Please evaluate the brand name '{brand_name}' based on the following market research data. Consider aspects like:
-        1.  **Linguistic Qualities:** Is it easy to pronounce, spell, and remember? Does it sound appealing? Any potential negative connotations (globally or culturally)?
-        2.  **Memorability & Distinctiveness:** How memorable and unique is the name itself? How does its distinctiveness compare considering the potential conflicts found in the research data?
-        3.  **Relevance:** Does the name hint at the potential product/service category or target audience? Is it abstract or descriptive? (State assumptions if made).
-        4.  **Availability Issues:** Briefly summarize the potential conflicts found in web search, social media, domains, and trademarks based *only* on the provided data. Assess the likely severity (e.g., high conflict if exact .com and social handles taken, low if only obscure mentions).
-        5.  **Overall Potential Score:** Provide an overall potential score from 1 (very poor) to 10 (excellent), considering all factors, especially availability.
-
-        **Research Data:**
-        ```json
-        {json.dumps(research_data, indent=2, default=str)}
-        ```
-        Note: 'potentially_available' domain status means it might be available but requires manual verification.
-        Note: Trademark check via web search is basic; 'potential_conflict_found_on_site' requires deeper investigation.
-
-        **Evaluation Output Format:**
-        Provide your evaluation strictly in JSON format with the following keys ONLY:
-        - "linguistic_analysis" (string: detailed analysis)
-        - "memorability_distinctiveness" (string: analysis)
-        - "relevance" (string: analysis, state assumptions if made)
-        - "availability_summary" (string: summary of potential issues based on data and severity assessment)
-        - "overall_score" (integer: 1-10)
-
-        **JSON Evaluation Output:**
+        """Constructs the prompt for the LLM evaluation. Only the brand name and research JSON vary per call."""
+        research_data = _normalize(research_data)
+        research_json = self._serialize_research(research_data)
+        budget = self.max_input_tokens - 400 # Headroom for the template around the data
+        original_tokens = self._count_tokens(research_json)
+        if original_tokens > budget:
+            research_json = self._shrink(research_data, research_json, budget)
+            logger.info("Trimmed research data for '%s' from %s to %s tokens.", brand_name, original_tokens, self._count_tokens(research_json))
+        values = {"brand_name": brand_name, "research_json": research_json}
+        return "".join([literal + (values[field] if field else "") for literal, field in self._PROMPT_PARTS])
+
+    def _build_messages(self, prompt: str) -> list[dict]:
+        """Builds the chat messages sent for a single evaluation."""
+        return [self._SYSTEM_MSG, {"role": "user", "content": prompt}]
+
+    def _stream_completion(self, client, messages: list[dict], on_partial) -> str:
+        """
+        Streams the completion and reports each top-level field to `on_partial(key, value)` as soon as it
+        has been fully generated (parsed incrementally with ijson). Returns the complete raw output.
         """
-        return prompt
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.4,
+            response_format={ "type": "json_object" },
+            stream=True
+        )
+        buffer = bytearray()
+        fields = ijson.sendable_list()
+        parser = ijson.kvitems_coro(fields, '')
+        for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            data = chunk.choices[0].delta.content.encode()
+            buffer.extend(data)
+            if parser is None:
+                continue
+            try:
+                parser.send(data)
+            except ijson.JSONError as e:
+                # Keep collecting; the full-response validation reports the malformed output
+                logger.debug("Incremental parse stopped: %s", e)
+                parser = None
+                continue
+            for key, value in fields:
+                on_partial(_SHORT_KEYS.get(key, key), value)
+            del fields[:]
+        return buffer.decode()
+
+    def _cache_key(self, messages: list[dict]) -> str:
+        """SHA-256 over the model name and every prompt sent, separated by NUL bytes."""
+        raw = "\x00".join([self.model] + [message["content"] for message in messages])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> dict | None:
+        """Looks up a cached evaluation, promoting disk hits into memory. Returns a copy."""
+        result = self._cache.get(key)
+        if result is None and self._disk_cache is not None:
+            result = self._disk_cache.get(key)
+            if result is not None:
+                self._cache.set(key, result)
+        return dict(result) if result is not None else None
+
+    def _cache_set(self, key: str, result: dict):
+        """Caches complete evaluations only, so errors and partial parses are retried on the next call."""
+        if result.get("error") or result.get("warning"):
+            return
+        self._cache.set(key, dict(result))
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, dict(result))
+
+    def _parse_evaluation(self, brand_name: str, llm_output_raw: str) -> dict:
+        """Parses and validates the raw LLM output into the evaluation dict (or an error dict)."""
+        if _EVALUATION_DECODER is not None:
+            try:
+                evaluation = _EVALUATION_DECODER.decode(llm_output_raw)
+                logger.info("Successfully parsed evaluation for '%s'.", brand_name)
+                return msgspec.structs.asdict(evaluation)
+            except msgspec.DecodeError:
+                pass # Fall through to the dict-based checks, which report the specific problem
+
+        try:
+            evaluation_result = _loads(llm_output_raw)
+            if not isinstance(evaluation_result, dict):
+                logger.error("LLM response for '%s' is not a JSON object. Raw: %s", brand_name, llm_output_raw)
+                return {"error": "LLM response format error (expected a JSON object).", "raw_response": llm_output_raw}
+            expected_keys = list(_SHORT_KEYS)
+            if all(key in evaluation_result for key in expected_keys) and len(evaluation_result) == len(expected_keys):
+                logger.info("Successfully parsed evaluation for '%s'.", brand_name)
+                evaluation_result = {_SHORT_KEYS[key]: value for key, value in evaluation_result.items()}
+                try:
+                    evaluation_result['overall_score'] = int(evaluation_result['overall_score'])
+                except (ValueError, TypeError):
+                    logger.warning("Could not parse 'overall_score' as integer for %s. Value: %s", brand_name, evaluation_result.get('overall_score'))
+                    return {"error": "LLM response format error (invalid overall_score type).", "raw_response": llm_output_raw}
+                return evaluation_result
+            else:
+                logger.error("LLM response for '%s' has incorrect keys. Expected: %s, Got: %s. Raw: %s", brand_name, expected_keys, list(evaluation_result.keys()), llm_output_raw)
+                # Keep the score, and whichever analyses are there, rather than discarding the whole response
+                # (and paying for a retry); unknown keys are dropped
+                match = _SCORE_RE.search(llm_output_raw.encode())
+                if match:
+                    salvaged = {_SHORT_KEYS.get(key, key): value for key, value in evaluation_result.items()
+                                if isinstance(value, str) and _SHORT_KEYS.get(key, key) in _TEXT_FIELDS}
+                    return dict(salvaged, overall_score=int(match.group(1)), warning="partial parse", raw_response=llm_output_raw)
+                return {"error": "LLM response format error (incorrect keys).", "raw_response": llm_output_raw}
 
-    def evaluate(self, brand_name: str, research_data: dict, openai_api_key: str | None) -> dict:
+        except json.JSONDecodeError as json_err:
+            logger.error("Failed to parse JSON response from LLM for '%s': %s. Raw: %s", brand_name, json_err, llm_output_raw)
+            return {"error": "Failed to parse LLM JSON response.", "raw_response": llm_output_raw}
+
+    def _embed_research(self, client, brand_name: str, research_data: dict) -> list[float] | None:
+        """
+        Embeds the brand's research data for the semantic cache (an embedding call costs a fraction of an
+        evaluation). Returns None on failure so the evaluation simply proceeds uncached.
+        """
+        text = self._serialize_research(_normalize(research_data))[:30000] # Stay within the embedding input limit
+        try:
+            return client.embeddings.create(model=self.embedding_model, input=text).data[0].embedding
+        except Exception as e:
+            logger.warning("Could not embed research data for '%s'; skipping semantic cache: %s", brand_name, e)
+            return None
+
+    def _complete_with_retries(self, client, brand_name: str, messages: list[dict], on_partial=None) -> str:
+        """
+        Sends the (already built) messages and returns the raw output, retrying rate-limit/transient
+        errors with jittered exponential backoff up to `self.max_attempts`. The last error is re-raised.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                logger.info("Sending request to OpenAI model %s for '%s' (attempt %s).", self.model, brand_name, attempt)
+                if on_partial and ijson:
+                    return self._stream_completion(client, messages, on_partial)
+                response = client.chat.completions.create( # Use the client created with the passed key
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.4,
+                    response_format={ "type": "json_object" }
+                )
+                return response.choices[0].message.content
+            except _retryable_errors() as e:
+                if attempt == self.max_attempts:
+                    raise
+                delay = min(30, 2 ** attempt) + random.uniform(0, 1)
+                logger.warning("Retryable OpenAI error for '%s': %s. Retrying in %.1fs.", brand_name, e, delay)
+                time.sleep(delay)
+
+    def evaluate(self, brand_name: str, research_data: dict, openai_api_key: str | None, use_cache: bool = True,
+                 on_partial=None) -> dict:
         """
         Evaluates the brand name using the configured LLM and the provided API key.
 
         Args:
             brand_name (str): The brand name to evaluate.
             research_data (dict): The consolidated data from MarketResearchAgent.
-            openai_api_key (str | None): The OpenAI API key to use (from session or env).
+            openai_api_key (str | None): The OpenAI API key to use (from session). None falls back to OPENAI_API_KEY.
+            use_cache (bool): Serve identical (model, prompt) requests from the response cache.
+            on_partial (callable, optional): Called as `on_partial(key, value)` for each evaluation field
+                as soon as it is available. Enables streaming; the returned dict is validated as usual.
 
         Returns:
             dict: A dictionary containing the LLM's evaluation or an error dictionary.
         """
-        logger.info(f"Starting evaluation for brand name: '{brand_name}'")
+        logger.info("Starting evaluation for brand name: '%s'", brand_name)
 
         if not self.model:
              return {"error": "EvaluatorAgent not properly initialized (OpenAI library missing)."}
 
+        if not research_data:
+            logger.warning("No research data provided for evaluating '%s'.", brand_name)
+            return {"error": "Missing research data for evaluation."}
+
+        prompt = self._construct_prompt(brand_name, research_data)
+        messages = self._build_messages(prompt)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Constructed prompt for %s (%d chars)", brand_name, len(prompt))
+
+        cache_key = self._cache_key(messages)
+        if use_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Evaluation cache hit for '%s'.", brand_name)
+                if on_partial:
+                    for key, value in cached.items():
+                        on_partial(key, value)
+                return cached
+
         client = self._get_openai_client(openai_api_key)
         if not client:
              # Error already logged by _get_openai_client
              return {"error": "Failed to create OpenAI client (check API key)."}
 
+        embedding = None
+        if use_cache and self._semantic_cache is not None:
+            embedding = self._embed_research(client, brand_name, research_data)
+            if embedding is not None:
+                cached = self._semantic_cache.get(embedding, namespace=brand_name.strip().casefold())
+                if cached is not None:
+                    logger.info("Semantic cache hit for '%s'.", brand_name)
+                    if on_partial:
+                        for key, value in cached.items():
+                            on_partial(key, value)
+                    return dict(cached)
+
+        try:
+            llm_output_raw = self._complete_with_retries(client, brand_name, messages, on_partial)
+
+            logger.info("Received response from %s for '%s'.", self.model, brand_name)
+            logger.debug("Raw LLM output: %s", llm_output_raw)
+            evaluation_result = self._parse_evaluation(brand_name, llm_output_raw)
+            if on_partial and not ijson and not evaluation_result.get("error"):
+                for key, value in evaluation_result.items(): # No incremental parser: report fields all at once
+                    on_partial(key, value)
+            self._cache_set(cache_key, evaluation_result)
+            if embedding is not None and not (evaluation_result.get("error") or evaluation_result.get("warning")):
+                self._semantic_cache.set(embedding, dict(evaluation_result), namespace=brand_name.strip().casefold())
+            return evaluation_result
+
+        except import_openai().RateLimitError as rle:
+            logger.error("OpenAI rate limit exceeded during evaluation for '%s': %s", brand_name, rle)
+            return {"error": f"OpenAI rate limit exceeded: {rle}"}
+        except import_openai().APIError as apie:
+            logger.error("OpenAI API error during evaluation for '%s': %s", brand_name, apie)
+            return {"error": f"OpenAI API error: {apie}"}
+        except Exception as e:
+            logger.exception("An unexpected error occurred during evaluation for '%s': %s", brand_name, e)
+            return {"error": f"An unexpected error occurred during evaluation: {str(e)}"}
+
+    def evaluate_many(self, pairs, openai_api_key: str | None, max_workers: int = 16) -> dict:
+        """
+        Evaluates many brand names concurrently from synchronous code (scripts, notebooks, Flask views).
+        Each call blocks on network I/O with the GIL released, so threads overlap the requests, and the
+        workers share the pooled sync client. Async callers should prefer `evaluate_batch`.
+
+        Args:
+            pairs: Iterable of (brand_name, research_data) tuples. Brand names must be unique.
+            openai_api_key (str | None): The OpenAI API key to use.
+            max_workers (int): Maximum number of evaluations in flight at once.
+
+        Returns:
+            dict: Maps each brand name to its evaluation (or error) dictionary.
+        """
+        pairs = dict(pairs)
+        if not pairs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            futures = {executor.submit(self.evaluate, name, research_data, openai_api_key): name
+                       for name, research_data in pairs.items()}
+            return {futures[future]: future.result() for future in as_completed(futures)}
+
+    async def _evaluate_one(self, client, brand_name: str, research_data: dict,
+                            semaphore: asyncio.Semaphore, limiter: _AsyncRateLimiter | None = None,
+                            use_cache: bool = True) -> dict:
+        """
+        Async counterpart of `evaluate` for a single brand, sharing the batch's client, semaphore and limiter.
+        Retries rate-limit/transient errors with exponential backoff up to `self.max_attempts`.
+        """
         if not research_data:
-            logger.warning(f"No research data provided for evaluating '{brand_name}'.")
+            logger.warning("No research data provided for evaluating '%s'.", brand_name)
             return {"error": "Missing research data for evaluation."}
 
         prompt = self._construct_prompt(brand_name, research_data)
-        logger.debug(f"Constructed prompt for {brand_name}")
+        messages = self._build_messages(prompt)
+        cache_key = self._cache_key(messages)
+        if use_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Evaluation cache hit for '%s'.", brand_name)
+                return cached
+
+        async with semaphore:
+            for attempt in range(1, self.max_attempts + 1):
+                if limiter:
+                    await limiter.acquire(len(prompt) // 4) # Rough chars-per-token estimate
+                try:
+                    logger.info("Sending async request to OpenAI model %s for '%s' (attempt %s).", self.model, brand_name, attempt)
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0.4,
+                        response_format={ "type": "json_object" }
+                    )
+                    llm_output_raw = response.choices[0].message.content
+                    logger.debug("Raw LLM output: %s", llm_output_raw)
+                    evaluation_result = self._parse_evaluation(brand_name, llm_output_raw)
+                    self._cache_set(cache_key, evaluation_result)
+                    return evaluation_result
+                except _retryable_errors() as e:
+                    if attempt == self.max_attempts:
+                        logger.error("Giving up on '%s' after %s attempts: %s", brand_name, attempt, e)
+                        return {"error": f"OpenAI request failed after {attempt} attempts: {e}"}
+                    delay = min(30, 2 ** attempt) + random.uniform(0, 1)
+                    logger.warning("Retryable OpenAI error for '%s': %s. Retrying in %.1fs.", brand_name, e, delay)
+                    await asyncio.sleep(delay)
+                except import_openai().APIError as apie:
+                    logger.error("OpenAI API error during evaluation for '%s': %s", brand_name, apie)
+                    return {"error": f"OpenAI API error: {apie}"}
+                except Exception as e:
+                    logger.exception("An unexpected error occurred during evaluation for '%s': %s", brand_name, e)
+                    return {"error": f"An unexpected error occurred during evaluation: {str(e)}"}
+
+    async def evaluate_async(self, brand_name: str, research_data: dict, openai_api_key: str | None,
+                             use_cache: bool = True) -> dict:
+        """Evaluates a single brand name without blocking the event loop."""
+        results = await self.evaluate_batch([brand_name], {brand_name: research_data}, openai_api_key, use_cache=use_cache)
+        return results[brand_name]
+
+    async def evaluate_batch(self, names: list[str], data_map: dict, openai_api_key: str | None,
+                             max_concurrency: int | None = None, use_cache: bool = True) -> dict:
+        """
+        Evaluates many brand names concurrently, bounded by a semaphore and paced by the RPM/TPM limiter.
+
+        Args:
+            names (list[str]): Brand names to evaluate.
+            data_map (dict): Maps each brand name to its research data.
+            openai_api_key (str | None): The OpenAI API key to use.
+            max_concurrency (int | None): In-flight request cap. Defaults to the OPENAI_CONCURRENCY env var (20).
+            use_cache (bool): Serve identical (model, prompt) requests from the response cache.
+
+        Returns:
+            dict: Maps each brand name to its evaluation (or error) dictionary.
+        """
+        if not self.model:
+             error = {"error": "EvaluatorAgent not properly initialized (OpenAI library missing)."}
+             return {name: dict(error) for name in names}
+
+        client = self._get_async_openai_client(openai_api_key)
+        if not client:
+             error = {"error": "Failed to create OpenAI client (check API key)."}
+             return {name: dict(error) for name in names}
 
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("OPENAI_CONCURRENCY", "20"))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        limiter = _AsyncRateLimiter(self.max_requests_per_minute, self.max_tokens_per_minute)
+
+        logger.info("Starting batch evaluation of %s brand names (concurrency %s).", len(names), max_concurrency)
         try:
-            logger.info(f"Sending request to OpenAI model: {self.model}")
-            response = client.chat.completions.create( # Use the client created with the passed key
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an AI assistant specialized in brand name evaluation. Provide analysis strictly in the requested JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.4,
-                response_format={ "type": "json_object" }
-            )
+            tasks = [self._evaluate_one(client, name, data_map.get(name), semaphore, limiter, use_cache) for name in names]
+            results = await asyncio.gather(*tasks)
+        finally:
+            await client.close()
+        logger.info("Completed batch evaluation of %s brand names.", len(names))
+        return dict(zip(names, results))
 
-            llm_output_raw = response.choices[0].message.content
-            logger.info(f"Received response from {self.model} for '{brand_name}'.")
-            logger.debug(f"Raw LLM output: {llm_output_raw}")
+    def evaluate_offline_batch(self, pairs, openai_api_key: str | None, poll_interval: float = 10.0,
+                               max_poll_interval: float = 300.0, max_wait: float = 24 * 3600) -> dict:
+        """
+        Evaluates many brand names through the OpenAI Batch API (half price, no RPM throttling,
+        results within 24h). Intended for non-interactive jobs such as nightly scoring or CSV ingests.
 
-            try:
-                evaluation_result = json.loads(llm_output_raw)
-                expected_keys = ["linguistic_analysis", "memorability_distinctiveness", "relevance", "availability_summary", "overall_score"]
-                if all(key in evaluation_result for key in expected_keys) and len(evaluation_result) == len(expected_keys):
-                    logger.info(f"Successfully parsed evaluation for '{brand_name}'.")
-                    try:
-                        evaluation_result['overall_score'] = int(evaluation_result['overall_score'])
-                    except (ValueError, TypeError):
-                        logger.warning(f"Could not parse 'overall_score' as integer for {brand_name}. Value: {evaluation_result.get('overall_score')}")
-                        return {"error": "LLM response format error (invalid overall_score type).", "raw_response": llm_output_raw}
-                    return evaluation_result
-                else:
-                    logger.error(f"LLM response for '{brand_name}' has incorrect keys. Expected: {expected_keys}, Got: {list(evaluation_result.keys())}. Raw: {llm_output_raw}")
-                    return {"error": "LLM response format error (incorrect keys).", "raw_response": llm_output_raw}
+        Args:
+            pairs: Iterable of (brand_name, research_data) tuples. Brand names must be unique.
+            openai_api_key (str | None): The OpenAI API key to use.
+            poll_interval (float): Initial delay between status polls, doubled up to `max_poll_interval`.
+            max_poll_interval (float): Upper bound for the polling delay, in seconds.
+            max_wait (float): Give up (and report errors) after this many seconds.
 
-            except json.JSONDecodeError as json_err:
-                logger.error(f"Failed to parse JSON response from LLM for '{brand_name}': {json_err}. Raw: {llm_output_raw}")
-                return {"error": "Failed to parse LLM JSON response.", "raw_response": llm_output_raw}
+        Returns:
+            dict: Maps each brand name to its evaluation (or error) dictionary.
+        """
+        pairs = dict(pairs)
+        if not self.model:
+             return {name: {"error": "EvaluatorAgent not properly initialized (OpenAI library missing)."} for name in pairs}
+
+        client = self._get_openai_client(openai_api_key)
+        if not client:
+             return {name: {"error": "Failed to create OpenAI client (check API key)."} for name in pairs}
+
+        results = {}
+        cache_keys = {}
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as batch_input:
+            for name, research_data in pairs.items():
+                if not research_data:
+                    results[name] = {"error": "Missing research data for evaluation."}
+                    continue
+                messages = self._build_messages(self._construct_prompt(name, research_data))
+                cache_keys[name] = self._cache_key(messages)
+                cached = self._cache_get(cache_keys[name])
+                if cached is not None:
+                    results[name] = cached
+                    continue
+                request = {
+                    "custom_id": name,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": messages,
+                        "temperature": 0.4,
+                        "response_format": { "type": "json_object" }
+                    }
+                }
+                batch_input.write(json.dumps(request) + "\n")
+            input_path = batch_input.name
+
+        pending = [name for name in pairs if name not in results]
+        if not pending:
+            os.remove(input_path)
+            return results
+
+        try:
+            logger.info("Submitting %s evaluations to the OpenAI Batch API.", len(pending))
+            with open(input_path, "rb") as f:
+                batch_file = client.files.create(file=f, purpose="batch")
+            batch = client.batches.create(input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+
+            delay = poll_interval
+            deadline = time.monotonic() + max_wait
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch {batch.id} still '{batch.status}' after {max_wait}s")
+                time.sleep(delay)
+                delay = min(delay * 2, max_poll_interval)
+                batch = client.batches.retrieve(batch.id)
+                logger.info("Batch %s status: %s", batch.id, batch.status)
+
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+
+            output = client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = _loads(line)
+                name = record.get("custom_id")
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    results[name] = {"error": f"Batch request failed: {record.get('error') or response.get('body')}"}
+                    continue
+                llm_output_raw = response["body"]["choices"][0]["message"]["content"]
+                results[name] = self._parse_evaluation(name, llm_output_raw)
+                self._cache_set(cache_keys[name], results[name])
 
-        except RateLimitError as rle:
-            logger.error(f"OpenAI rate limit exceeded during evaluation for '{brand_name}': {rle}")
-            return {"error": f"OpenAI rate limit exceeded: {rle}"}
-        except APIError as apie:
-            logger.error(f"OpenAI API error during evaluation for '{brand_name}': {apie}")
-            return {"error": f"OpenAI API error: {apie}"}
         except Exception as e:
-            logger.exception(f"An unexpected error occurred during evaluation for '{brand_name}': {e}")
-            return {"error": f"An unexpected error occurred during evaluation: {str(e)}"}
+            logger.exception("OpenAI batch evaluation failed: %s", e)
+            for name in pending:
+                results.setdefault(name, {"error": f"Batch evaluation failed: {str(e)}"})
+        finally:
+            os.remove(input_path)
+
+        for name in pending:
+            results.setdefault(name, {"error": "No result returned by the batch job."})
+        return results
 
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
-    # Ensure OPENAI_API_KEY is set in your environment variables or .env file
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Ensure OPENAI_API_KEY is set in your environment variables or .env file (passing None uses it)
     if not openai_available:
         print("OpenAI library not installed. Skipping EvaluatorAgent tests.")
     else:
@@ -217,7 +826,7 @@ if __name__ == '__main__':
             }
 
             print(f"--- Evaluating Brand: {dummy_research_innovatenow['brand_name']} ---")
-            evaluation_results = evaluator.evaluate(dummy_research_innovatenow['brand_name'], dummy_research_innovatenow, os.getenv("OPENAI_API_KEY"))
+            evaluation_results = evaluator.evaluate(dummy_research_innovatenow['brand_name'], dummy_research_innovatenow, None)
             print("\n--- Evaluation Results (InnovateNow) ---")
             print(json.dumps(evaluation_results, indent=2))
 
@@ -262,6 +871,6 @@ if __name__ == '__main__':
               "error": None
             }
             print(f"\n--- Evaluating Brand: {dummy_research_zyxosphere['brand_name']} ---")
-            evaluation_results_2 = evaluator.evaluate(dummy_research_zyxosphere['brand_name'], dummy_research_zyxosphere, os.getenv("OPENAI_API_KEY"))
+            evaluation_results_2 = evaluator.evaluate(dummy_research_zyxosphere['brand_name'], dummy_research_zyxosphere, None)
             print("\n--- Evaluation Results (ZyxoSphere) ---")
             print(json.dumps(evaluation_results_2, indent=2))
@@ -1,10 +1,25 @@
+import asyncio
+import copy
+import dataclasses
+import functools
+import hashlib
+import json
 import logging
 import os
+import random
+import re
+import sqlite3
+import threading
 import time # Import time for potential delays/rate limiting
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
 import requests # Add requests import
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Configure logging FIRST
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from utils.cache import TTLCache
+
+# Logging is configured by the application (or the __main__ block below)
 logger = logging.getLogger(__name__)
 
 try:
@@ -13,6 +28,24 @@ except ImportError:
     whois = None # Handle case where library is not installed
     # Now logger is defined, so this will work:
     logger.error("`python-whois` library not found. Please install it (`pip install python-whois`). Domain checks will be skipped.")
+
+try:
+    import asyncwhois
+except ImportError:
+    asyncwhois = None # Async domain checks then run python-whois on the WHOIS thread pool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None # Falls back to the stdlib json module
+
+# Brave response parser (orjson decodes straight from bytes in C)
+_loads = orjson.loads if orjson else json.loads
+
+try:
+    import httpx
+except ImportError:
+    httpx = None # research() then runs every check sequentially with `requests`
 # We might need libraries for web requests, web scraping, or specific APIs
 # import requests
 # from bs4 import BeautifulSoup
@@ -20,129 +53,443 @@ except ImportError:
 # from some_social_media_api import SocialMediaClient
 # from mcp_tool_imports import brave_web_search # Hypothetical import for the tool
 
+# Persistent WHOIS cache shared across runs (set BRANDNAV_WHOIS_CACHE to relocate it)
+WHOIS_CACHE_PATH = os.path.expanduser(os.getenv("BRANDNAV_WHOIS_CACHE", "~/.cache/brandnav_whois.sqlite"))
+
+# Trademark database searched (via a site: web query) per country code: (site, label shown in reports)
+_TM_TARGETS = {
+    'US': ('tess2.uspto.gov', 'USPTO TESS (via web search)'),
+    # TODO: Add other countries (e.g. 'EU': ('euipo.europa.eu', 'EUIPO (via web search)'))
+}
+
+# Characters stripped from brand names to form the base domain ([\W_] keeps Unicode letters/digits, like str.isalnum)
+_NON_ALNUM = re.compile(r'[\W_]+')
+
+# --- Brave query templates ---
+# Every query this agent sends is built from these, so the set of cached queries is enumerable.
+_WEB_QUERY_TMPL = '"{brand}" brand OR company OR official website'
+_TM_QUERY_TMPL = 'site:{site} "{brand}"'
+
+# Targeted query per social platform (fallback for the combined query below)
+_PLATFORM_TEMPLATES = [
+    ('Twitter', 'site:twitter.com "{brand}"'),
+    ('Instagram', 'site:instagram.com "{brand}"'),
+    ('Facebook', 'site:facebook.com "{brand}"'),
+    ('LinkedIn (Company)', 'site:linkedin.com/company/ "{brand}"'),
+    ('LinkedIn (General)', 'site:linkedin.com "{brand}" -site:linkedin.com/company/'),
+]
+
+# Results requested per fallback platform query: the site:-scoped top hit decides present vs. not
+_PLATFORM_RESULT_COUNT = 1
+
+# One compound query covers every platform above; hits are bucketed back to platforms by URL
+_SOCIAL_COMBINED_TEMPLATE = '"{brand}" (site:twitter.com OR site:x.com OR site:instagram.com OR site:facebook.com OR site:linkedin.com)'
+
+# Result host (without www./m.) -> platform bucket for the combined query; LinkedIn is split by path
+_SOCIAL_HOSTS = {
+    'twitter.com': 'Twitter',
+    'x.com': 'Twitter',
+    'mobile.twitter.com': 'Twitter',
+    'instagram.com': 'Instagram',
+    'facebook.com': 'Facebook',
+}
+
+
+
+# Checked by default by check_domain_availability; each TLD is served by a different registry
+_DEFAULT_TLDS = ('.com', '.co', '.io', '.ai', '.org', '.net')
+
+# Brave responses retried with backoff (honoring Retry-After) before a check is reported as failed
+_BRAVE_RETRY_STATUSES = (429, 500, 502, 503, 504)
+_BRAVE_MAX_RETRIES = 5
+_BRAVE_BACKOFF_BASE = 0.5 # Seconds; doubled per attempt, plus up to this much random jitter
+_BRAVE_BACKOFF_CAP = 8.0
+_BRAVE_RETRY_AFTER_CAP = 30.0 # Longest Retry-After honored, sync or async; a request thread never blocks longer
+
+
+class _CappedRetry(Retry):
+    """urllib3 Retry for the sync Brave session: honors Retry-After, but never longer than _BRAVE_RETRY_AFTER_CAP."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, _BRAVE_RETRY_AFTER_CAP)
+
+# --- Result records ---
+# Compact, immutable records for web hits (slots: no per-instance dict). Flask's JSON provider,
+# orjson, msgspec and the evaluator's prompt normalizer all serialize them as plain objects.
+@dataclasses.dataclass(slots=True, frozen=True)
+class WebHit:
+    url: str
+    title: str | None
+    snippet: str | None
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Conflict:
+    url: str
+    title: str | None
+    reason: str
+
+
+def _web_results(search_api_results) -> list | None:
+    """
+    Returns the result list of a Brave response ({"web": {"results": [...]}}), or None if the response has none.
+    EAFP: the happy path is two lookups; malformed responses land in the except once.
+    """
+    try:
+        api_results_list = search_api_results['web']['results']
+    except (KeyError, TypeError):
+        return None
+    return api_results_list if isinstance(api_results_list, list) else None
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _BrandKeys:
+    """Derived forms of a brand name used by the result checks, computed once per name."""
+    lower: str
+    url_token: str # "/brand": profile-style path segment
+    base_domain: str | None
+    pattern: re.Pattern # Case-insensitive literal match
+
+
+@functools.lru_cache(maxsize=256)
+def _brand_keys(brand_name: str) -> _BrandKeys:
+    """Memoized `_BrandKeys` for a name; every check of a research run (and re-runs) shares one instance."""
+    brand_lower = brand_name.lower()
+    return _BrandKeys(lower=brand_lower, url_token=f"/{brand_lower}",
+                      base_domain=_NON_ALNUM.sub("", brand_name).lower() or None,
+                      pattern=re.compile(re.escape(brand_name), re.IGNORECASE))
+
+
+def _sanitize_brand(brand_name: str) -> str | None:
+    """Base domain for a brand name (lowercase, letters/digits only), or None if nothing usable is left."""
+    return _brand_keys(brand_name).base_domain
+
+
+@functools.lru_cache(maxsize=32)
+def _brave_headers(brave_api_key: str) -> dict:
+    """
+    Request headers for a Brave API key, built once per key. Keys come from each caller (user settings or env),
+    so they can't be fixed at agent init. The dict is shared: requests and httpx merge it without mutating it.
+    """
+    return {"X-Subscription-Token": brave_api_key, "Accept": "application/json"}
+
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket: allows bursts of `capacity` calls, then `rate` calls per second.
+    Used to keep concurrent WHOIS lookups polite to registries and to pace Brave calls.
+
+    The rate can adapt AIMD-style (additive increase on success, multiplicative decrease when throttled)
+    between `min_rate` and `max_rate`; it stays fixed unless `on_success` / `on_throttle` are called.
+    """
+
+    def __init__(self, capacity: int = 2, rate: float = 1.0, min_rate: float | None = None, max_rate: float | None = None):
+        self.capacity = capacity
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+        self.max_rate = max_rate if max_rate is not None else rate
+        self._tokens = float(capacity)
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Consumes a token, borrowing against future refills if the bucket is empty.
+        Returns the seconds the caller must wait before going ahead (0 when a token was available),
+        so sync callers can time.sleep and async callers can asyncio.sleep on it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_update) * self.rate)
+            self._last_update = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    def on_success(self, alpha: float = 0.5):
+        """Additive increase: creeps back toward `max_rate` while the service is healthy."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + alpha)
+
+    def on_throttle(self, beta: float = 0.5):
+        """Multiplicative decrease: backs off quickly on 429/5xx."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * beta)
+
+
 class MarketResearchAgent:
     """
     Agent responsible for researching brand name usage across various platforms.
     """
 
-    def __init__(self):
+    def __init__(self, whois_ttl: float = 24 * 3600, whois_cache_path: str | None = WHOIS_CACHE_PATH,
+                 search_ttl: float | None = None):
         """
         Initialize the Market Research Agent.
         (API key is no longer loaded here)
+
+        Args:
+            whois_ttl (float): Seconds a domain's WHOIS status is reused before it is looked up again.
+            whois_cache_path (str | None): SQLite file persisting WHOIS statuses across runs. None disables it.
+            search_ttl (float | None): Seconds a successful Brave response is reused for the same (query, count).
+                Defaults to BRAVE_CACHE_TTL from the environment (6 hours); 0 disables the cache.
         """
         logger.info("Initializing MarketResearchAgent...")
         # self.brave_api_key = os.getenv('BRAVE_API_KEY') # Removed
         # if not self.brave_api_key:
         #     logger.error("BRAVE_API_KEY not found in environment variables...")
         self.brave_api_base_url = "https://api.search.brave.com/res/v1/web/search"
+        # Max concurrent Brave calls in research_async; raise it on paid plans with higher rate limits
+        self.brave_concurrency = int(os.getenv("BRAVE_CONCURRENCY", "5"))
+        # Adaptive pacing for all Brave calls (sync and async): a research run's handful of queries go out as one
+        # burst; sustained traffic is held to BRAVE_RATE_LIMIT requests/s, halved on each 429/5xx and recovered gradually
+        brave_rate = float(os.getenv("BRAVE_RATE_LIMIT", "5"))
+        self._brave_limiter = _RateLimiter(capacity=self.brave_concurrency, rate=brave_rate, max_rate=brave_rate)
+        # Shared session for the sync path: pooled keep-alive connections to the Brave host, so only the
+        # first call of a run pays for the TCP/TLS handshake. Transient failures are retried by urllib3.
+        self._session = requests.Session()
+        retries = _CappedRetry(total=_BRAVE_MAX_RETRIES, backoff_factor=_BRAVE_BACKOFF_BASE, status_forcelist=list(_BRAVE_RETRY_STATUSES),
+                        backoff_jitter=_BRAVE_BACKOFF_BASE, backoff_max=_BRAVE_BACKOFF_CAP, respect_retry_after_header=True,
+                        raise_on_status=False) # Hand the final response to raise_for_status for the usual error dict
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries))
+        self._session.headers.update({"Accept": "application/json", "User-Agent": "BrandNavigator/1.0"})
+        # Shared rate-limit gate: after a 429 that outlived its retries, every Brave caller (sync or async)
+        # waits out the Retry-After window instead of adding to the pile-up
+        self._rate_limited_until = 0.0 # time.monotonic() deadline
+        self._rate_limit_lock = threading.Lock()
+        # Brave responses and WHOIS statuses change over hours/days, so re-researching a name (retries,
+        # regenerated reports) is served from memory and stays under Brave's rate limit
+        if search_ttl is None:
+            search_ttl = float(os.getenv("BRAVE_CACHE_TTL", str(6 * 3600)))
+        self._search_cache = TTLCache(maxsize=2048 if search_ttl > 0 else 0, ttl=search_ttl)
+        # Whole research results per normalized name: UI flows that re-render re-request the same brand
+        self._research_cache = TTLCache(maxsize=256, ttl=1800)
+        self.whois_ttl = whois_ttl
+        self._whois_cache = TTLCache(maxsize=4096, ttl=whois_ttl)
+        # Opened on first use, and again in each process: the agent is built before gunicorn forks its workers
+        # (--preload), and a SQLite connection must not be shared across a fork
+        self._whois_cache_path = whois_cache_path
+        self._whois_db = None
+        self._whois_db_pid = None
+        self._whois_db_lock = threading.Lock()
+        # WHOIS is blocking: lookups for different TLDs run on this pool, paced by the token bucket.
+        # The burst covers one name's default TLDs (each on a different registry); back-to-back research is throttled.
+        self._whois_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="whois")
+        self._whois_limiter = _RateLimiter(capacity=6, rate=2.0)
         logger.info("MarketResearchAgent initialized.")
 
+    def close(self):
+        """Closes the pooled HTTP connections and the WHOIS worker threads."""
+        self._session.close()
+        self._whois_pool.shutdown(wait=False)
+        with self._whois_db_lock:
+            if self._whois_db is not None and self._whois_db_pid == os.getpid():
+                self._whois_db.close()
+            self._whois_db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _make_brave_request(self, query: str, brave_api_key: str | None, count: int = 10) -> dict:
         """ Helper function to make requests to the Brave Search API, using the provided key."""
         if not brave_api_key:
             logger.error("Brave API Key was not provided to _make_brave_request.")
             return {"error": "Brave API Key is missing."}
 
-        headers = {
-            "X-Subscription-Token": brave_api_key, # Use passed key
-            "Accept": "application/json"
-        }
-        params = {
-            "q": query,
-            "count": count
-        }
+        cached = self._search_cache.get((query, count))
+        if cached is not None:
+            logger.debug("Brave cache hit for query '%s'.", query)
+            return cached
+
+        headers = _brave_headers(brave_api_key) # Use passed key
+        params = {"q": query, "count": count}
         try:
-            response = requests.get(self.brave_api_base_url, headers=headers, params=params, timeout=15) # Added timeout
+            time.sleep(self._rate_limit_wait())
+            self._brave_limiter.acquire()
+            response = self._session.get(self.brave_api_base_url, headers=headers, params=params, timeout=15) # Added timeout
+            self._record_brave_status(response.status_code)
+            if response.status_code == 429:
+                self._note_rate_limit(self._retry_delay(response, _BRAVE_MAX_RETRIES))
             response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-            # Check if response is JSON before parsing
-            if 'application/json' in response.headers.get('Content-Type', ''):
-                 # Directly return the parsed JSON from Brave API
-                 # Brave API structure includes {"web": {"results": [...]}}
-                 return response.json()
-            else:
-                logger.error(f"Brave API returned non-JSON response for query '{query}'. Status: {response.status_code}, Content: {response.text[:200]}")
+            # Parse straight from bytes; a decode error (orjson's and json's are both ValueErrors) replaces
+            # the Content-Type check, so the common case pays for nothing but the parse
+            # Brave API structure includes {"web": {"results": [...]}}
+            try:
+                data = _loads(response.content)
+            except ValueError:
+                logger.error("Brave API returned non-JSON response for query '%s'. Status: %s, Content: %s", query, response.status_code, response.text[:200])
                 return {"error": f"Brave API returned non-JSON content (Status: {response.status_code})"}
+            self._search_cache.set((query, count), data) # Only successful responses are cached
+            return data
 
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout occurred while calling Brave API for query '{query}': {e}")
-            return {"error": f"Timeout calling Brave API: {e}"}
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error calling Brave API for query '{query}': {e}")
-            status_code = e.response.status_code if e.response else 'N/A'
-            error_text = e.response.text[:200] if e.response else 'No response body'
+        except requests.RequestException as e: # Timeout is a RequestException too; anything else is a bug and propagates
+            if isinstance(e, requests.Timeout):
+                logger.error("Timeout occurred while calling Brave API for query '%s': %s", query, e)
+                return {"error": f"Timeout calling Brave API: {e}"}
+            logger.error("Error calling Brave API for query '%s': %s", query, e)
+            # Compare with None: a Response is falsy for 4xx/5xx, which hid the status of exactly these errors
+            status_code = e.response.status_code if e.response is not None else 'N/A'
+            error_text = e.response.text[:200] if e.response is not None else 'No response body'
             return {"error": f"Brave API request failed (Status: {status_code}): {e}. Details: {error_text}"}
-        except Exception as e:
-             logger.exception(f"Unexpected error during Brave API call for query '{query}': {e}")
-             return {"error": f"Unexpected error calling Brave API: {str(e)}"}
+
+    async def _make_brave_request_async(self, client, query: str, brave_api_key: str | None, count: int = 10) -> dict:
+        """ Async counterpart of `_make_brave_request`, issued on the shared httpx.AsyncClient of a research run."""
+        if not brave_api_key:
+            logger.error("Brave API Key was not provided to _make_brave_request_async.")
+            return {"error": "Brave API Key is missing."}
+
+        cached = self._search_cache.get((query, count))
+        if cached is not None:
+            logger.debug("Brave cache hit for query '%s'.", query)
+            return cached
+
+        headers = _brave_headers(brave_api_key)
+        params = {"q": query, "count": count}
+        try:
+            # httpx has no status-based retries, so 429/5xx are retried here with the same policy as the sync session
+            for attempt in range(_BRAVE_MAX_RETRIES + 1):
+                await asyncio.sleep(self._rate_limit_wait() + self._brave_limiter.reserve())
+                response = await client.get(self.brave_api_base_url, headers=headers, params=params)
+                self._record_brave_status(response.status_code)
+                if response.status_code not in _BRAVE_RETRY_STATUSES:
+                    break
+                delay = self._retry_delay(response, attempt)
+                if response.status_code == 429:
+                    self._note_rate_limit(delay)
+                if attempt < _BRAVE_MAX_RETRIES:
+                    logger.warning("Brave API returned %s for query '%s'. Retrying in %.1fs.", response.status_code, query, delay)
+                    await asyncio.sleep(delay)
+            response.raise_for_status()
+            try:
+                data = _loads(response.content)
+            except ValueError:
+                logger.error("Brave API returned non-JSON response for query '%s'. Status: %s, Content: %s", query, response.status_code, response.text[:200])
+                return {"error": f"Brave API returned non-JSON content (Status: {response.status_code})"}
+            self._search_cache.set((query, count), data)
+            return data
+
+        except httpx.HTTPError as e: # Same single handler as the sync path
+            if isinstance(e, httpx.TimeoutException):
+                logger.error("Timeout occurred while calling Brave API for query '%s': %s", query, e)
+                return {"error": f"Timeout calling Brave API: {e}"}
+            logger.error("Error calling Brave API for query '%s': %s", query, e)
+            if isinstance(e, httpx.HTTPStatusError): # Only status errors carry a response
+                return {"error": f"Brave API request failed (Status: {e.response.status_code}): {e}. Details: {e.response.text[:200]}"}
+            return {"error": f"Brave API request failed (Status: N/A): {e}. Details: No response body"}
+
+    @staticmethod
+    def _retry_delay(response, attempt: int) -> float:
+        """
+        Seconds to wait before retrying: the server's Retry-After if given (capped), else capped exponential
+        backoff with random jitter so concurrent requests that failed together don't retry in lockstep.
+        """
+        try:
+            return min(_BRAVE_RETRY_AFTER_CAP, float(response.headers.get('Retry-After', '')))
+        except ValueError:
+            return min(_BRAVE_BACKOFF_CAP, _BRAVE_BACKOFF_BASE * 2 ** attempt) + random.uniform(0, _BRAVE_BACKOFF_BASE)
+
+    def _record_brave_status(self, status_code: int):
+        """Feeds a Brave response status back into the adaptive rate limiter."""
+        if status_code in _BRAVE_RETRY_STATUSES:
+            self._brave_limiter.on_throttle()
+        elif status_code < 400:
+            self._brave_limiter.on_success()
+
+    def _note_rate_limit(self, delay: float):
+        """Closes the rate-limit gate for `delay` seconds."""
+        with self._rate_limit_lock:
+            self._rate_limited_until = max(self._rate_limited_until, time.monotonic() + delay)
+
+    def _rate_limit_wait(self) -> float:
+        """Seconds left before Brave calls may resume (0 when the gate is open)."""
+        with self._rate_limit_lock:
+            return max(0.0, self._rate_limited_until - time.monotonic())
+
+    @staticmethod
+    def _unexpected_brave_error(query: str, error: Exception) -> dict:
+        """
+        Error dict for an exception that escaped a Brave request (a bug or bad input, e.g. a key that isn't
+        latin-1): the check it belongs to is marked as failed instead of failing the whole research run.
+        """
+        logger.exception("Unexpected error during Brave API call for query '%s': %s", query, error)
+        return {"error": f"Unexpected error calling Brave API: {error}"}
 
     def search_web(self, brand_name: str, brave_api_key: str | None) -> dict:
         """
         Searches the general web using Brave Search API with the provided key.
         """
-        logger.info(f"Starting web search for: {brand_name}")
+        logger.info("Starting web search for: %s", brand_name)
+        query = _WEB_QUERY_TMPL.format(brand=brand_name)
+        # Make the API call using the helper and PASSED key
+        try:
+            search_api_results = self._make_brave_request(query=query, brave_api_key=brave_api_key, count=10)
+        except Exception as e:
+            search_api_results = self._unexpected_brave_error(query, e)
+        return self._process_web_results(brand_name, query, search_api_results)
+
+    async def search_web_async(self, client, brand_name: str, brave_api_key: str | None) -> dict:
+        """Async counterpart of `search_web`."""
+        logger.info("Starting web search for: %s", brand_name)
+        query = _WEB_QUERY_TMPL.format(brand=brand_name)
+        try:
+            search_api_results = await self._make_brave_request_async(client, query=query, brave_api_key=brave_api_key, count=10)
+        except Exception as e:
+            search_api_results = self._unexpected_brave_error(query, e)
+        return self._process_web_results(brand_name, query, search_api_results)
+
+    def _process_web_results(self, brand_name: str, query: str, search_api_results: dict) -> dict:
+        """Turns a Brave web search response into web links and potential conflicts (shared by sync and async paths)."""
         results = {
             'web_links': [],
             'potential_conflicts': [],
-            'query_used': None,
+            'query_used': query,
             'error': None
         }
-        query = f'"{brand_name}" brand OR company OR official website'
-        results['query_used'] = query
-
-        # Make the API call using the helper and PASSED key
-        search_api_results = self._make_brave_request(query=query, brave_api_key=brave_api_key, count=10)
 
         # Check for errors from the API call itself
         if isinstance(search_api_results, dict) and search_api_results.get('error'):
             results['error'] = search_api_results['error']
-            logger.error(f"Web search failed for {brand_name}: {results['error']}")
+            logger.error("Web search failed for %s: %s", brand_name, results['error'])
             return results
 
         # Process the successful results (assuming standard Brave structure)
         try:
-            if isinstance(search_api_results, dict) and search_api_results.get('web') and isinstance(search_api_results['web'].get('results'), list):
-                processed_urls = set()
-                api_results_list = search_api_results['web']['results']
-                logger.info(f"Processing {len(api_results_list)} web results from API.")
+            api_results_list = _web_results(search_api_results)
+            if api_results_list is not None:
+                by_url = {} # url -> link entry; dicts keep insertion order, so this dedupes and orders in one pass
+                brand_re = _brand_keys(brand_name).pattern # Compiled once per name, no per-result lower()
+                logger.info("Processing %s web results from API.", len(api_results_list))
 
                 for item in api_results_list:
                     link = item.get('url')
                     title = item.get('title')
                     snippet = item.get('description') # Brave uses 'description'
 
-                    if link and link not in processed_urls:
-                        processed_urls.add(link)
-                        results['web_links'].append({'url': link, 'title': title, 'snippet': snippet})
-
-                        # Simplified conflict check (as before)
-                        try:
-                            title_lower = str(title).lower() if title else ""
-                            domain = ""
-                            if link:
-                                parts = link.split('/')
-                                if len(parts) > 2:
-                                    domain = parts[2].replace('www.', '')
-                            domain_lower = domain.lower()
-                        except Exception as parse_err:
-                             logger.warning(f"Error parsing title/domain for URL {link}: {parse_err}")
-                             title_lower = ""
-                             domain_lower = ""
-
-                        brand_lower = brand_name.lower()
-                        if (brand_lower in title_lower) or (brand_lower in domain_lower):
-                            results['potential_conflicts'].append({
-                                'url': link,
-                                'title': title,
-                                'reason': 'Brand name found in title or domain'
-                            })
+                    if link and link not in by_url:
+                        by_url[link] = WebHit(link, title, snippet)
+
+                        # Simplified conflict check (as before); urlsplit returns empty parts for URLs without a host
+                        domain = (urlsplit(link).hostname or "").removeprefix('www.')
+                        if brand_re.search(str(title) if title else "") or brand_re.search(domain):
+                            results['potential_conflicts'].append(Conflict(link, title, 'Brand name found in title or domain'))
+                results['web_links'] = list(by_url.values())
             else:
-                logger.warning(f"No results or unexpected format in Brave API response for {brand_name}. Data: {search_api_results}")
+                logger.warning("No results or unexpected format in Brave API response for %s. Data: %s", brand_name, search_api_results)
                 # Not necessarily an error if Brave found nothing, but could be format issue
                 if not results['web_links']:
-                     logger.info(f"Brave API returned no web results for query: {query}")
+                     logger.info("Brave API returned no web results for query: %s", query)
 
         except Exception as e:
-            logger.exception(f"Error processing Brave web search results for '{brand_name}': {e}")
+            logger.exception("Error processing Brave web search results for '%s': %s", brand_name, e)
             results['error'] = f"An exception occurred during web search result processing: {str(e)}"
 
         return results
@@ -151,33 +498,97 @@ class MarketResearchAgent:
         """
         Searches social media platforms using targeted Brave web search with the provided key.
         """
-        logger.info(f"Starting social media presence check for: {brand_name}")
+        logger.info("Starting social media presence check for: %s", brand_name)
+        # One call for all platforms (1/5 of the requests and rate-limit budget); per-platform queries are the fallback
+        combined_query = _SOCIAL_COMBINED_TEMPLATE.format(brand=brand_name)
+        try:
+            combined_results = self._make_brave_request(query=combined_query, brave_api_key=brave_api_key, count=20)
+        except Exception as e:
+            combined_results = self._unexpected_brave_error(combined_query, e)
+        if not combined_results.get('error') or not brave_api_key:
+            return self._process_combined_social_results(brand_name, combined_query, combined_results)
+        logger.warning("Combined social media query failed for '%s', falling back to per-platform queries.", brand_name)
+
+        platforms_to_check = self._social_queries(brand_name)
+        platform_responses = {}
+
+        for platform, query in platforms_to_check.items():
+            logger.debug("Checking %s with query: %s", platform, query)
+            # Make the API call with PASSED key (paced by the shared Brave rate limiter)
+            try:
+                platform_responses[platform] = self._make_brave_request(query=query, brave_api_key=brave_api_key, count=_PLATFORM_RESULT_COUNT)
+            except Exception as e:
+                platform_responses[platform] = self._unexpected_brave_error(query, e)
+
+        return self._process_social_results(brand_name, platforms_to_check, platform_responses)
+
+    async def search_social_media_async(self, client, brand_name: str, brave_api_key: str | None) -> dict:
+        """Async counterpart of `search_social_media`: the fallback platform queries are all in flight at once."""
+        logger.info("Starting social media presence check for: %s", brand_name)
+        combined_query = _SOCIAL_COMBINED_TEMPLATE.format(brand=brand_name)
+        try:
+            combined_results = await self._make_brave_request_async(client, query=combined_query, brave_api_key=brave_api_key, count=20)
+        except Exception as e:
+            combined_results = self._unexpected_brave_error(combined_query, e)
+        if not combined_results.get('error') or not brave_api_key:
+            return self._process_combined_social_results(brand_name, combined_query, combined_results)
+        logger.warning("Combined social media query failed for '%s', falling back to per-platform queries.", brand_name)
+
+        platforms_to_check = self._social_queries(brand_name)
+        responses = await asyncio.gather(*(
+            self._make_brave_request_async(client, query=query, brave_api_key=brave_api_key, count=_PLATFORM_RESULT_COUNT)
+            for query in platforms_to_check.values()
+        ), return_exceptions=True) # One failing platform query mustn't cancel the others
+        responses = [self._unexpected_brave_error(query, response) if isinstance(response, Exception) else response
+                     for query, response in zip(platforms_to_check.values(), responses)]
+        return self._process_social_results(brand_name, platforms_to_check, dict(zip(platforms_to_check, responses)))
+
+    def _social_queries(self, brand_name: str) -> dict:
+        """Maps each social platform to its targeted Brave query."""
+        return {platform: template.format(brand=brand_name) for platform, template in _PLATFORM_TEMPLATES}
+
+    @staticmethod
+    def _platform_for_url(url: str) -> str | None:
+        """Maps a result URL to the social platform label it belongs to (None for other sites)."""
+        split_url = urlsplit(url or '')
+        host = (split_url.hostname or '').removeprefix('www.').removeprefix('m.')
+        platform = _SOCIAL_HOSTS.get(host)
+        if platform:
+            return platform
+        if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+            return 'LinkedIn (Company)' if split_url.path.startswith('/company/') else 'LinkedIn (General)'
+        return None
+
+    def _process_combined_social_results(self, brand_name: str, combined_query: str, combined_results: dict) -> dict:
+        """Buckets the hits of the combined query per platform, then applies the usual per-platform evidence check."""
+        platforms_to_check = {platform: combined_query for platform, _ in _PLATFORM_TEMPLATES}
+        if combined_results.get('error'):
+            platform_responses = dict.fromkeys(platforms_to_check, combined_results)
+        else:
+            platform_responses = {platform: {'web': {'results': []}} for platform in platforms_to_check}
+            for item in _web_results(combined_results) or []:
+                platform = self._platform_for_url(item.get('url'))
+                if platform:
+                    platform_responses[platform]['web']['results'].append(item)
+        return self._process_social_results(brand_name, platforms_to_check, platform_responses)
+
+    def _process_social_results(self, brand_name: str, platforms_to_check: dict, platform_responses: dict) -> dict:
+        """Derives a presence status per platform from the Brave responses (shared by sync and async paths)."""
         results = {
             'platform_results': {},
             'queries_used': [],
             'error': None
         }
-        platforms_to_check = {
-            'Twitter': f'site:twitter.com "{brand_name}"',
-            'Instagram': f'site:instagram.com "{brand_name}"',
-            'Facebook': f'site:facebook.com "{brand_name}"',
-            'LinkedIn (Company)': f'site:linkedin.com/company/ "{brand_name}"',
-            'LinkedIn (General)': f'site:linkedin.com "{brand_name}" -site:linkedin.com/company/'
-        }
         overall_error = None
+        # Normalized once per name, shared with the other checks
+        brand_keys = _brand_keys(brand_name)
+        brand_lower, brand_url_token = brand_keys.lower, brand_keys.url_token
 
         for platform, query in platforms_to_check.items():
-            logger.info(f"Checking {platform} with query: {query}")
             results['queries_used'].append({'platform': platform, 'query': query})
             platform_status = "potentially_available_low_presence"
             error_msg = None
-
-            # --- Add delay to avoid rate limiting ---
-            time.sleep(0.8) # Pause for 0.8 seconds before the next API call
-            # ----------------------------------------
-
-            # Make the API call with PASSED key
-            search_api_results = self._make_brave_request(query=query, brave_api_key=brave_api_key, count=3)
+            search_api_results = platform_responses.get(platform)
 
             # Check for API call errors
             if isinstance(search_api_results, dict) and search_api_results.get('error'):
@@ -188,19 +599,21 @@ class MarketResearchAgent:
             else:
                 # Process successful results
                 try:
-                    brand_lower = brand_name.lower()
                     found_mention = False
-                    if isinstance(search_api_results, dict) and search_api_results.get('web') and search_api_results['web'].get('results'):
-                        for item in search_api_results['web']['results']:
-                            item_title = item.get('title', '').lower()
-                            item_url = item.get('url', '').lower()
-                            if brand_lower in item_title or f"/{brand_lower}" in item_url:
+                    api_results_list = _web_results(search_api_results)
+                    if api_results_list:
+                        for item in api_results_list:
+                            item_title = (item.get('title') or '').lower()
+                            split_url = urlsplit(item.get('url') or '')
+                            # Profile-style hit: the brand is a path segment (twitter.com/brand) or the host itself
+                            if (brand_lower in item_title or brand_url_token in split_url.path.lower()
+                                    or (split_url.hostname or "").startswith(brand_lower)):
                                 platform_status = "used_mentioned"
                                 found_mention = True
-                                logger.info(f"Found potential usage/mention for '{brand_name}' on {platform}: {item.get('url')}")
+                                logger.debug("Found potential usage/mention for '%s' on %s: %s", brand_name, platform, item.get('url'))
                                 break
                     if not found_mention:
-                        logger.info(f"No direct profile/strong mentions found for '{brand_name}' on {platform} in top results.")
+                        logger.debug("No direct profile/strong mentions found for '%s' on %s in top results.", brand_name, platform)
                 except Exception as e:
                     error_msg = f"Exception processing results for {platform}: {str(e)}"
                     logger.error(error_msg)
@@ -210,43 +623,60 @@ class MarketResearchAgent:
             results['platform_results'][platform] = platform_status
 
         results['error'] = overall_error # Set overall error if any platform failed
-        logger.info(f"Completed social media presence check for: {brand_name}")
+        logger.info("Completed social media presence check for %s: %s", brand_name, results['platform_results']) # One summary line per check
         return results
 
     def check_trademarks(self, brand_name: str, brave_api_key: str | None, country_code: str = 'US') -> dict:
         """
         Performs a basic trademark check using Brave web search with the provided key.
         """
-        logger.info(f"Starting basic trademark check for: {brand_name} in country: {country_code}")
+        logger.info("Starting basic trademark check for: %s in country: %s", brand_name, country_code)
+        results, target_site = self._trademark_setup(brand_name, country_code)
+        if not target_site:
+            return results
+
+        # Make API Call with PASSED key
+        try:
+            search_api_results = self._make_brave_request(query=results['query_used'], brave_api_key=brave_api_key, count=2)
+        except Exception as e:
+            search_api_results = self._unexpected_brave_error(results['query_used'], e)
+        return self._process_trademark_results(brand_name, target_site, results, search_api_results)
+
+    async def check_trademarks_async(self, client, brand_name: str, brave_api_key: str | None, country_code: str = 'US') -> dict:
+        """Async counterpart of `check_trademarks`."""
+        logger.info("Starting basic trademark check for: %s in country: %s", brand_name, country_code)
+        results, target_site = self._trademark_setup(brand_name, country_code)
+        if not target_site:
+            return results
+        try:
+            search_api_results = await self._make_brave_request_async(client, query=results['query_used'], brave_api_key=brave_api_key, count=2)
+        except Exception as e:
+            search_api_results = self._unexpected_brave_error(results['query_used'], e)
+        return self._process_trademark_results(brand_name, target_site, results, search_api_results)
+
+    def _trademark_setup(self, brand_name: str, country_code: str) -> tuple[dict, str | None]:
+        """Builds the initial trademark results and picks the database site; target_site is None if unsupported."""
+        target_site, database_checked = _TM_TARGETS.get(country_code.upper(), (None, f'{country_code} (Unsupported)'))
         results = {
             'status': 'check_error',
             'details': [],
-            'database_checked': f'{country_code} (Unsupported)',
+            'database_checked': database_checked,
             'query_used': None,
             'error': None
         }
-        target_site = None
-        if country_code == 'US':
-            target_site = "tess2.uspto.gov"
-            results['database_checked'] = 'USPTO TESS (via web search)'
-        # TODO: Add other countries
 
         if not target_site:
             results['status'] = 'unsupported_country'
             results['error'] = f"Country code '{country_code}' not supported."
-            return results
+            return results, None
 
-        query = f'site:{target_site} "{brand_name}"'
+        query = _TM_QUERY_TMPL.format(site=target_site, brand=brand_name)
         results['query_used'] = query
-        logger.info(f"Using trademark check query: {query}")
-
-        # --- Add delay to avoid rate limiting ---
-        time.sleep(0.8) # Pause for 0.8 seconds before the API call
-        # ----------------------------------------
-
-        # Make API Call with PASSED key
-        search_api_results = self._make_brave_request(query=query, brave_api_key=brave_api_key, count=2)
+        logger.info("Using trademark check query: %s", query)
+        return results, target_site
 
+    def _process_trademark_results(self, brand_name: str, target_site: str, results: dict, search_api_results: dict) -> dict:
+        """Fills in the trademark status from the Brave response (shared by sync and async paths)."""
         # Check API errors
         if isinstance(search_api_results, dict) and search_api_results.get('error'):
             results['error'] = f"API Error: {search_api_results['error']}"
@@ -257,12 +687,11 @@ class MarketResearchAgent:
 
         # Process results
         try:
-            found_hits = []
-            if isinstance(search_api_results, dict) and search_api_results.get('web') and search_api_results['web'].get('results'):
-                 found_hits = search_api_results['web']['results']
-                 logger.info(f"Found {len(found_hits)} potential exact match(es) for '{brand_name}' on {target_site}.")
+            found_hits = _web_results(search_api_results) or []
+            if found_hits:
+                 logger.info("Found %s potential exact match(es) for '%s' on %s.", len(found_hits), brand_name, target_site)
             else:
-                 logger.info(f"No direct results found for '{brand_name}' on {target_site} via web search.")
+                 logger.info("No direct results found for '%s' on %s via web search.", brand_name, target_site)
 
             if found_hits:
                  results['status'] = 'potential_conflict_found_on_site'
@@ -280,15 +709,15 @@ class MarketResearchAgent:
             results['error'] = None # Clear error on success
 
         except Exception as e:
-            logger.exception(f"Error processing trademark search results for '{brand_name}': {e}")
+            logger.exception("Error processing trademark search results for '%s': %s", brand_name, e)
             results['status'] = 'check_error'
             results['details'] = [f"Exception processing results: {str(e)}"]
             results['error'] = f"Exception processing results: {str(e)}"
 
-        logger.info(f"Completed basic trademark check processing for: {brand_name}. Status: {results['status']}")
+        logger.info("Completed basic trademark check processing for: %s. Status: %s", brand_name, results['status'])
         return results
 
-    def check_domain_availability(self, brand_name: str, tlds: list[str] = None) -> dict:
+    def check_domain_availability(self, brand_name: str, tlds: list[str] = None, base_domain: str | None = None) -> dict:
         """
         Checks the availability of domain names based on the brand name for common TLDs.
 
@@ -296,20 +725,21 @@ class MarketResearchAgent:
             brand_name (str): The base brand name (without TLD).
             tlds (list[str], optional): A list of TLDs to check (e.g., ['.com', '.co', '.io']).
                                         Defaults to a standard list if None.
+            base_domain (str, optional): `_sanitize_brand(brand_name)`, if the caller already computed it.
 
         Returns:
             dict: A dictionary mapping domain names to their status ('available', 'taken', 'check_error', 'skipped').
         """
         if tlds is None:
-            tlds = ['.com', '.co', '.io', '.ai', '.org', '.net'] # Default TLDs
+            tlds = _DEFAULT_TLDS
 
         # Basic sanitization of brand name for domain use (remove spaces, special chars)
-        base_domain = "".join(c for c in brand_name if c.isalnum()).lower()
+        base_domain = base_domain or _sanitize_brand(brand_name)
         if not base_domain:
-            logger.error(f"Could not generate a valid base domain from brand name: {brand_name}")
+            logger.error("Could not generate a valid base domain from brand name: %s", brand_name)
             return {"error": "Invalid base domain generated", "results": {}}
 
-        logger.info(f"Starting domain availability check for base: {base_domain}, TLDs: {tlds}")
+        logger.info("Starting domain availability check for base: %s, TLDs: %s", base_domain, tlds)
         domain_statuses = {}
         overall_error = None
 
@@ -321,54 +751,289 @@ class MarketResearchAgent:
                  domain_statuses[domain_name] = 'skipped (library missing)'
              return {"error": overall_error, "results": domain_statuses}
 
+        # Cached statuses are answered inline; only the misses go to the pool, one lookup per TLD in parallel
+        # (the rate limiter replaces the old fixed 0.5s pause between queries)
+        outcomes = {}
+        futures = {}
         for tld in tlds:
             domain_name = base_domain + tld
-            status = 'check_error'
-            try:
-                time.sleep(0.5)
-                logger.debug(f"Checking WHOIS for: {domain_name}")
-                w = whois.whois(domain_name)
-
-                if w and w.creation_date:
-                    logger.info(f"Domain {domain_name} appears to be TAKEN (Creation date: {w.creation_date}).")
-                    status = 'taken'
-                else:
-                    logger.info(f"Domain {domain_name} appears to be AVAILABLE (or WHOIS query inconclusive).")
-                    status = 'potentially_available'
-
-            except whois.parser.PywhoisError as e:
-                 logger.info(f"Domain {domain_name} likely AVAILABLE (PywhoisError: {e}).")
-                 status = 'potentially_available'
-            except ConnectionError as e:
-                 logger.error(f"Connection error checking domain {domain_name}: {e}")
-                 status = 'check_error (connection)'
-                 overall_error = overall_error or "Connection error during domain check"
-            except Exception as e:
-                logger.error(f"Error checking domain {domain_name}: {type(e).__name__} - {e}")
-                status = 'check_error'
-                overall_error = overall_error or "Exception during domain check"
-
+            status = self._cached_whois_status(domain_name)
+            if status is not None:
+                outcomes[domain_name] = (status, None)
+            else:
+                futures[self._whois_pool.submit(self._whois_status, domain_name)] = domain_name
+        for future in as_completed(futures):
+            outcomes[futures[future]] = future.result() # _whois_status never raises
+        for tld in tlds: # Report in TLD order, as before
+            domain_name = base_domain + tld
+            status, error = outcomes[domain_name]
             domain_statuses[domain_name] = status
+            overall_error = overall_error or error
 
         logger.info("Completed domain availability check.")
         # Return a dict containing results and any overall error message
         return {"error": overall_error, "results": domain_statuses}
 
+    async def check_domain_availability_async(self, brand_name: str, tlds: list[str] = None, base_domain: str | None = None) -> dict:
+        """
+        Async counterpart of `check_domain_availability`; all TLDs resolve in parallel. With `asyncwhois`
+        installed the lookups use native asyncio sockets (at most 4 in flight); otherwise the blocking
+        python-whois calls run on the WHOIS thread pool, paced by the shared rate limiter.
+        """
+        if tlds is None:
+            tlds = _DEFAULT_TLDS
+
+        base_domain = base_domain or _sanitize_brand(brand_name)
+        if not base_domain:
+            logger.error("Could not generate a valid base domain from brand name: %s", brand_name)
+            return {"error": "Invalid base domain generated", "results": {}}
+
+        logger.info("Starting domain availability check for base: %s, TLDs: %s", base_domain, tlds)
+        domain_names = [base_domain + tld for tld in tlds]
+        if asyncwhois is not None:
+            semaphore = asyncio.Semaphore(4)
+            outcomes = await asyncio.gather(*(self._aio_whois_status(domain_name, semaphore) for domain_name in domain_names))
+        elif whois is None:
+             logger.warning("Skipping domain checks because python-whois library is not installed.")
+             return {"error": "Skipped (python-whois library missing)",
+                     "results": {domain_name: 'skipped (library missing)' for domain_name in domain_names}}
+        else:
+            loop = asyncio.get_running_loop()
+            outcomes = await asyncio.gather(*(loop.run_in_executor(self._whois_pool, self._whois_status, domain_name)
+                                              for domain_name in domain_names))
+        domain_statuses = {}
+        overall_error = None
+        for domain_name, (status, error) in zip(domain_names, outcomes):
+            domain_statuses[domain_name] = status
+            overall_error = overall_error or error
+
+        logger.info("Completed domain availability check.")
+        return {"error": overall_error, "results": domain_statuses}
+
+    def _whois_status(self, domain_name: str) -> tuple[str, str | None]:
+        """
+        Looks up one domain, reusing statuses younger than `whois_ttl` from memory, then from the SQLite cache.
+        Failed checks are never cached. Returns (status, error message or None).
+        """
+        status = self._cached_whois_status(domain_name)
+        if status is not None:
+            return status, None
+        status, error, raw = self._lookup_whois(domain_name)
+        if error is None:
+            self._store_whois_status(domain_name, status, raw)
+        return status, error
+
+    async def _aio_whois_status(self, domain_name: str, semaphore: asyncio.Semaphore) -> tuple[str, str | None]:
+        """`_whois_status` over asyncwhois: same caches and status mapping, no worker thread."""
+        status = self._cached_whois_status(domain_name)
+        if status is not None:
+            return status, None
+        try:
+            async with semaphore:
+                logger.debug("Checking WHOIS (async) for: %s", domain_name)
+                query_string, parsed = await asyncwhois.aio_whois(domain_name)
+            if parsed and parsed.get('created'):
+                logger.info("Domain %s appears to be TAKEN (Creation date: %s).", domain_name, parsed.get('created'))
+                status = 'taken'
+            else:
+                logger.info("Domain %s appears to be AVAILABLE (or WHOIS query inconclusive).", domain_name)
+                status = 'potentially_available'
+        except asyncwhois.errors.NotFoundError as e:
+            logger.info("Domain %s likely AVAILABLE (NotFoundError: %s).", domain_name, e)
+            status, query_string = 'potentially_available', str(e)
+        except ConnectionError as e:
+            logger.error("Connection error checking domain %s: %s", domain_name, e)
+            return 'check_error (connection)', "Connection error during domain check"
+        except Exception as e:
+            logger.error("Error checking domain %s: %s - %s", domain_name, type(e).__name__, e)
+            return 'check_error', "Exception during domain check"
+        self._store_whois_status(domain_name, status, query_string)
+        return status, None
+
+    def _cached_whois_status(self, domain_name: str) -> str | None:
+        """Returns a fresh cached status from memory, then from the SQLite cache (promoting it), or None."""
+        status = self._whois_cache.get(domain_name)
+        if status is not None:
+            logger.debug("WHOIS cache hit for: %s", domain_name)
+            return status
+        status = self._whois_db_get(domain_name)
+        if status is not None:
+            logger.debug("Persistent WHOIS cache hit for: %s", domain_name)
+            self._whois_cache.set(domain_name, status)
+        return status
+
+    def _store_whois_status(self, domain_name: str, status: str, raw: str | None):
+        """Caches a successful lookup in memory and in the SQLite cache."""
+        self._whois_cache.set(domain_name, status)
+        self._whois_db_set(domain_name, status, raw)
+
+    def _whois_connection(self) -> sqlite3.Connection | None:
+        """
+        This process's connection to the persistent WHOIS cache (call with `_whois_db_lock` held), or None if
+        it is disabled or can't be opened. A connection inherited from the parent process is left untouched.
+        """
+        if self._whois_db is not None and self._whois_db_pid == os.getpid():
+            return self._whois_db
+        self._whois_db = None
+        if not self._whois_cache_path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self._whois_cache_path) or ".", exist_ok=True)
+            db = sqlite3.connect(self._whois_cache_path, check_same_thread=False) # Guarded by _whois_db_lock
+            with db:
+                db.execute("CREATE TABLE IF NOT EXISTS whois (domain TEXT PRIMARY KEY, ts REAL, status TEXT, raw TEXT)")
+        except sqlite3.Error as e:
+            logger.warning("Could not open persistent WHOIS cache at %s: %s", self._whois_cache_path, e)
+            self._whois_cache_path = None # Don't retry on every lookup
+            return None
+        self._whois_db, self._whois_db_pid = db, os.getpid()
+        return db
+
+    def _whois_db_get(self, domain_name: str) -> str | None:
+        """Returns the persisted status for a domain if it is still fresh."""
+        try:
+            with self._whois_db_lock:
+                db = self._whois_connection()
+                if db is None:
+                    return None
+                row = db.execute("SELECT status, ts FROM whois WHERE domain = ?", (domain_name,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Persistent WHOIS cache read failed for %s: %s", domain_name, e)
+            return None
+        if row and time.time() - row[1] < self.whois_ttl:
+            return row[0]
+        return None
+
+    def _whois_db_set(self, domain_name: str, status: str, raw: str | None):
+        """Persists a domain's status (and the raw WHOIS text, for debugging)."""
+        try:
+            with self._whois_db_lock:
+                db = self._whois_connection()
+                if db is None:
+                    return
+                with db:
+                    db.execute("INSERT OR REPLACE INTO whois VALUES (?, ?, ?, ?)", (domain_name, time.time(), status, raw))
+        except sqlite3.Error as e:
+            logger.warning("Persistent WHOIS cache write failed for %s: %s", domain_name, e)
+
+    def _lookup_whois(self, domain_name: str) -> tuple[str, str | None, str | None]:
+        """Queries WHOIS for one domain. Returns (status, error message or None, raw WHOIS text or None)."""
+        self._whois_limiter.acquire()
+        try:
+            logger.debug("Checking WHOIS for: %s", domain_name)
+            w = whois.whois(domain_name)
+
+            if w and w.creation_date:
+                logger.info("Domain %s appears to be TAKEN (Creation date: %s).", domain_name, w.creation_date)
+                return 'taken', None, getattr(w, 'text', None)
+            logger.info("Domain %s appears to be AVAILABLE (or WHOIS query inconclusive).", domain_name)
+            return 'potentially_available', None, getattr(w, 'text', None)
+
+        except whois.parser.PywhoisError as e:
+             logger.info("Domain %s likely AVAILABLE (PywhoisError: %s).", domain_name, e)
+             return 'potentially_available', None, str(e)
+        except ConnectionError as e:
+             logger.error("Connection error checking domain %s: %s", domain_name, e)
+             return 'check_error (connection)', "Connection error during domain check", None
+        except Exception as e:
+            logger.error("Error checking domain %s: %s - %s", domain_name, type(e).__name__, e)
+            return 'check_error', "Exception during domain check", None
+
     def research(self, brand_name: str, brave_api_key: str | None) -> dict:
         """
         Conducts comprehensive market research for a given brand name, using the provided API key.
         """
-        logger.info(f"Starting comprehensive research for: {brand_name}")
+        logger.info("Starting comprehensive research for: %s", brand_name)
         if not brand_name: # Simplified check
              return {"error": "Invalid brand name provided."}
+        cached = self._research_cache_get(brand_name, brave_api_key)
+        if cached is not None:
+            return cached
+        # Guard clause: a name with no usable domain form fails the domain check anyway, so spare the Brave quota
+        base_domain = _sanitize_brand(brand_name)
+        if not base_domain:
+            logger.error("Could not generate a valid base domain from brand name: %s", brand_name)
+            return {"brand_name": brand_name, "error": "Invalid base domain generated"}
+
+        # Concurrent path: every check in flight at once (not possible from inside a running event loop)
+        if httpx is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.research_async(brand_name, brave_api_key))
+
+        # Without httpx the checks still overlap: each blocking check gets its own thread
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            web_future = executor.submit(self.search_web, brand_name, brave_api_key)
+            social_future = executor.submit(self.search_social_media, brand_name, brave_api_key)
+            trademark_future = executor.submit(self.check_trademarks, brand_name, brave_api_key)
+            domain_future = executor.submit(self.check_domain_availability, brand_name, base_domain=base_domain)
+            web_results, social_media_results = web_future.result(), social_future.result()
+            trademark_results, domain_results_dict = trademark_future.result(), domain_future.result()
+        return self._consolidate(brand_name, brave_api_key, web_results, social_media_results, trademark_results, domain_results_dict)
+
+    async def research_async(self, brand_name: str, brave_api_key: str | None, client=None) -> dict:
+        """
+        Async counterpart of `research`: the web, social media, trademark and domain checks all run concurrently,
+        so wall-clock time is roughly the slowest lookup instead of the sum of all of them.
+        Pass `client` (an httpx.AsyncClient) to share connections with other concurrent research runs.
+        """
+        logger.info("Running research checks concurrently for: %s", brand_name)
+        if not brand_name:
+             return {"error": "Invalid brand name provided."}
+        cached = self._research_cache_get(brand_name, brave_api_key)
+        if cached is not None:
+            return cached
+        base_domain = _sanitize_brand(brand_name)
+        if not base_domain:
+            logger.error("Could not generate a valid base domain from brand name: %s", brand_name)
+            return {"brand_name": brand_name, "error": "Invalid base domain generated"}
+
+        if client is None:
+            async with self._async_client() as client:
+                return await self.research_async(brand_name, brave_api_key, client)
+
+        web_results, social_media_results, trademark_results, domain_results_dict = await asyncio.gather(
+            self.search_web_async(client, brand_name, brave_api_key),
+            self.search_social_media_async(client, brand_name, brave_api_key),
+            self.check_trademarks_async(client, brand_name, brave_api_key),
+            self.check_domain_availability_async(brand_name, base_domain=base_domain),
+        )
+        return self._consolidate(brand_name, brave_api_key, web_results, social_media_results, trademark_results, domain_results_dict)
 
-        # Run individual checks, passing the key
-        web_results = self.search_web(brand_name, brave_api_key)
-        social_media_results = self.search_social_media(brand_name, brave_api_key)
-        # Pass key to trademark check as well
-        trademark_results = self.check_trademarks(brand_name, brave_api_key)
-        domain_results_dict = self.check_domain_availability(brand_name)
+    def _async_client(self):
+        """
+        Builds the httpx.AsyncClient for one research run (async pools are bound to their event loop).
+        The connection cap bounds concurrent Brave calls; extra requests wait for a free connection instead of timing out.
+        """
+        return httpx.AsyncClient(timeout=httpx.Timeout(15.0, pool=None),
+                                 limits=httpx.Limits(max_connections=self.brave_concurrency))
+
+    def research_batch(self, brand_names: list[str], brave_api_key: str | None) -> dict:
+        """
+        Researches several brand names at once. Returns a dict mapping each name to its research results.
+        Uses `research_batch_async` when possible, otherwise researches the names one after another.
+        """
+        if httpx is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.research_batch_async(brand_names, brave_api_key))
+        return {brand_name: self.research(brand_name, brave_api_key) for brand_name in brand_names}
 
+    async def research_batch_async(self, brand_names: list[str], brave_api_key: str | None) -> dict:
+        """
+        Researches several brand names concurrently over one shared client, so the BRAVE_CONCURRENCY cap
+        applies to the whole batch rather than to each name.
+        """
+        logger.info("Starting batch research for %s brand names.", len(brand_names))
+        async with self._async_client() as client:
+            results = await asyncio.gather(*(self.research_async(name, brave_api_key, client) for name in brand_names))
+        return dict(zip(brand_names, results))
+
+    def _consolidate(self, brand_name: str, brave_api_key: str | None, web_results: dict, social_media_results: dict,
+                     trademark_results: dict, domain_results_dict: dict) -> dict:
+        """Combines the individual check results into the research dict consumed by the evaluator and reporter."""
         # Consolidate results
         consolidated_results = {
             'brand_name': brand_name,
@@ -378,15 +1043,39 @@ class MarketResearchAgent:
             'domain_availability': domain_results_dict.get('results', {}),
             'error': web_results.get('error') or social_media_results.get('error') or trademark_results.get('error') or domain_results_dict.get('error')
         }
-        logger.info(f"Completed research for: {brand_name}")
+        logger.info("Completed research for: %s", brand_name)
+        if not consolidated_results['error']: # Failed checks are retried on the next call
+            self._research_cache.set(self._research_key(brand_name, brave_api_key), copy.deepcopy(consolidated_results))
         return consolidated_results
 
+    @staticmethod
+    def _research_key(brand_name: str, brave_api_key: str | None) -> tuple[str, str]:
+        # Per Brave key (hashed, never stored): a caller with another key, or none, doesn't get someone else's results
+        key_hash = hashlib.sha256(brave_api_key.encode()).hexdigest()[:16] if brave_api_key else ''
+        return brand_name.strip().casefold(), key_hash
+
+    def _research_cache_get(self, brand_name: str, brave_api_key: str | None) -> dict | None:
+        """Returns a deep copy of the cached research for this name and key (so callers can't mutate the cache), or None."""
+        cached = self._research_cache.get(self._research_key(brand_name, brave_api_key))
+        if cached is None:
+            return None
+        logger.info("Research cache hit for: %s", brand_name)
+        result = copy.deepcopy(cached)
+        result['brand_name'] = brand_name # Keep the caller's spelling
+        return result
+
+    def invalidate(self, brand_name: str, brave_api_key: str | None):
+        """Drops the cached research for a name and key so the next `research` call runs every check again."""
+        self._research_cache.pop(self._research_key(brand_name, brave_api_key))
+
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
-    # This example usage will need to be updated for the new request/process flow
-    # researcher = MarketResearchAgent()
-    # test_name = "ExampleBrandName"
-    # research_data = researcher.research(test_name)
-    # import json
-    # print(json.dumps(research_data, indent=2))
-    print("MarketResearchAgent defined. Run orchestrator for testing.")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Requires BRAVE_API_KEY in the environment; otherwise only the WHOIS checks return data
+    with MarketResearchAgent() as researcher:
+        test_name = "ExampleBrandName"
+        research_data = researcher.research(test_name, os.getenv("BRAVE_API_KEY"))
+    if orjson:
+        print(orjson.dumps(research_data, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(research_data, indent=2, default=dataclasses.asdict))
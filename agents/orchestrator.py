@@ -9,8 +9,7 @@ from .reporter import ReporterAgent
 from .evaluator import EvaluatorAgent
 from .qa import QAAgent
 
-# Configure Logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the application
 logger = logging.getLogger(__name__)
 
 class OrchestratorAgent:
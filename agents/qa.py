@@ -1,18 +1,24 @@
+import asyncio
+import hashlib
 import logging
 import os
 import json
+import re
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from agents.clients import build_async_openai_client, build_openai_client, count_tokens, import_openai, openai_available
+from utils.cache import SemanticCache, TTLCache
+
+# Logging is configured by the application
 logger = logging.getLogger(__name__)
 
+# openai itself is imported lazily (on the first client or error), see agents.clients
+if not openai_available:
+    logger.warning("OpenAI library not found. Please install it (`pip install openai`). QAAgent will not function.")
+
 try:
-    from openai import OpenAI, RateLimitError, APIError
-    openai_available = True
+    import orjson
 except ImportError:
-    openai_available = False
-    logger.warning("OpenAI library not found. Please install it (`pip install openai`). QAAgent will not function.")
-    OpenAI = None # Define OpenAI as None if import fails
+    orjson = None # Falls back to the stdlib json module
 
 
 class QAAgent:
@@ -21,12 +27,70 @@ class QAAgent:
     using the original report data as context.
     """
 
-    def __init__(self, model: str = "gpt-4o"): # Use the same model as evaluator for consistency
+    # Static instructions, sent byte-identical as the first message of every call so OpenAI's automatic
+    # prompt caching can reuse the prefix; the analysis context and the question follow as separate messages
+    _SYSTEM_PROMPT = (
+        "You are a helpful AI assistant answering follow-up questions about a brand analysis report. "
+        "You are assisting a user who received an initial analysis for a brand name; the first user message "
+        "contains the key findings of that analysis as JSON, the next one the user's follow-up question.\n\n"
+        "**Task:**\n"
+        "Answer the user's question.\n"
+        "- If the question asks for information *directly present* in the provided context data (e.g., \"What was the .com domain status?\"), answer based *only* on that context.\n"
+        "- If the question asks for *creative brainstorming* or *suggestions* related to the analyzed brand (e.g., \"Suggest alternative names\", \"What are some tagline ideas?\"), use the context as background inspiration and provide a few relevant ideas.\n"
+        "- If the context doesn't contain the information to answer a factual question, clearly state that the information isn't available in the report data.\n"
+        "- Do not perform new searches or access external information.\n"
+        "- Keep your answer concise and helpful."
+    )
+    _SYSTEM_MSG = {"role": "system", "content": _SYSTEM_PROMPT}
+    _TEMPERATURE = 0.3
+    # Answers are only reused when sampling is near-deterministic; at higher temperatures users expect variety
+    _CACHEABLE_TEMPERATURE = 0.3
+    # Question routing (see `classify_question`): brainstorming and explanations go to the main model,
+    # plain lookups in the report data to the cheaper `lookup_model`
+    _SYNTHESIS_KEYWORDS = ("suggest", "alternative", "idea", "tagline", "slogan", "brainstorm", "come up with")
+    _REASONING_KEYWORDS = ("why", "how ", "explain", "elaborate", "mean", "compare", "recommend", "should", "improve", "risk")
+    # Domain questions answered straight from `domain_availability`, e.g. "Is the .com available?"
+    _DOMAIN_QUESTION = re.compile(r"\b(available|availability|taken|free|registered|status)\b")
+    _HOST_TOKEN = re.compile(r"[\w-]+(?:\.[\w-]+)+") # "acme.io", "instagram.com"
+    _TLD_TOKEN = re.compile(r"(?<![\w.])\.([\w-]+)\b") # A standalone ".com", never the suffix of a host
+    _DOMAIN_STATUS_TEXT = {
+        "taken": "taken (it is registered)",
+        "potentially_available": "potentially available (no WHOIS registration was found)",
+    }
+    # Question words that make the per-platform social media statuses worth their tokens
+    _SOCIAL_KEYWORDS = ("social", "twitter", "instagram", "facebook", "handle", "platform", "x.com")
+
+    def __init__(self, model: str = "gpt-4o", answer_cache_size: int = 512,
+                 context_budget_tokens: int = 800, provider: str = "openai",
+                 lookup_model: str | None = "gpt-4o-mini", semantic_threshold: float | None = None,
+                 embedding_model: str = "text-embedding-3-small"): # Use the same model as evaluator for consistency
         """
         Initialize the QA Agent.
         (OpenAI client is no longer initialized here)
+
+        Args:
+            model (str): The OpenAI model to use for answers.
+            answer_cache_size (int): Answers kept for repeated (question, analysis) pairs. 0 disables the cache.
+            context_budget_tokens (int): Token budget for the analysis context; larger contexts are cut down
+                to the parts relevant to the question (see `_select_relevant_context`).
+            provider (str): Message format to build, 'openai' or 'anthropic' (see `_build_messages`).
+            lookup_model (str, optional): Cheaper model for questions classified as 'lookup'. None always uses `model`.
+            semantic_threshold (float | None): Enables the semantic answer cache: on an exact-cache miss, reuse the
+                answer to an earlier question about the same analysis whose embedding has at least this cosine
+                similarity (e.g. 0.92). Costs an embedding call per uncached question. None disables it.
+            embedding_model (str): OpenAI embedding model used by the semantic cache.
         """
         # self.client = None # Client will be created per-request
+        # Exact-match answer cache: re-asking the same question about the same analysis skips the LLM call
+        self._answer_cache = TTLCache(maxsize=answer_cache_size)
+        # Rendered context per (research_data, evaluation_data) object pair, see `_context_block`
+        self._context_memo = TTLCache(maxsize=32)
+        # Paraphrased questions: answers by question embedding, one namespace per analysis
+        self._semantic_cache = SemanticCache(maxsize=answer_cache_size, threshold=semantic_threshold) if semantic_threshold else None
+        self.embedding_model = embedding_model
+        self.context_budget_tokens = context_budget_tokens
+        self.provider = provider
+        self.lookup_model = lookup_model
         self.model = model
         if not openai_available:
              logger.error("QAAgent cannot run: OpenAI library is missing.")
@@ -43,16 +107,126 @@ class QAAgent:
              logger.error("OpenAI API key was not provided.")
              return None
          try:
-             return OpenAI(api_key=api_key)
+             return build_openai_client(api_key) # Cached per key hash, on the shared connection pool
          except Exception as e:
              logger.exception(f"Failed to initialize OpenAI client with provided key: {e}")
              return None
 
-    def _construct_qa_prompt(self, question: str, research_data: dict, evaluation_data: dict) -> str:
-        """Constructs the prompt for the LLM to answer a follow-up question."""
+    def _get_async_openai_client(self, api_key: str | None):
+         """
+         Safely creates an AsyncOpenAI client with the provided key (one per batch of questions).
+         Async connection pools are bound to the event loop that opened them, so they are not reused across batches.
+         """
+         if not openai_available:
+             logger.error("OpenAI library not available.")
+             return None
+         if not api_key:
+             logger.error("OpenAI API key was not provided.")
+             return None
+         try:
+             return build_async_openai_client(api_key)
+         except Exception as e:
+             logger.exception(f"Failed to initialize AsyncOpenAI client with provided key: {e}")
+             return None
+
+    def _construct_qa_messages(self, question: str, research_data: dict, evaluation_data: dict) -> list[dict]:
+        """Constructs the messages for one question: static instructions, analysis context, then the question."""
+        context_block = self._context_block(research_data, evaluation_data, question)
+        return self._build_messages(f"**User's Follow-up Question:**\n{question}", context_block)
+
+    def _build_messages(self, question_content: str, context_block: str) -> list[dict]:
+        """
+        Splits the prompt into a persistent prefix (instructions, then the analysis context, both identical for
+        every question in a session) and the ephemeral question, each as its own message.
+
+        For OpenAI this shape is all prefix caching needs: the stable messages come first.
+        For Anthropic the two prefix messages are marked with `cache_control` breakpoints, since its prompt
+        cache only reuses explicitly marked prefixes (the client passes the system entry as `system=`).
+
+        Args:
+            question_content (str): The question part of the prompt.
+            context_block (str): The rendered analysis context, see `_context_block`.
+
+        Returns:
+            list[dict]: Chat messages in the configured provider's format.
+        """
+        messages = [self._SYSTEM_MSG, {"role": "user", "content": context_block}, {"role": "user", "content": question_content}]
+        if self.provider == "anthropic":
+            cached = [
+                {"role": message["role"],
+                 "content": [{"type": "text", "text": message["content"], "cache_control": {"type": "ephemeral"}}]}
+                for message in messages[:2]
+            ]
+            messages = cached + messages[2:]
+        return messages
+
+    def _context_block(self, research_data: dict, evaluation_data: dict, question: str) -> str:
+        """
+        Renders the analysis findings the model answers from (the part of the prompt shared by all follow-ups),
+        cut down to what's relevant to `question` when the full findings exceed the token budget.
+        The full rendering is memoized per object pair: the cache key and the prompt of a question, and every
+        question of a multi-question batch, share it. The memo keeps references to the objects so their ids
+        can't be reused by other dicts while the entry lives.
+        """
+        context, block, tokens = self._full_context(research_data, evaluation_data)
+        if tokens <= self.context_budget_tokens:
+            return block # Everything fits: one shared rendering for every question
+        return self._render_context(self._select_relevant_context(question, context))
+
+    def _full_context(self, research_data: dict, evaluation_data: dict) -> tuple[dict, str, int]:
+        """The (context dict, full rendering, its token count) of an analysis, memoized per object pair."""
+        memo_key = (id(research_data), id(evaluation_data))
+        memo = self._context_memo.get(memo_key)
+        if memo is not None and memo[0] is research_data and memo[1] is evaluation_data:
+            return memo[2:]
+        context = self._build_context(research_data, evaluation_data)
+        block = self._render_context(context)
+        tokens = count_tokens(block, self.model or "gpt-4o")
+        self._context_memo.set(memo_key, (research_data, evaluation_data, context, block, tokens))
+        return context, block, tokens
+
+    def prepare_context(self, research_data: dict, evaluation_data: dict):
+        """
+        Renders and memoizes the context for this analysis ahead of the first follow-up question
+        (e.g. right after the analysis), so answering it doesn't start with serializing the research.
+        Pass the same objects the follow-up calls will receive.
+        """
+        if research_data:
+            self._context_block(research_data, evaluation_data, "")
+
+    def _select_relevant_context(self, question: str, full_context: dict, budget_tokens: int | None = None) -> dict:
+        """
+        Drops the context parts least likely to matter for `question` until the rendering fits the budget.
+        The brand name, domain statuses, web conflict count and trademark status are always kept; the
+        per-platform social statuses only when the question mentions social media; the evaluation summary
+        only if it still fits.
+
+        Args:
+            question (str): The follow-up question (or several, joined, for a batch).
+            full_context (dict): Context as built by `_build_context`; never mutated.
+            budget_tokens (int, optional): Defaults to the agent's `context_budget_tokens`.
+
+        Returns:
+            dict: `full_context` itself if it fits, otherwise a trimmed copy.
+        """
+        budget = self.context_budget_tokens if budget_tokens is None else budget_tokens
+        model = self.model or "gpt-4o"
+        if count_tokens(self._render_context(full_context), model) <= budget:
+            return full_context
 
+        summary = dict(full_context["research_summary"])
+        context = dict(full_context, research_summary=summary)
+        lowered = question.casefold()
+        if not any(keyword in lowered for keyword in self._SOCIAL_KEYWORDS):
+            summary.pop("social_media_status", None)
+        if count_tokens(self._render_context(context), model) > budget:
+            context["evaluation_summary"] = "Omitted from this context (too large); answer from the research summary."
+        return context
+
+    def _build_context(self, research_data: dict, evaluation_data: dict) -> dict:
+        """Builds the summary context dict the model answers from."""
         # Combine context concisely
-        context = {
+        return {
             "brand_name": research_data.get('brand_name', 'N/A'),
             "research_summary": {
                 "web_conflict_count": len(research_data.get('web_search', {}).get('potential_conflicts', [])),
@@ -63,28 +237,124 @@ class QAAgent:
             "evaluation_summary": evaluation_data if evaluation_data and not evaluation_data.get('error') else "Evaluation not available or failed."
         }
 
-        prompt = f"""
-        **Context:**
-        You are assisting a user who received an initial analysis for the brand name '{context['brand_name']}'.
-        The key findings from the analysis are summarized below:
-        ```json
-        {json.dumps(context, indent=2, default=str)}
-        ```
+    def _render_context(self, context: dict) -> str:
+        """Renders a context dict as a fenced JSON block."""
+        return (
+            f"**Context:** key findings of the analysis for the brand name '{context['brand_name']}':\n"
+            f"```json\n{self._dumps(context)}\n```"
+        )
+
+    @staticmethod
+    def _dumps(context: dict) -> str:
+        """
+        Compact JSON with sorted keys: indentation only costs input tokens, and a stable key order keeps
+        the rendered context byte-identical for the same analysis (prompt-prefix and answer cache hits).
+        """
+        if orjson:
+            return orjson.dumps(context, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(context, sort_keys=True, separators=(",", ":"), default=str)
+
+    @classmethod
+    def classify_question(cls, question: str) -> str:
+        """
+        Cheap keyword routing, no LLM call: 'synthesis' (suggestions, brainstorming), 'reasoning'
+        (explanations, comparisons, advice) or 'lookup' (facts read off the report data).
+        """
+        lowered = question.casefold()
+        if any(keyword in lowered for keyword in cls._SYNTHESIS_KEYWORDS):
+            return "synthesis"
+        if any(keyword in lowered for keyword in cls._REASONING_KEYWORDS):
+            return "reasoning"
+        return "lookup"
+
+    def _route_model(self, questions: list[str]) -> str:
+        """The cheaper lookup model if every question is a lookup, else the main model."""
+        if self.lookup_model and all(self.classify_question(question) == "lookup" for question in questions):
+            return self.lookup_model
+        return self.model
+
+    def _direct_answer(self, question: str, research_data: dict) -> str | None:
+        """
+        Answers domain status lookups ("Is the .com taken?", "acme.io available?") straight from the research
+        data, without an LLM call. Returns None for anything else, or when the question matches no single domain.
+        """
+        domains = research_data.get('domain_availability') or {}
+        lowered = question.casefold()
+        if not domains or self.classify_question(question) != "lookup" or not self._DOMAIN_QUESTION.search(lowered):
+            return None
+        hosts = set(self._HOST_TOKEN.findall(lowered))
+        if hosts: # Named hosts must be researched domains exactly ("on instagram.com?" is not about acme.com)
+            matches = [domain for domain in domains if domain.casefold() in hosts]
+        else:
+            tlds = set(self._TLD_TOKEN.findall(lowered))
+            matches = [domain for domain in domains if domain.casefold().rsplit('.', 1)[-1] in tlds]
+        if len(matches) != 1:
+            return None
+        domain = matches[0]
+        status = domains[domain]
+        status_text = self._DOMAIN_STATUS_TEXT.get(status, f"reported as '{status}'")
+        return f"According to the analysis, **{domain}** is {status_text}."
+
+    def _known_answer(self, question: str, research_data: dict, cache_key: str | None) -> str | None:
+        """An answer that needs no LLM call: from the answer cache, or read directly off the research data."""
+        cached = self._answer_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            logger.info("QA answer cache hit.")
+            return cached
+        direct = self._direct_answer(question, research_data)
+        if direct is not None:
+            logger.info("QA question answered directly from the research data.")
+        return direct
 
-        **User's Follow-up Question:**
-        {question}
+    def _embed_question(self, client, question: str, research_data: dict, evaluation_data: dict) -> tuple[list[float] | None, str]:
+        """
+        Embeds the question for the semantic cache and returns it with the analysis namespace (a hash of the
+        model and the full rendered context). The embedding is None on failure, so the question is simply
+        answered uncached.
+        """
+        namespace = hashlib.sha256("\0".join((self.model, self._full_context(research_data, evaluation_data)[1])).encode()).hexdigest()
+        try:
+            embedding = client.embeddings.create(model=self.embedding_model, input=" ".join(question.split())).data[0].embedding
+            return embedding, namespace
+        except Exception as e:
+            logger.warning("Could not embed the question; skipping the QA semantic cache: %s", e)
+            return None, namespace
 
-        **Task:**
-        Answer the user's question.
-        - If the question asks for information *directly present* in the provided context data (e.g., "What was the .com domain status?"), answer based *only* on that context.
-        - If the question asks for *creative brainstorming* or *suggestions* related to the analyzed brand (e.g., "Suggest alternative names", "What are some tagline ideas?"), use the context as background inspiration and provide a few relevant ideas.
-        - If the context doesn't contain the information to answer a factual question, clearly state that the information isn't available in the report data.
-        - Do not perform new searches or access external information.
-        - Keep your answer concise and helpful.
+    def _semantic_answer(self, client, question: str, research_data: dict, evaluation_data: dict,
+                         cache_key: str | None) -> tuple[str | None, list[float] | None, str | None]:
+        """
+        Looks the question up in the semantic cache (only when it's enabled and answers are cacheable).
+        Returns (cached answer or None, embedding, namespace); pass the last two to `_remember_answer`.
+        """
+        if self._semantic_cache is None or not cache_key:
+            return None, None, None
+        embedding, namespace = self._embed_question(client, question, research_data, evaluation_data)
+        if embedding is None:
+            return None, None, None
+        cached = self._semantic_cache.get(embedding, namespace=namespace)
+        if cached is not None:
+            logger.info("QA semantic cache hit.")
+            self._answer_cache.set(cache_key, cached) # The exact question is now known too
+        return cached, embedding, namespace
+
+    def _remember_answer(self, cache_key: str | None, answer: str, embedding: list[float] | None = None,
+                         namespace: str | None = None):
+        """Caches a complete answer: exact-match by `cache_key`, and semantically if an embedding was made."""
+        if cache_key:
+            self._answer_cache.set(cache_key, answer)
+        if embedding is not None:
+            self._semantic_cache.set(embedding, answer, namespace=namespace)
 
-        **Answer:**
+    def _answer_cache_key(self, question: str, research_data: dict, evaluation_data: dict) -> str | None:
         """
-        return prompt
+        Key for the answer cache: model, whitespace/case-normalized question and the rendered context.
+        Returns None when answers shouldn't be cached at the configured temperature.
+        """
+        if self._TEMPERATURE > self._CACHEABLE_TEMPERATURE:
+            return None
+        normalized_question = " ".join(question.split()).casefold()
+        raw = "\0".join((self.model, normalized_question, self._context_block(research_data, evaluation_data, question)))
+        return hashlib.sha256(raw.encode()).hexdigest()
 
     def answer_followup(self, question: str, research_data: dict, evaluation_data: dict, openai_api_key: str | None) -> dict:
         """
@@ -112,35 +382,265 @@ class QAAgent:
             logger.warning("Missing context data for answering follow-up question.")
             return {"error": "Missing original analysis context to answer question."}
 
-        prompt = self._construct_qa_prompt(question, research_data, evaluation_data)
+        cache_key = self._answer_cache_key(question, research_data, evaluation_data)
+        cached = self._known_answer(question, research_data, cache_key)
+        if cached is not None:
+            return {"answer": cached}
+        cached, embedding, namespace = self._semantic_answer(client, question, research_data, evaluation_data, cache_key)
+        if cached is not None:
+            return {"answer": cached}
+
+        messages = self._construct_qa_messages(question, research_data, evaluation_data)
         logger.debug(f"Constructed QA prompt for question: '{question}'")
 
         try:
-            logger.info(f"Sending QA request to OpenAI model: {self.model}")
+            model = self._route_model([question])
+            logger.info(f"Sending QA request to OpenAI model: {model}")
             response = client.chat.completions.create( # Use the client created with the passed key
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant answering follow-up questions about a brand analysis report based only on the provided context. Be concise."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
+                model=model,
+                messages=messages,
+                temperature=self._TEMPERATURE,
                 max_tokens=150
             )
 
             answer = response.choices[0].message.content.strip()
-            logger.info(f"Received QA answer from {self.model}.")
+            logger.info(f"Received QA answer from {model}.")
+            self._remember_answer(cache_key, answer, embedding, namespace) # Errors (below) are never cached
             return {"answer": answer}
 
-        except RateLimitError as rle:
+        except import_openai().RateLimitError as rle: # Resolved only while matching an exception
             logger.error(f"OpenAI rate limit exceeded during QA: {rle}")
             return {"error": f"OpenAI rate limit exceeded: {rle}"}
-        except APIError as apie:
+        except import_openai().APIError as apie:
             logger.error(f"OpenAI API error during QA: {apie}")
             return {"error": f"OpenAI API error: {apie}"}
         except Exception as e:
             logger.exception(f"An unexpected error occurred during QA: {e}")
             return {"error": f"An unexpected error occurred during QA: {str(e)}"}
 
+    def stream_followup(self, question: str, research_data: dict, evaluation_data: dict, openai_api_key: str | None):
+        """
+        Streaming counterpart of `answer_followup`: yields the answer as the model produces it, so the user
+        sees the first words after the time-to-first-token instead of after the whole completion.
+        `max_tokens=150` stays as a ceiling; most answers end naturally before it.
+
+        Yields:
+            dict: {'delta': str} for each piece of answer text, then one final {'answer': str}
+                  (the complete, stripped answer) or {'error': str}.
+        """
+        logger.info(f"QA Agent received follow-up question (streaming): '{question}'")
+
+        if not self.model:
+             yield {"error": "QA Agent is not properly initialized (OpenAI library missing)."}
+             return
+        client = self._get_openai_client(openai_api_key)
+        if not client:
+             yield {"error": "Failed to create OpenAI client for QA (check API key)."}
+             return
+        if not research_data:
+            logger.warning("Missing context data for answering follow-up question.")
+            yield {"error": "Missing original analysis context to answer question."}
+            return
+
+        cache_key = self._answer_cache_key(question, research_data, evaluation_data)
+        cached = self._known_answer(question, research_data, cache_key)
+        if cached is None:
+            cached, embedding, namespace = self._semantic_answer(client, question, research_data, evaluation_data, cache_key)
+        if cached is not None:
+            yield {"delta": cached}
+            yield {"answer": cached}
+            return
+
+        messages = self._construct_qa_messages(question, research_data, evaluation_data)
+        parts = []
+        try:
+            model = self._route_model([question])
+            logger.info(f"Sending streaming QA request to OpenAI model: {model}")
+            stream = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=self._TEMPERATURE,
+                max_tokens=150,
+                stream=True
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield {"delta": delta}
+        except import_openai().RateLimitError as rle: # Resolved only while matching an exception
+            logger.error(f"OpenAI rate limit exceeded during QA: {rle}")
+            yield {"error": f"OpenAI rate limit exceeded: {rle}"}
+            return
+        except import_openai().APIError as apie:
+            logger.error(f"OpenAI API error during QA: {apie}")
+            yield {"error": f"OpenAI API error: {apie}"}
+            return
+        except Exception as e:
+            logger.exception(f"An unexpected error occurred during QA: {e}")
+            yield {"error": f"An unexpected error occurred during QA: {str(e)}"}
+            return
+
+        answer = "".join(parts).strip()
+        logger.info(f"Streamed QA answer from {model}.")
+        if answer:
+            self._remember_answer(cache_key, answer, embedding, namespace) # Only complete answers are cached
+        yield {"answer": answer}
+
+    async def aanswer_followup(self, question: str, research_data: dict, evaluation_data: dict,
+                               openai_api_key: str | None, client=None) -> dict:
+        """
+        Async counterpart of `answer_followup`: the LLM round-trip doesn't block the event loop.
+
+        Args:
+            client (AsyncOpenAI, optional): Client to issue the request on (shared by `answer_followups_async`).
+                A client is created and closed for this call if omitted.
+
+        Returns:
+            dict: A dictionary containing the answer under the key 'answer' or an 'error'.
+        """
+        logger.info(f"QA Agent received follow-up question: '{question}'")
+
+        if not self.model:
+             return {"error": "QA Agent is not properly initialized (OpenAI library missing)."}
+        if not research_data:
+            logger.warning("Missing context data for answering follow-up question.")
+            return {"error": "Missing original analysis context to answer question."}
+
+        if client is None:
+            client = self._get_async_openai_client(openai_api_key)
+            if not client:
+                 return {"error": "Failed to create OpenAI client for QA (check API key)."}
+            try:
+                return await self.aanswer_followup(question, research_data, evaluation_data, openai_api_key, client)
+            finally:
+                await client.close()
+
+        cache_key = self._answer_cache_key(question, research_data, evaluation_data)
+        cached = self._known_answer(question, research_data, cache_key)
+        if cached is not None:
+            return {"answer": cached}
+
+        messages = self._construct_qa_messages(question, research_data, evaluation_data)
+        try:
+            model = self._route_model([question])
+            logger.info(f"Sending QA request to OpenAI model: {model}")
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=self._TEMPERATURE,
+                max_tokens=150
+            )
+            answer = response.choices[0].message.content.strip()
+            logger.info(f"Received QA answer from {model}.")
+            if cache_key:
+                self._answer_cache.set(cache_key, answer)
+            return {"answer": answer}
+
+        except import_openai().RateLimitError as rle: # Resolved only while matching an exception
+            logger.error(f"OpenAI rate limit exceeded during QA: {rle}")
+            return {"error": f"OpenAI rate limit exceeded: {rle}"}
+        except import_openai().APIError as apie:
+            logger.error(f"OpenAI API error during QA: {apie}")
+            return {"error": f"OpenAI API error: {apie}"}
+        except Exception as e:
+            logger.exception(f"An unexpected error occurred during QA: {e}")
+            return {"error": f"An unexpected error occurred during QA: {str(e)}"}
+
+    async def answer_followups_async(self, questions: list[str], research_data: dict, evaluation_data: dict,
+                                     openai_api_key: str | None) -> list[dict]:
+        """Answers several follow-up questions concurrently over one client. Returns one result dict per question, in order."""
+        if not self.model:
+             return [{"error": "QA Agent is not properly initialized (OpenAI library missing)."} for _ in questions]
+        client = self._get_async_openai_client(openai_api_key)
+        if not client:
+             return [{"error": "Failed to create OpenAI client for QA (check API key)."} for _ in questions]
+        try:
+            return list(await asyncio.gather(*(
+                self.aanswer_followup(question, research_data, evaluation_data, openai_api_key, client) for question in questions
+            )))
+        finally:
+            await client.close()
+
+    def answer_followups(self, questions: list[str], research_data: dict, evaluation_data: dict,
+                         openai_api_key: str | None) -> list[dict]:
+        """
+        Sync entry point for `answer_followups_async` (e.g. from a Flask view): all questions are in flight at once,
+        so N questions take about as long as the slowest one. Must not be called from a running event loop.
+        """
+        return asyncio.run(self.answer_followups_async(questions, research_data, evaluation_data, openai_api_key))
+
+    def answer_followups_batch(self, questions: list[str], research_data: dict, evaluation_data: dict,
+                               openai_api_key: str | None) -> list[dict]:
+        """
+        Answers several follow-up questions in a single LLM request: the shared context is sent (and billed) once,
+        followed by the numbered questions, and the model returns a JSON array of answers. Cached answers are
+        reused and only the remaining questions are sent. If the batched response can't be used, the remaining
+        questions are answered individually (concurrently) instead.
+
+        Returns:
+            list[dict]: One dict per question, in order, with 'answer' or 'error'.
+        """
+        if len(questions) <= 1:
+            return [self.answer_followup(question, research_data, evaluation_data, openai_api_key) for question in questions]
+        if not self.model:
+             return [{"error": "QA Agent is not properly initialized (OpenAI library missing)."} for _ in questions]
+        client = self._get_openai_client(openai_api_key)
+        if not client:
+             return [{"error": "Failed to create OpenAI client for QA (check API key)."} for _ in questions]
+        if not research_data:
+            logger.warning("Missing context data for answering follow-up questions.")
+            return [{"error": "Missing original analysis context to answer question."} for _ in questions]
+
+        results = [None] * len(questions)
+        cache_keys = [self._answer_cache_key(question, research_data, evaluation_data) for question in questions]
+        for i, cache_key in enumerate(cache_keys):
+            cached = self._known_answer(questions[i], research_data, cache_key)
+            if cached is not None:
+                results[i] = {"answer": cached}
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            logger.info("All %s follow-up questions served from the QA answer cache.", len(questions))
+            return results
+
+        numbered = "\n".join(f"{n}. {questions[i]}" for n, i in enumerate(pending, 1))
+        messages = self._build_messages(
+            f"**User's Follow-up Questions:**\n{numbered}\n\n"
+            f"Answer each question separately. Return a JSON object {{\"answers\": [...]}} with exactly "
+            f"{len(pending)} answer strings, in the order of the questions.",
+            self._context_block(research_data, evaluation_data, ' '.join(questions[i] for i in pending))
+        )
+        answers = None
+        try:
+            model = self._route_model([questions[i] for i in pending])
+            logger.info("Sending batched QA request (%s questions) to OpenAI model: %s", len(pending), model)
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=self._TEMPERATURE,
+                max_tokens=150 * len(pending), # Same per-answer budget as single questions
+                response_format={"type": "json_object"}
+            )
+            answers = json.loads(response.choices[0].message.content)["answers"]
+            if not (isinstance(answers, list) and len(answers) == len(pending) and all(isinstance(a, str) for a in answers)):
+                raise ValueError(f"expected {len(pending)} answer strings")
+        except Exception as e:
+            logger.warning("Batched QA request unusable (%s: %s); answering the questions individually.", type(e).__name__, e)
+            answers = None
+
+        if answers is None:
+            fallback = self.answer_followups([questions[i] for i in pending], research_data, evaluation_data, openai_api_key)
+            for i, result in zip(pending, fallback):
+                results[i] = result
+            return results
+
+        for i, answer in zip(pending, answers):
+            results[i] = {"answer": answer.strip()}
+            if cache_keys[i]:
+                self._answer_cache.set(cache_keys[i], results[i]["answer"])
+        logger.info("Received %s batched QA answers from %s.", len(pending), model)
+        return results
+
 # Remove old __main__ block - testing requires context
 # if __name__ == '__main__':
 #    ... (old example usage removed)
@@ -1,21 +1,62 @@
 # brand_navigator/agents/reporter.py
 
+import dataclasses
+import functools
+import io
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 # Depending on output format, might need:
 # import markdown
 # from jinja2 import Environment, FileSystemLoader # For HTML reports
 # from weasyprint import HTML # For PDF from HTML
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the application (or the __main__ block below)
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=256)
+def _pretty(key: str) -> str:
+    """'potential_conflicts' -> 'Potential Conflicts'. Cached: the same keys recur in every report."""
+    return key.replace('_', ' ').title()
+
+
+def _plain(value):
+    """Research values as plain dicts/lists: web hits and conflicts are dataclasses, whose reprs don't belong in a report."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def report_timestamp(resolution_seconds: int = 0) -> str:
+    """
+    UTC timestamp for a report header, e.g. '2025-01-31T14:05:00+00:00'.
+
+    Args:
+        resolution_seconds (int): Round down to this many seconds (e.g. 60), so a report regenerated
+            from the same data within that window is byte-identical and can be served from caches.
+    """
+    now = datetime.now(timezone.utc)
+    if resolution_seconds > 1:
+        now = datetime.fromtimestamp(now.timestamp() // resolution_seconds * resolution_seconds, timezone.utc)
+    return now.isoformat(timespec='seconds')
+
+
 class ReporterAgent:
     """
     Agent responsible for compiling research and evaluation findings into a structured report.
     """
 
+    # (title, research_data key, shown even when empty) for each research section, in report order
+    _RESEARCH_SECTIONS = (
+        ("Market Research Summary", 'web_search', True),
+        ("Social Media Presence", 'social_media_search', True),
+        ("Trademark Check", 'trademark_check', True),
+        ("Domain Availability", 'domain_availability', False),
+    )
+
     def __init__(self, template_dir: str = None):
         """
         Initialize the Reporter Agent.
@@ -32,22 +73,52 @@ class ReporterAgent:
             logger.info(f"Using template directory: {template_dir}")
 
 
-    def _format_section(self, title: str, data: dict) -> str:
-        """Helper method to format a section of the report (e.g., using Markdown)."""
+    def _format_section(self, buf: io.StringIO, title: str, data: dict) -> None:
+        """Helper method to write a section of the report (e.g., using Markdown) straight into `buf`."""
         # Basic Markdown formatting example
-        lines = [f"## {title}\n"]
+        buf.write(f"## {title}\n")
         if isinstance(data, dict):
             for key, value in data.items():
-                lines.append(f"- **{key.replace('_', ' ').title()}**: {value}")
+                buf.write(f"\n- **{_pretty(key)}**: {_plain(value)}")
         elif isinstance(data, list):
-             for item in data:
-                 lines.append(f"- {item}")
+            for item in data:
+                buf.write(f"\n- {_plain(item)}")
         else:
-            lines.append(str(data))
-        return "\n".join(lines) + "\n"
+            buf.write(f"\n{data}")
+        buf.write("\n")
 
 
-    def generate_report(self, brand_name: str, research_data: dict, evaluation_data: dict = None, output_format: str = 'markdown') -> str | bool:
+    def prerender_static(self, brand_name: str, research_data: dict, report_date: str | None = None) -> str:
+        """
+        Renders the markdown sections that don't depend on the evaluation (title, research, domains),
+        so they can be built while the evaluation is still running.
+
+        Args:
+            brand_name (str): The brand name being reported on.
+            research_data (dict): Data from the MarketResearchAgent.
+            report_date (str, optional): Header timestamp. Defaults to `report_timestamp()` (now, UTC).
+
+        Returns:
+            str: Markdown for the static sections, to be passed to `generate_report(prerendered=...)`.
+        """
+        buf = io.StringIO()
+        report_title = f"Brand Analysis Report: {brand_name}"
+        report_date = report_date or report_timestamp()
+
+        buf.write(f"# {report_title}\n")
+        buf.write(f"_Generated on: {report_date}_\n")
+
+        # Market Research Sections (each section is preceded by a blank line)
+        if research_data:
+             for title, key, always in self._RESEARCH_SECTIONS:
+                 data = research_data.get(key, {})
+                 if always or data:
+                     buf.write("\n")
+                     self._format_section(buf, title, data)
+        return buf.getvalue()
+
+    def generate_report(self, brand_name: str, research_data: dict, evaluation_data: dict = None, output_format: str = 'markdown',
+                        prerendered: str | None = None, report_date: str | None = None) -> str | bool:
         """
         Generates a report based on the provided data.
 
@@ -56,6 +127,9 @@ class ReporterAgent:
             research_data (dict): Data from the MarketResearchAgent.
             evaluation_data (dict, optional): Data from the EvaluatorAgent. Defaults to None.
             output_format (str): The desired output format ('markdown', 'html', 'pdf'). Defaults to 'markdown'.
+            prerendered (str, optional): Result of `prerender_static` for the same data (markdown only).
+            report_date (str, optional): Header timestamp. Defaults to `report_timestamp()` (now, UTC);
+                pass a quantized one (`report_timestamp(60)`) to get identical reports for identical data.
 
         Returns:
             str | bool: The generated report content as a string (for markdown/html)
@@ -68,49 +142,37 @@ class ReporterAgent:
             logger.error("Cannot generate report without research data.")
             return None
 
-        report_content = []
         report_title = f"Brand Analysis Report: {brand_name}"
-        report_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        report_date = report_date or report_timestamp()
 
         # --- Report Generation Logic ---
         if output_format == 'markdown':
-            report_content.append(f"# {report_title}")
-            report_content.append(f"_Generated on: {report_date}_\n")
-
-            # Market Research Section
-            if research_data:
-                 report_content.append(self._format_section("Market Research Summary", research_data.get('web_search', {})))
-                 report_content.append(self._format_section("Social Media Presence", research_data.get('social_media_search', {})))
-                 report_content.append(self._format_section("Trademark Check", research_data.get('trademark_check', {})))
-
-            # *** Add Domain Availability Section ***
-            if research_data.get('domain_availability'):
-                report_content.append(self._format_section("Domain Availability", research_data['domain_availability']))
-            # ******************************************
+            # Every section is written into one buffer; the report string is materialized once at the end
+            buf = io.StringIO()
+            # Title and research sections (possibly built earlier, while the evaluation was running)
+            buf.write(prerendered if prerendered is not None else self.prerender_static(brand_name, research_data, report_date))
 
             # --- Evaluation Section ---
-            report_content.append("\n## Brand Evaluation (via LLM)\n") # Add section header
+            buf.write("\n\n## Brand Evaluation (via LLM)\n") # Add section header
             if evaluation_data:
                 if evaluation_data.get("error"):
-                     report_content.append(f"\n*Evaluation Error: {evaluation_data['error']}*")
+                     buf.write(f"\n\n*Evaluation Error: {evaluation_data['error']}*")
                      # Optionally include raw response if available
                      if evaluation_data.get('raw_response'):
-                         report_content.append(f"\n_Raw LLM Response (on error):_\n```\n{evaluation_data['raw_response']}\n```")
+                         buf.write(f"\n\n_Raw LLM Response (on error):_\n```\n{evaluation_data['raw_response']}\n```")
                 else:
                     # Format the valid evaluation data
                     # Use title case for keys in the report
-                    formatted_eval = {
-                        key.replace('_', ' ').title(): value
-                        for key, value in evaluation_data.items()
-                    }
-                    report_content.append(self._format_section("Evaluation Summary", formatted_eval))
+                    formatted_eval = {_pretty(key): value for key, value in evaluation_data.items()}
+                    buf.write("\n")
+                    self._format_section(buf, "Evaluation Summary", formatted_eval)
             else:
-                report_content.append("\n_(No evaluation data provided or evaluation skipped)_")
+                buf.write("\n\n_(No evaluation data provided or evaluation skipped)_")
             # --------------------------
 
             # TODO: Add QA/Suggestions Section if applicable
 
-            final_report = "\n".join(report_content)
+            final_report = buf.getvalue()
             logger.info(f"Markdown report generated successfully for '{brand_name}'.")
             return final_report
 
@@ -120,6 +182,7 @@ class ReporterAgent:
             # Example using Jinja:
             # template = self.jinja_env.get_template('report_template.html')
             # html_content = template.render(title=report_title, date=report_date, ...)
+            # (or template.stream(...).dump(buf) into an io.StringIO, as the markdown path does)
             # return html_content
             return "<html><body><h1>HTML Report Not Implemented</h1></body></html>" # Placeholder
 
@@ -142,6 +205,7 @@ class ReporterAgent:
 
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     reporter = ReporterAgent()
     # Dummy data simulating output from other agents
     dummy_research = {
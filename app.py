@@ -2,81 +2,182 @@
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 # Removed markdown, request, jsonify, render_template, Markup imports as they are now in blueprints
-from flask import Flask, session # Keep session import if used outside blueprints, or remove if only used within
+from flask import Flask
 from dotenv import load_dotenv
 from flask_session import Session
 
+try:
+    import redis
+except ImportError:
+    redis = None # Sessions then use the filesystem (or in-memory) backend
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None # Responses are then sent uncompressed
+
 # Import our agent orchestrator
 from agents.orchestrator import OrchestratorAgent
+from utils.analysis_store import AnalysisCache, AnalysisStore
+from utils.limiter import ConcurrencyLimiter
+from utils import json_provider
 # Removed EvaluatorAgent import as it's likely used within Orchestrator
-from agents.qa import QAAgent
+# (the QAAgent is the orchestrator's too)
 
 # --- Import Blueprints ---
 from routes.analysis import analysis_bp
 from routes.qa import qa_bp
 from routes.settings import settings_bp # Import the new settings blueprint
+from routes.health import health_bp
 
 
 # --- Configuration & Setup ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured once, by create_app() (agent modules only create their loggers)
 logger = logging.getLogger(__name__)
 
-# Load environment variables from .env file located in the *brand_navigator* directory
-# Assuming the app is run from the project root (one level above brand_navigator)
-dotenv_path = os.path.join(os.path.dirname(__file__), '.env') # Looks for .env inside brand_navigator
-alt_dotenv_path = '.env' # If .env is in project root instead
 
-# Try loading from brand_navigator first, then project root
-loaded_env = load_dotenv(dotenv_path=dotenv_path, override=True)
-if not loaded_env:
-    logger.info(f"Did not find .env in {dotenv_path}, trying project root {alt_dotenv_path}...")
-    loaded_env = load_dotenv(dotenv_path=alt_dotenv_path, override=True)
+def _configure_logging() -> None:
+    """Installs the root log handler unless the host (gunicorn, tests, an embedding app) already did."""
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-if loaded_env:
-    logger.info("Successfully loaded .env file.")
-else:
-    logger.warning("Could not find .env file in standard locations. API keys might be missing.")
+
+def _load_env() -> None:
+    """Loads environment variables from the .env file (inside brand_navigator first, then the project root)."""
+    # Assuming the app is run from the project root (one level above brand_navigator)
+    dotenv_path = os.path.join(os.path.dirname(__file__), '.env') # Looks for .env inside brand_navigator
+    alt_dotenv_path = '.env' # If .env is in project root instead
+
+    # Try loading from brand_navigator first, then project root
+    loaded_env = load_dotenv(dotenv_path=dotenv_path, override=True)
+    if not loaded_env:
+        logger.info("Did not find .env in %s, trying project root %s...", dotenv_path, alt_dotenv_path)
+        loaded_env = load_dotenv(dotenv_path=alt_dotenv_path, override=True)
+
+    if loaded_env:
+        logger.info("Successfully loaded .env file.")
+    else:
+        logger.warning("Could not find .env file in standard locations. API keys might be missing.")
 
 # --- Flask App Initialization ---
-# Note: Removed template_folder and static_folder here as they are defined in the analysis_bp
-app = Flask(__name__)
-app.logger.setLevel(logging.DEBUG) # <-- Set logger level to DEBUG
-
-# --- Configure Flask-Session ---
-# Load SECRET_KEY from environment or use a default (change for production!)
-app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'a_default_development_secret_key')
-if app.config['SECRET_KEY'] == 'a_default_development_secret_key':
-    logger.warning("Using default SECRET_KEY. Set FLASK_SECRET_KEY environment variable for production!")
-
-# Configure session type to filesystem (stores sessions in a 'flask_session' folder)
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SESSION_PERMANENT'] = False # Session expires when browser closes
-app.config['SESSION_USE_SIGNER'] = True # Encrypts the session cookie
-app.config['SESSION_FILE_DIR'] = os.path.join(os.path.dirname(__file__), 'flask_session')
-
-# Ensure the session directory exists
-os.makedirs(app.config['SESSION_FILE_DIR'], exist_ok=True)
-
-# Initialize the Session extension
-Session(app)
-# ------------------------------
-
-# --- Initialize Agents ---
-# Store agents directly on the app object for access via current_app in blueprints
-try:
-    app.orchestrator = OrchestratorAgent()
-    app.qa_agent = QAAgent()
-    logger.info("OrchestratorAgent and QAAgent initialized successfully and attached to app.")
-except Exception as e:
-    logger.exception(f"CRITICAL: Failed to initialize agents: {e}. Check API keys/agent code.")
-    app.orchestrator = None
-    app.qa_agent = None
-
-# --- Register Blueprints ---
-app.register_blueprint(analysis_bp)
-app.register_blueprint(qa_bp)
-app.register_blueprint(settings_bp) # Register the settings blueprint
+def create_app(config: dict | None = None) -> Flask:
+    """
+    Application factory: configures the Flask app, its server-side sessions, the shared agents and the blueprints.
+
+    The agents are built once per call. Serve the module-level `app` with a preloading server
+    (e.g. `gunicorn --preload app:app`) so they are built once in the master process and shared
+    copy-on-write by every forked worker, instead of once per worker.
+
+    Args:
+        config (dict, optional): Overrides applied on top of the environment-based configuration.
+    """
+    _configure_logging()
+    _load_env()
+
+    # Note: Removed template_folder and static_folder here as they are defined in the analysis_bp
+    app = Flask(__name__)
+    if os.getenv('FLASK_ENV') == 'development' or os.getenv('FLASK_DEBUG') == '1':
+        app.logger.setLevel(logging.DEBUG) # Verbose request logging in development only
+    if json_provider.orjson is not None:
+        app.json = json_provider.ORJSONProvider(app) # Faster jsonify/get_json, same output
+
+    # Server-wide API keys, read once at startup: used when the user hasn't set their own in the settings
+    app.config['BRAVE_API_KEY'] = os.getenv('BRAVE_API_KEY')
+    app.config['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY')
+
+    # --- Configure Flask-Session ---
+    # Load SECRET_KEY from environment or use a default (change for production!)
+    app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'a_default_development_secret_key')
+    if app.config['SECRET_KEY'] == 'a_default_development_secret_key':
+        logger.warning("Using default SECRET_KEY. Set FLASK_SECRET_KEY environment variable for production!")
+
+    app.config['SESSION_PERMANENT'] = False # Session expires when browser closes
+    app.config['SESSION_USE_SIGNER'] = True # Encrypts the session cookie
+    app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=2) # Also how long server-side session data is kept
+    # Only write server-side sessions that changed: follow-up questions only read the analysis context,
+    # so they no longer rewrite the whole session (and its expiry) on every request
+    app.config['SESSION_REFRESH_EACH_REQUEST'] = False
+    # Session backend: Redis when REDIS_URL is set (no disk I/O per request, shared by every app instance),
+    # in-process memory on request for single-process development, otherwise files in 'flask_session'
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url and redis is not None:
+        app.config['SESSION_TYPE'] = 'redis'
+        app.config['SESSION_REDIS'] = redis.Redis.from_url(redis_url)
+    elif os.getenv('SESSION_BACKEND') == 'memory':
+        from cachelib import SimpleCache # Flask-Session dependency
+        app.config['SESSION_TYPE'] = 'cachelib'
+        app.config['SESSION_CACHELIB'] = SimpleCache(threshold=1000, default_timeout=int(app.config['PERMANENT_SESSION_LIFETIME'].total_seconds()))
+    else:
+        if redis_url:
+            logger.warning("REDIS_URL is set but the `redis` package is not installed; using filesystem sessions.")
+        app.config['SESSION_TYPE'] = 'filesystem'
+    app.config['SESSION_FILE_DIR'] = os.path.join(os.path.dirname(__file__), 'flask_session')
+    # Response compression (Flask-Compress): Brotli, else gzip, for the larger JSON/HTML responses.
+    # Its default mimetypes leave text/event-stream alone, so streamed events aren't buffered.
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024 # Smaller bodies aren't worth the CPU
+    if config:
+        app.config.update(config)
+
+    # Ensure the session directory exists (filesystem backend only; usually it already does, so check first)
+    if app.config['SESSION_TYPE'] == 'filesystem' and not os.path.isdir(app.config['SESSION_FILE_DIR']):
+        os.makedirs(app.config['SESSION_FILE_DIR'], exist_ok=True)
+
+    # Initialize the Session extension
+    Session(app)
+    if Compress is not None:
+        Compress(app)
+    shared_redis = app.config['SESSION_REDIS'] if app.config['SESSION_TYPE'] == 'redis' else None
+    # Analysis context for follow-up questions: in Redis next to the sessions when available, else in the session
+    app.analysis_store = AnalysisStore(
+        redis_client=shared_redis,
+        ttl=int(app.config['PERMANENT_SESSION_LIFETIME'].total_seconds())
+    )
+    # Finished analyses by brand, for repeat /analyze requests (kept as long as the research cache),
+    # shared by every worker through Redis when available
+    app.analysis_cache = AnalysisCache(redis_client=shared_redis, ttl=1800)
+    # Shared pool for agent calls that overlap other work within a request (the LLM evaluation runs here
+    # while the report is prerendered), instead of a new thread per request. Threads start on first use,
+    # so with `--preload` each forked worker starts its own.
+    app.executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='agents')
+    # Load shedding: at most LLM_CONCURRENCY analyses/questions in flight per process, others get a 503 at once
+    app.llm_limiter = ConcurrencyLimiter(limit=int(os.getenv('LLM_CONCURRENCY', '8')))
+    # ------------------------------
+
+    # --- Initialize Agents ---
+    # Store agents directly on the app object for access via current_app in blueprints
+    try:
+        app.orchestrator = OrchestratorAgent()
+        app.qa_agent = app.orchestrator.qa_agent # One QAAgent (and its answer cache) for the whole app
+        logger.info("OrchestratorAgent and QAAgent initialized successfully and attached to app.")
+    except Exception as e:
+        logger.exception("CRITICAL: Failed to initialize agents: %s. Check API keys/agent code.", e)
+        app.orchestrator = None
+        app.qa_agent = None
+    # Fixed after startup, so /analyze checks one flag instead of the agents on every request
+    app.orchestrator_ready = bool(app.orchestrator and app.orchestrator.market_researcher
+                                  and app.orchestrator.evaluator and app.orchestrator.reporter)
+
+    # --- Register Blueprints ---
+    app.register_blueprint(analysis_bp)
+    app.register_blueprint(qa_bp)
+    app.register_blueprint(settings_bp) # Register the settings blueprint
+    app.register_blueprint(health_bp)
+
+    # Compile the page templates now rather than on the first request to each page (with `--preload`,
+    # once for every worker). Outside debug mode Flask doesn't re-check them for changes.
+    for template_name in ('index.html', 'settings.html'):
+        app.jinja_env.get_template(template_name)
+    return app
+
+
+app = create_app()
+# Module-level handles on the shared agents (the same objects as app.orchestrator / app.qa_agent)
+orchestrator = app.orchestrator
+qa_agent = app.qa_agent
 
 # --- Removed Global variable for context ---
 # --- Removed Routes --- (Moved to blueprints)
@@ -1,7 +1,8 @@
+import hashlib
 import logging
-from flask import Blueprint, render_template, request, jsonify, session, current_app
-from markupsafe import Markup
-import os
+from flask import Blueprint, Response, render_template, request, jsonify, session, current_app, stream_with_context
+from agents.reporter import report_timestamp
+from utils.limiter import too_busy_response
 # Note: Assuming agents will be attached to the app object in app.py
 # from agents.orchestrator import OrchestratorAgent - Not needed here if accessed via current_app
 
@@ -9,6 +10,9 @@ analysis_bp = Blueprint('analysis', __name__, template_folder='../templates', st
 
 logger = logging.getLogger(__name__) # Or use current_app.logger within routes
 
+# Bump whenever the prompts or the report layout change: invalidates cached analyses and browsers' ETags
+ANALYSIS_VERSION = "1"
+
 @analysis_bp.route('/', methods=['GET'])
 def index():
     """Renders the main landing page."""
@@ -18,32 +22,157 @@ def index():
 def analyze_endpoint():
     """API endpoint to handle the brand name analysis.
        Calls agents via orchestrator attributes, stores context, and returns structured data.
+       The previous analysis context is only replaced (or cleared, on failure) once this one is known:
+       re-analyzing a brand with unchanged results leaves the session as it was, so it isn't rewritten.
+       A brand analyzed recently is answered from the analysis cache, with an ETag: a client sending it
+       back in If-None-Match gets an empty 304 instead of the same JSON again.
     """
-    session.pop('research_data', None)
-    session.pop('evaluation_data', None)
-    session.pop('analyzed_brand', None)
-
     brand_name = request.form.get('brand_name')
+    setup_error = _check_setup(brand_name)
+    if setup_error:
+        current_app.analysis_store.clear(session)
+        return setup_error
+    brave_key_to_use, openai_key_to_use = _resolve_api_keys()
+    etag = _analysis_etag(brand_name, brave_key_to_use, openai_key_to_use)
+
+    current_app.logger.info("Received API request to analyze brand: %s", brand_name)
+    try:
+        cached = current_app.analysis_cache.get(etag)
+        if cached is not None and etag in request.if_none_match:
+            current_app.logger.info("Client already has the current analysis of %s; answering 304.", brand_name)
+            _store_analysis(brand_name, cached['research'], cached['evaluation']) # Follow-ups use this analysis
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        limiter = current_app.llm_limiter if cached is None else None # Cached analyses call no agents
+        if limiter and not limiter.try_acquire():
+            return too_busy_response()
+        results = {}
+        try:
+            for stage, data in _analysis_stages(brand_name, etag, cached, brave_key_to_use, openai_key_to_use):
+                if stage == 'failure':
+                    current_app.analysis_store.clear(session)
+                    return jsonify(dict(data, success=False)), 500
+                results[stage] = data
+        finally:
+            if limiter:
+                limiter.release()
+
+        # --- Store context in session ---
+        _store_analysis(brand_name, results['research'], results['evaluation'])
+        current_app.logger.info("Stored analysis context for brand: %s", brand_name)
+
+        # --- Return combined response ---
+        response = jsonify({
+            'success': True,
+            'brand_name': brand_name,
+            'research_data': results['research'],
+            'evaluation_data': results['evaluation'],
+            'report_markdown': results['report']
+        })
+        if _is_reusable(results): # Cached, so the ETag can be revalidated
+            response.set_etag(etag)
+        response.headers['X-Cache'] = 'HIT' if cached is not None else 'MISS'
+        return response
+
+    except Exception as e:
+        current_app.logger.exception("Unhandled exception during /analyze endpoint for %s: %s", brand_name, e)
+        current_app.analysis_store.clear(session)
+        return jsonify({
+            'success': False,
+            'error': 'Internal Server Error',
+            'details': f'An unexpected error occurred in the endpoint handler: {str(e)}'
+        }), 500
+
+@analysis_bp.route('/analyze/stream', methods=['GET'])
+def analyze_stream_endpoint():
+    """Streaming variant of /analyze for `EventSource` clients (brand name in the query string).
+       Sends each stage as a server-sent event as soon as it completes: `research`, then `evaluation`,
+       then `report` (markdown), or a single `failure` event ({'error', 'details'}) if the analysis fails.
+       The page can render the research while the LLM evaluation is still running.
+       Requests refused up front (missing input, agents unavailable, server busy) also get a `failure` event,
+       with status 200: `EventSource` can't read the body of an HTTP error.
+    """
+    brand_name = request.args.get('brand_name')
+    setup_error = _check_setup(brand_name)
+    if setup_error:
+        current_app.analysis_store.clear(session)
+        return _failure_event_response(*setup_error)
+    brave_key_to_use, openai_key_to_use = _resolve_api_keys()
+    etag = _analysis_etag(brand_name, brave_key_to_use, openai_key_to_use)
+    cached = current_app.analysis_cache.get(etag)
+    limiter = current_app.llm_limiter if cached is None else None # Cached analyses call no agents
+    if limiter and not limiter.try_acquire():
+        return _failure_event_response(too_busy_response())
+    # Makes the session non-empty, so its cookie goes out with the response headers: the analysis
+    # context is only known after the headers are sent, and is saved under this session id below
+    if session.get('analyzed_brand') != brand_name:
+        session['analyzed_brand'] = brand_name
+
+    def save_session():
+        # The response (and its session save) went out before the stream started: save again now.
+        # Skipped by the session interface if the analysis left the session unchanged.
+        current_app.session_interface.save_session(current_app, session, current_app.response_class())
+
+    def generate():
+        results = {}
+        try:
+            for stage, data in _analysis_stages(brand_name, etag, cached, brave_key_to_use, openai_key_to_use):
+                results[stage] = data
+                if stage == 'report': # Save before the final event, so follow-up questions find the context
+                    _store_analysis(brand_name, results['research'], results['evaluation'])
+                    save_session()
+                    current_app.logger.info("Stored analysis context for brand: %s", brand_name)
+                elif stage == 'failure':
+                    current_app.analysis_store.clear(session)
+                    save_session()
+                yield f"event: {stage}\ndata: {current_app.json.dumps(data)}\n\n"
+        except Exception as e:
+            current_app.logger.exception("Unhandled exception during /analyze/stream for %s: %s", brand_name, e)
+            current_app.analysis_store.clear(session)
+            save_session()
+            failure = {'error': 'Internal Server Error', 'details': f'An unexpected error occurred in the endpoint handler: {str(e)}'}
+            yield f"event: failure\ndata: {current_app.json.dumps(failure)}\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no' # Stop nginx-style proxies from buffering the stream
+    response.headers['X-Cache'] = 'HIT' if cached is not None else 'MISS'
+    if limiter:
+        response.call_on_close(limiter.release) # The slot is held until the stream ends
+    return response
+
+def _failure_event_response(error_response, status: int | None = None):
+    """The JSON error response (or `(response, status)`) of a refused request, resent as a single `failure` event."""
+    current_app.logger.info("Refusing /analyze/stream request (status %s).", status or error_response.status_code)
+    response = Response(f"event: failure\ndata: {current_app.json.dumps(error_response.get_json())}\n\n", mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _check_setup(brand_name: str | None):
+    """Returns an error response if the request can't be analyzed (no brand name, agents missing), else None."""
     if not brand_name:
         current_app.logger.warning("Received analyze request with no brand name.")
         return jsonify({'success': False, 'error': 'Missing Input', 'details': 'Please enter a brand name to analyze.'}), 400
 
-    orchestrator = getattr(current_app, 'orchestrator', None)
-    if not orchestrator or not orchestrator.market_researcher or not orchestrator.evaluator or not orchestrator.reporter:
+    if not getattr(current_app, 'orchestrator_ready', False): # The orchestrator and its agents, checked at startup
          current_app.logger.error("Orchestrator or its agents not available for analysis request.")
          return jsonify({
              'success': False,
              'error': 'Service Initialization Error',
              'details': 'Core analysis agents failed to initialize. Please check server logs.'
          }), 503
+    return None
 
-    # --- Determine API Keys to Use --- #
+def _resolve_api_keys() -> tuple[str | None, str | None]:
+    """Returns the (Brave, OpenAI) keys to use: the user's keys from the session, else the environment's."""
     user_brave_key = session.get('USER_BRAVE_KEY')
     user_openai_key = session.get('USER_OPENAI_KEY')
 
-    # Fallback to environment variables if session key is not set
-    brave_key_to_use = user_brave_key or os.getenv('BRAVE_API_KEY')
-    openai_key_to_use = user_openai_key or os.getenv('OPENAI_API_KEY')
+    # Fallback to the environment's keys (read at startup) if session key is not set
+    brave_key_to_use = user_brave_key or current_app.config.get('BRAVE_API_KEY')
+    openai_key_to_use = user_openai_key or current_app.config.get('OPENAI_API_KEY')
 
     if not brave_key_to_use:
         logger.warning("Brave API key is missing (checked session and environment).")
@@ -51,78 +180,118 @@ def analyze_endpoint():
     if not openai_key_to_use:
         logger.warning("OpenAI API key is missing (checked session and environment).")
         # Allow analysis to proceed, evaluator/QA will return errors
-    # --------------------------------- #
+    return brave_key_to_use, openai_key_to_use
 
-    current_app.logger.info(f"Received API request to analyze brand: {brand_name}")
-    try:
-        # --- 1. Call Market Researcher ---
-        current_app.logger.info(f"Calling market_researcher.research for: {brand_name}")
-        research_results = orchestrator.market_researcher.research(brand_name, brave_key_to_use)
-        # Check for critical research errors
-        if not isinstance(research_results, dict) or research_results.get("error") == "Invalid base domain generated":
-            error_detail = research_results.get('error', 'Invalid data format') if isinstance(research_results, dict) else 'Invalid data format'
-            current_app.logger.error(f"Market research failed critically: {error_detail}")
-            return jsonify({
-                'success': False,
-                'error': 'Market Research Failed',
-                'details': error_detail
-            }), 500
-        current_app.logger.info(f"Market research completed for: {brand_name}")
-
-        # --- 2. Call Evaluator ---
-        evaluation_results = None
-        if orchestrator.evaluator: # Check if evaluator agent itself exists
-             if not openai_key_to_use:
-                 evaluation_results = {"error": "Evaluation skipped: OpenAI API Key is missing."}
-                 logger.warning(evaluation_results["error"])
-             else:
-                 current_app.logger.info(f"Calling evaluator.evaluate for: {brand_name}")
-                 evaluation_results = orchestrator.evaluator.evaluate(brand_name, research_results, openai_key_to_use)
-                 if isinstance(evaluation_results, dict) and evaluation_results.get("error"):
-                     current_app.logger.error(f"Evaluation agent returned an error: {evaluation_results.get('error')}")
-                 else:
-                     current_app.logger.info(f"Evaluation completed for: {brand_name}")
-        else:
-             logger.warning("Evaluation skipped: Evaluator agent not initialized.")
-             evaluation_results = {"error": "Evaluation skipped: Agent not initialized"}
-
-        # --- 3. Generate Report ---
-        markdown_report = ""
-        try:
-            current_app.logger.info(f"Calling reporter.generate_report for: {brand_name}")
-            markdown_report = orchestrator.reporter.generate_report(
-                brand_name=brand_name,
-                research_data=research_results,
-                evaluation_data=evaluation_results,
-                output_format='markdown'
-            )
-            if not isinstance(markdown_report, str):
-                logger.error(f"Reporter returned non-string: {type(markdown_report)}")
-                markdown_report = "*Error generating report summary.*"
-        except Exception as report_err:
-             logger.exception(f"Error during report generation: {report_err}")
-             markdown_report = f"*Error during report generation: {report_err}*"
+def _store_analysis(brand_name: str, research_results: dict, evaluation_results: dict | None):
+    """Saves the analysis context for follow-up questions and pre-renders the QA agent's prompt context for it."""
+    store = current_app.analysis_store
+    store.save(session, brand_name, research_results, evaluation_results)
+    qa_agent = getattr(current_app, 'qa_agent', None)
+    if qa_agent:
+        research_data, evaluation_data, _ = store.load(session) # The objects /qa will get from this process
+        qa_agent.prepare_context(research_data, evaluation_data)
 
-        # --- Store context in session ---
-        session['research_data'] = research_results
-        session['evaluation_data'] = evaluation_results
-        session['analyzed_brand'] = brand_name
-        session.modified = True
-        current_app.logger.info(f"Stored analysis context in session for brand: {brand_name}")
+def _analysis_etag(brand_name: str, brave_key: str | None, openai_key: str | None) -> str:
+    """
+    The ETag (and analysis cache key) of a brand's analysis: its case-folded name, ANALYSIS_VERSION and the
+    keys it runs with (hashed in, so users with other keys, or none, never share an entry).
+    """
+    fingerprint = f"{brand_name.casefold()}:{ANALYSIS_VERSION}:{brave_key or ''}:{openai_key or ''}"
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
 
-        # --- Return combined response ---
-        return jsonify({
-            'success': True,
-            'brand_name': brand_name,
-            'research_data': research_results,
-            'evaluation_data': evaluation_results,
-            'report_markdown': markdown_report
-        })
+def _analysis_stages(brand_name: str, etag: str, cached: dict | None, brave_key_to_use: str | None, openai_key_to_use: str | None):
+    """
+    `_run_analysis`, or the stages of `cached` (the analysis cache entry for `etag`) if this brand was
+    analyzed recently. Reusable runs (see `_is_reusable`) are cached once they complete.
+    """
+    if cached is not None:
+        current_app.logger.info("Serving the cached analysis of %s.", brand_name)
+        for stage in ('research', 'evaluation', 'report'): # Shared copies come back with sorted keys
+            yield stage, cached[stage]
+        return
 
-    except Exception as e:
-        current_app.logger.exception(f"Unhandled exception during /analyze endpoint for {brand_name}: {e}")
-        return jsonify({
-            'success': False,
-            'error': 'Internal Server Error',
-            'details': f'An unexpected error occurred in the endpoint handler: {str(e)}'
-        }), 500
+    results = {}
+    for stage, data in _run_analysis(brand_name, brave_key_to_use, openai_key_to_use):
+        results[stage] = data
+        yield stage, data
+    if _is_reusable(results):
+        current_app.analysis_cache.set(etag, results)
+
+def _is_reusable(results: dict) -> bool:
+    """
+    Whether an analysis can be served again: complete, with every research check and the evaluation
+    successful (not failed, skipped for a missing key or only partly parsed, which the next run may get right).
+    """
+    if 'report' not in results:
+        return False
+    research = results.get('research') or {}
+    sections = [research.get(check) for check in ('web_search', 'social_media_search', 'trademark_check')]
+    sections.append(results.get('evaluation'))
+    return not any(isinstance(section, dict) and (section.get('error') or section.get('warning')) for section in sections)
+
+def _run_analysis(brand_name: str, brave_key_to_use: str | None, openai_key_to_use: str | None):
+    """
+    Runs the analysis pipeline, yielding each stage's result as soon as it is available:
+    ('research', dict), ('evaluation', dict), ('report', str). A critical research error yields a single
+    ('failure', {'error', 'details'}) instead and stops.
+    """
+    orchestrator = current_app.orchestrator
+
+    # --- 1. Call Market Researcher ---
+    current_app.logger.info("Calling market_researcher.research for: %s", brand_name)
+    research_results = orchestrator.market_researcher.research(brand_name, brave_key_to_use)
+    # Check for critical research errors
+    if not isinstance(research_results, dict) or research_results.get("error") == "Invalid base domain generated":
+        error_detail = research_results.get('error', 'Invalid data format') if isinstance(research_results, dict) else 'Invalid data format'
+        current_app.logger.error("Market research failed critically: %s", error_detail)
+        yield 'failure', {'error': 'Market Research Failed', 'details': error_detail}
+        return
+    current_app.logger.info("Market research completed for: %s", brand_name)
+    yield 'research', research_results
+
+    # --- 2. Call Evaluator ---
+    # The LLM call runs on a worker thread while the research-only report sections are rendered here
+    evaluation_results = None
+    static_sections = None
+    # Minute resolution: re-running an analysis with unchanged results gives a byte-identical report
+    report_date = report_timestamp(60)
+    if orchestrator.evaluator: # Check if evaluator agent itself exists
+         if not openai_key_to_use:
+             evaluation_results = {"error": "Evaluation skipped: OpenAI API Key is missing."}
+             logger.warning(evaluation_results["error"])
+         else:
+             current_app.logger.info("Calling evaluator.evaluate for: %s", brand_name)
+             eval_future = current_app.executor.submit(orchestrator.evaluator.evaluate, brand_name, research_results, openai_key_to_use)
+             try:
+                 static_sections = orchestrator.reporter.prerender_static(brand_name, research_results, report_date)
+             except Exception as prerender_err:
+                 logger.exception("Error prerendering report sections: %s", prerender_err) # Rendered again below
+             evaluation_results = eval_future.result()
+             if isinstance(evaluation_results, dict) and evaluation_results.get("error"):
+                 current_app.logger.error("Evaluation agent returned an error: %s", evaluation_results.get('error'))
+             else:
+                 current_app.logger.info("Evaluation completed for: %s", brand_name)
+    else:
+         logger.warning("Evaluation skipped: Evaluator agent not initialized.")
+         evaluation_results = {"error": "Evaluation skipped: Agent not initialized"}
+    yield 'evaluation', evaluation_results
+
+    # --- 3. Generate Report ---
+    markdown_report = ""
+    try:
+        current_app.logger.info("Calling reporter.generate_report for: %s", brand_name)
+        markdown_report = orchestrator.reporter.generate_report(
+            brand_name=brand_name,
+            research_data=research_results,
+            evaluation_data=evaluation_results,
+            output_format='markdown',
+            prerendered=static_sections,
+            report_date=report_date
+        )
+        if not isinstance(markdown_report, str):
+            logger.error("Reporter returned non-string: %s", type(markdown_report))
+            markdown_report = "*Error generating report summary.*"
+    except Exception as report_err:
+         logger.exception("Error during report generation: %s", report_err)
+         markdown_report = f"*Error during report generation: {report_err}*"
+    yield 'report', markdown_report
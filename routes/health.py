@@ -0,0 +1,26 @@
+# brand_navigator/routes/health.py
+import logging
+from flask import Blueprint, jsonify, current_app
+
+health_bp = Blueprint('health', __name__)
+
+logger = logging.getLogger(__name__)
+
+@health_bp.route('/health', methods=['GET'])
+def health():
+    """Liveness check with the hit rates of the in-process caches (research, evaluation, QA answers)."""
+    orchestrator = getattr(current_app, 'orchestrator', None)
+    if not orchestrator:
+        return jsonify({'status': 'degraded', 'details': 'Agents failed to initialize.'}), 503
+
+    return jsonify({
+        'status': 'ok',
+        'caches': {
+            'research': orchestrator.market_researcher._research_cache.stats(),
+            'brave_search': orchestrator.market_researcher._search_cache.stats(),
+            'whois': orchestrator.market_researcher._whois_cache.stats(),
+            'evaluation': orchestrator.evaluator._cache.stats(),
+            'qa_answers': orchestrator.qa_agent._answer_cache.stats(),
+            'analyses': current_app.analysis_cache.stats(),
+        }
+    })
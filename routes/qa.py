@@ -1,6 +1,7 @@
+import json
 import logging
-from flask import Blueprint, request, jsonify, session, current_app
-import os # Add os import
+from flask import Blueprint, Response, request, jsonify, session, current_app, stream_with_context
+from utils.limiter import too_busy_response
 # Note: Assuming agents will be attached to the app object in app.py
 # from agents.qa import QAAgent - Not needed here if accessed via current_app
 
@@ -13,18 +14,23 @@ logger = logging.getLogger(__name__) # Or use current_app.logger within routes
 def qa_endpoint():
     """API endpoint to handle follow-up questions.
        Uses the context stored from the user's session.
-       Returns JSON with either 'answer' or an 'error'."""
+       Returns JSON with either 'answer' or an 'error'. With `stream=1` (single question), the answer is
+       streamed as server-sent events instead, see `_sse_answer`."""
 
     # +++ Debugging incoming QA request +++
-    current_app.logger.debug(f"QA Request Headers: {request.headers}")
-    current_app.logger.debug(f"QA Request Content-Type: {request.content_type}")
-    current_app.logger.debug(f"QA Request Raw Data: {request.data}")
-    current_app.logger.debug(f"QA Request Form Dict: {request.form.to_dict()}")
-    current_app.logger.debug(f"QA Request Values Dict: {request.values.to_dict()}")
+    # Guarded so production requests don't read the raw body or format these at all
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        current_app.logger.debug("QA Request Headers: %s", request.headers)
+        current_app.logger.debug("QA Request Content-Type: %s", request.content_type)
+        current_app.logger.debug("QA Request Raw Data: %s", request.data)
+        current_app.logger.debug("QA Request Form Dict: %s", request.form.to_dict())
+        current_app.logger.debug("QA Request Values Dict: %s", request.values.to_dict())
     # +++++++++++++++++++++++++++++++++++++++
 
-    # Try reading from request.values which combines form and args
-    question = request.values.get('question')
+    # Read the form, else the query string (without building the combined request.values)
+    # (several 'question' fields are answered together and returned as 'answers')
+    questions = [q for q in (request.form.getlist('question') or request.args.getlist('question')) if q]
+    question = questions[0] if questions else None
 
     if not question:
         current_app.logger.error("Failed to find 'question' field in request values.")
@@ -36,7 +42,7 @@ def qa_endpoint():
 
     # --- Determine OpenAI Key --- #
     user_openai_key = session.get('USER_OPENAI_KEY')
-    openai_key_to_use = user_openai_key or os.getenv('OPENAI_API_KEY')
+    openai_key_to_use = user_openai_key or current_app.config.get('OPENAI_API_KEY')
 
     if not openai_key_to_use:
         logger.error("OpenAI API key missing for QA (checked session and environment).")
@@ -48,15 +54,13 @@ def qa_endpoint():
     # -------------------------- #
 
     # Retrieve context from session
-    research_data = session.get('research_data')
-    evaluation_data = session.get('evaluation_data')
-    analyzed_brand = session.get('analyzed_brand')
+    research_data, evaluation_data, analyzed_brand = current_app.analysis_store.load(session)
 
     # Access agent via current_app
     qa_agent = getattr(current_app, 'qa_agent', None)
 
     # Check if QA agent is available
-    if not qa_agent or not qa_agent.client:
+    if not qa_agent or not qa_agent.model: # model is None when the OpenAI library is missing
         current_app.logger.error("QA Agent not available for follow-up question.")
         return jsonify({
             'success': False, # Add success field
@@ -73,8 +77,27 @@ def qa_endpoint():
             'details': 'Please perform an initial analysis first before asking follow-up questions.'
         }), 400
 
-    current_app.logger.info(f"Received QA request: '{question}' for analyzed brand: {analyzed_brand}")
+    current_app.logger.info("Received QA request: '%s' for analyzed brand: %s", question, analyzed_brand)
+    limiter = current_app.llm_limiter
+    if not limiter.try_acquire():
+        return too_busy_response()
+    release_slot = True # Unless a stream takes it over (released when the stream closes)
     try:
+        if len(questions) > 1:
+            current_app.logger.info("Answering %s follow-up questions in one batched request.", len(questions))
+            qa_results = qa_agent.answer_followups_batch(questions, research_data, evaluation_data, openai_key_to_use)
+            answers = [{'question': q, 'answer': r.get('answer'), 'error': r.get('error')} for q, r in zip(questions, qa_results)]
+            return jsonify({
+                'success': any(a['answer'] for a in answers),
+                'answers': answers
+            })
+
+        if (request.form.get('stream') or request.args.get('stream')) == '1':
+            response = _sse_answer(qa_agent.stream_followup(question, research_data, evaluation_data, openai_key_to_use))
+            response.call_on_close(limiter.release)
+            release_slot = False
+            return response
+
         # Call the QA agent, passing the resolved key
         qa_result = qa_agent.answer_followup(
             question=question,
@@ -87,7 +110,7 @@ def qa_endpoint():
         if isinstance(qa_result, dict):
             if qa_result.get("error"):
                 error_detail = qa_result.get("error")
-                current_app.logger.error(f"QA agent returned an error: {error_detail}")
+                current_app.logger.error("QA agent returned an error: %s", error_detail)
                 return jsonify({
                     'success': False,
                     'error': 'QA Processing Error',
@@ -96,14 +119,14 @@ def qa_endpoint():
             elif qa_result.get("answer"):
                 # Success - extract the answer string
                 answer_text = qa_result.get("answer")
-                current_app.logger.info(f"QA agent provided answer successfully.")
+                current_app.logger.info("QA agent provided answer successfully.")
                 return jsonify({
                     'success': True,
                     'answer': answer_text # Return just the string
                 })
             else:
                 # Dictionary format, but missing expected keys
-                current_app.logger.error(f"QA agent returned a dictionary with unexpected keys: {qa_result.keys()}")
+                current_app.logger.error("QA agent returned a dictionary with unexpected keys: %s", qa_result.keys())
                 return jsonify({
                     'success': False,
                     'error': 'QA Processing Error',
@@ -111,7 +134,7 @@ def qa_endpoint():
                 }), 500
         else:
              # Not a dictionary, unexpected format (e.g., None, list, etc.)
-             current_app.logger.error(f"QA agent returned an unexpected format (not dict): {type(qa_result)}")
+             current_app.logger.error("QA agent returned an unexpected format (not dict): %s", type(qa_result))
              return jsonify({
                  'success': False,
                  'error': 'QA Processing Error',
@@ -120,9 +143,30 @@ def qa_endpoint():
 
     except Exception as e:
         # Catch-all for unexpected errors during QA processing
-        current_app.logger.exception(f"Unhandled exception during /qa endpoint for question '{question}': {e}")
+        current_app.logger.exception("Unhandled exception during /qa endpoint for question '%s': %s", question, e)
         return jsonify({
             'success': False,
             'error': 'Internal Server Error', # More generic user message
             'details': 'An unexpected error occurred during the QA process. Please check server logs.'
         }), 500
+    finally:
+        if release_slot:
+            limiter.release()
+
+
+def _sse_answer(events) -> Response:
+    """
+    Streams QA events as server-sent events: one `data: {json}` message per event
+    ({'delta': ...} pieces, then a final {'answer': ...} or {'error': ...}).
+    JSON keeps newlines in the answer text from breaking the SSE framing.
+    """
+    def generate():
+        for event in events:
+            if event.get("error"):
+                current_app.logger.error("QA agent returned an error: %s", event['error'])
+            yield f"data: {json.dumps(event)}\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no' # Stop nginx-style proxies from buffering the stream
+    return response
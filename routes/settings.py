@@ -1,12 +1,17 @@
 # brand_navigator/routes/settings.py
-import os
 import logging
-from flask import Blueprint, request, jsonify, session, render_template, current_app
+from flask import Blueprint, request, jsonify, session, render_template
 
 settings_bp = Blueprint('settings', __name__, template_folder='../templates')
 
 logger = logging.getLogger(__name__)
 
+# (request field, session key, label for the logs) of each user API key the settings page can set
+_KEY_FIELDS = (
+    ('openai_key', 'USER_OPENAI_KEY', 'OpenAI'),
+    ('brave_key', 'USER_BRAVE_KEY', 'Brave'),
+)
+
 # Route to render the settings page
 @settings_bp.route('/settings', methods=['GET'])
 def settings_page():
@@ -20,33 +25,26 @@ def handle_settings():
     if request.method == 'POST':
         try:
             data = request.get_json()
-            if not data:
+            if not data or not isinstance(data, dict):
                 return jsonify({"success": False, "error": "Invalid request format."}), 400
 
-            openai_key = data.get('openai_key')
-            brave_key = data.get('brave_key')
-
             # Basic validation (presence check)
             # More specific validation (e.g., prefix check) could be added
-            if openai_key and isinstance(openai_key, str):
-                session['USER_OPENAI_KEY'] = openai_key
-                logger.info("User OpenAI key saved to session.")
-            elif 'openai_key' in data: # Handle empty string to clear key
-                 session.pop('USER_OPENAI_KEY', None)
-                 logger.info("User OpenAI key cleared from session.")
-
-            if brave_key and isinstance(brave_key, str):
-                session['USER_BRAVE_KEY'] = brave_key
-                logger.info("User Brave key saved to session.")
-            elif 'brave_key' in data: # Handle empty string to clear key
-                 session.pop('USER_BRAVE_KEY', None)
-                 logger.info("User Brave key cleared from session.")
-
-            session.modified = True
+            # The session is only modified (and so rewritten) when a key actually changes
+            for field, session_key, label in _KEY_FIELDS:
+                value = data.get(field)
+                if value and isinstance(value, str):
+                    if session.get(session_key) != value:
+                        session[session_key] = value
+                    logger.info("User %s key saved to session.", label)
+                elif field in data and session_key in session: # Handle empty string to clear key
+                    session.pop(session_key)
+                    logger.info("User %s key cleared from session.", label)
+
             return jsonify({"success": True, "message": "Settings saved successfully."})
 
         except Exception as e:
-            logger.exception(f"Error saving settings: {e}")
+            logger.exception("Error saving settings: %s", e)
             return jsonify({"success": False, "error": f"An internal error occurred: {str(e)}"}), 500
 
     elif request.method == 'GET':
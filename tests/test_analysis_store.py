@@ -0,0 +1,68 @@
+from utils.analysis_store import AnalysisCache, AnalysisStore
+
+# --- Helpers --- #
+
+class FakeRedis:
+    """Dict-backed stand-in for the two Redis commands the store uses."""
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+RESEARCH = {'brand_name': 'Acme', 'domain_availability': {'acme.com': 'taken'}}
+
+# --- Test analysis store --- #
+
+def test_redis_store_keeps_only_the_key_in_the_session():
+    """Test that with Redis the session holds a content key and another process can load the analysis."""
+    fake_redis, session = FakeRedis(), {}
+    AnalysisStore(redis_client=fake_redis).save(session, 'Acme', RESEARCH, {'score': 8})
+
+    assert set(session) == {'analysis_key', 'analyzed_brand'}
+    other_worker = AnalysisStore(redis_client=fake_redis) # Empty local cache: reads Redis
+    assert other_worker.load(session) == (RESEARCH, {'score': 8}, 'Acme')
+
+def test_store_without_redis_keeps_the_analysis_in_the_session():
+    """Test that without a shared store the analysis stays in the session, as before."""
+    session = {}
+    store = AnalysisStore()
+    store.save(session, 'Acme', RESEARCH, None)
+
+    assert session['research_data'] == RESEARCH
+    assert store.load(session) == (RESEARCH, None, 'Acme')
+
+def test_follow_ups_in_one_process_get_the_same_objects():
+    """Test that repeated loads return the same decoded analysis, so the QA context memo can hit."""
+    session = {}
+    store = AnalysisStore()
+    store.save(session, 'Acme', RESEARCH, None)
+
+    assert store.load(session)[0] is store.load(session)[0]
+
+def test_repeat_analysis_with_unchanged_results_leaves_the_session_alone():
+    """Test that saving the same analysis again doesn't modify the session, so it isn't rewritten."""
+    from werkzeug.datastructures import CallbackDict
+    modified = []
+    session = CallbackDict(on_update=lambda _: modified.append(True))
+    store = AnalysisStore()
+    store.save(session, 'Acme', RESEARCH, {'score': 8})
+    modified.clear()
+
+    store.save(session, 'Acme', dict(RESEARCH), {'score': 8})
+    assert not modified
+    store.save(session, 'Acme', RESEARCH, {'score': 9}) # Different results: replaced
+    assert modified and store.load(session)[1] == {'score': 9}
+
+def test_analysis_cache_is_shared_through_redis():
+    """Test that an analysis cached by one worker is served to another through Redis."""
+    fake_redis = FakeRedis()
+    analysis = {'research': RESEARCH, 'evaluation': {'score': 8}, 'report': '# Acme'}
+    AnalysisCache(redis_client=fake_redis).set('etag', analysis)
+
+    other_worker = AnalysisCache(redis_client=fake_redis)
+    assert other_worker.get('etag') == analysis
+    assert other_worker.get('missing') is None
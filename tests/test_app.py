@@ -1,4 +1,3 @@
-import json
 import pytest
 from flask import session
 
@@ -28,7 +27,7 @@ def test_analyze_success(client, mocker):
     response = client.post('/analyze', data={'brand_name': 'TestBrand'})
 
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is True
     assert data['brand_name'] == 'TestBrand'
     assert data['research_data'] == mock_research
@@ -41,11 +40,84 @@ def test_analyze_success(client, mocker):
         assert sess.get('research_data') == mock_research
         assert sess.get('evaluation_data') == mock_evaluation
 
+def test_analyze_stream_sends_each_stage(client, mocker):
+    """Test that the streaming analysis sends research, evaluation and report events and keeps the context."""
+    mock_research = {"domain_available": True}
+    mocker.patch('app.orchestrator.market_researcher.research', return_value=mock_research)
+    mocker.patch('app.orchestrator.evaluator.evaluate', return_value={"score": 85})
+    mocker.patch('app.orchestrator.reporter.generate_report', return_value="# Report")
+
+    response = client.get('/analyze/stream', query_string={'brand_name': 'StreamBrand'})
+    body = response.get_data(as_text=True) # Runs the whole stream
+    response.close() # Releases the request slot, as WSGI servers do
+
+    assert response.mimetype == 'text/event-stream'
+    assert [line[len('event: '):] for line in body.splitlines() if line.startswith('event: ')] == ['research', 'evaluation', 'report']
+    with client.session_transaction() as sess: # Saved after the response headers went out
+        assert sess.get('research_data') == mock_research
+
+def test_analyze_stream_sends_refusals_as_failure_events(client, app, mocker):
+    """Test that refused stream requests get a failure event EventSource can read, not an HTTP error."""
+    missing = client.get('/analyze/stream', query_string={'brand_name': ''})
+    mocker.patch.object(app.llm_limiter, 'try_acquire', return_value=False)
+    busy = client.get('/analyze/stream', query_string={'brand_name': 'BusyBrand'})
+
+    assert (missing.status_code, busy.status_code) == (200, 200)
+    assert missing.mimetype == busy.mimetype == 'text/event-stream'
+    assert missing.get_data(as_text=True).startswith('event: failure\ndata: ')
+    assert '"error":"Missing Input"' in missing.get_data(as_text=True)
+    assert '"error":"Server Busy"' in busy.get_data(as_text=True)
+
+def test_repeat_analysis_is_served_from_cache_with_etag(client, mocker):
+    """Test that a repeat analysis skips the agents, and a matching If-None-Match gets a 304."""
+    research = mocker.patch('app.orchestrator.market_researcher.research', return_value={"domain_available": True})
+    mocker.patch('app.orchestrator.evaluator.evaluate', return_value={"score": 85})
+    mocker.patch('app.orchestrator.reporter.generate_report', return_value="# Report")
+
+    first = client.post('/analyze', data={'brand_name': 'EtagBrand'})
+    second = client.post('/analyze', data={'brand_name': 'etagbrand'})
+    assert research.call_count == 1
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert second.get_json()['research_data'] == first.get_json()['research_data']
+
+    etag = first.get_etag()[0]
+    revalidated = client.post('/analyze', data={'brand_name': 'EtagBrand'}, headers={'If-None-Match': f'"{etag}"'})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+def test_analysis_with_failed_research_is_not_cached(client, mocker):
+    """Test that an analysis whose research checks errored gets no ETag and runs again next time."""
+    research = mocker.patch('app.orchestrator.market_researcher.research', return_value={
+        "web_search": {"error": "Brave API Key is missing."},
+        "social_media_search": {"error": "Brave API Key is missing."},
+        "trademark_check": {"error": "Brave API Key is missing."},
+    })
+    mocker.patch('app.orchestrator.evaluator.evaluate', return_value={"score": 85})
+    mocker.patch('app.orchestrator.reporter.generate_report', return_value="# Report")
+
+    first = client.post('/analyze', data={'brand_name': 'NoKeyBrand'})
+    second = client.post('/analyze', data={'brand_name': 'NoKeyBrand'})
+    assert research.call_count == 2
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'MISS')
+    assert first.get_etag() == (None, None)
+
+def test_analysis_with_partial_evaluation_is_not_cached(client, mocker):
+    """Test that an evaluation salvaged with a warning gets no ETag and is evaluated again next time."""
+    research = mocker.patch('app.orchestrator.market_researcher.research', return_value={"domain_available": True})
+    mocker.patch('app.orchestrator.evaluator.evaluate', return_value={"overall_score": 6, "warning": "partial parse"})
+    mocker.patch('app.orchestrator.reporter.generate_report', return_value="# Report")
+
+    first = client.post('/analyze', data={'brand_name': 'PartialBrand'})
+    second = client.post('/analyze', data={'brand_name': 'PartialBrand'})
+    assert research.call_count == 2
+    assert second.headers['X-Cache'] == 'MISS'
+    assert first.get_etag() == (None, None)
+
 def test_analyze_missing_brand(client):
     """Test analysis request with no brand name provided."""
     response = client.post('/analyze', data={'brand_name': ''})
     assert response.status_code == 400
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is False
     assert data['error'] == 'Missing Input'
 
@@ -70,10 +142,36 @@ def test_qa_success(client, mocker):
     response = client.post('/qa', data={'question': 'Was the domain available?'})
 
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is True
     assert data['answer'] == mock_qa_answer
 
+def test_qa_streams_server_sent_events(client, mocker):
+    """Test that stream=1 returns the QA events as server-sent events."""
+    mocker.patch('app.qa_agent.stream_followup', return_value=iter([{'delta': 'Yes'}, {'answer': 'Yes'}]))
+    with client.session_transaction() as sess:
+        sess['research_data'] = {"domain_available": True}
+
+    response = client.post('/qa', data={'question': 'Was the domain available?', 'stream': '1'})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.get_data(as_text=True) == 'data: {"delta": "Yes"}\n\ndata: {"answer": "Yes"}\n\n'
+    response.close() # Releases the request slot, as WSGI servers do
+
+def test_qa_refused_when_too_many_requests_are_in_flight(client, app, mocker):
+    """Test that /qa answers 503 without calling the agent when no request slot is free."""
+    answer = mocker.patch('app.qa_agent.answer_followup', return_value={'answer': 'Yes'})
+    mocker.patch.object(app.llm_limiter, 'try_acquire', return_value=False)
+    with client.session_transaction() as sess:
+        sess['research_data'] = {"domain_available": True}
+
+    response = client.post('/qa', data={'question': 'Was the domain available?'})
+
+    assert response.status_code == 503
+    assert response.get_json()['error'] == 'Server Busy'
+    answer.assert_not_called()
+
 def test_qa_missing_context(client):
     """Test QA request when no analysis has been run (no session data)."""
     # Ensure session is empty before this test if tests share context
@@ -83,7 +181,7 @@ def test_qa_missing_context(client):
     response = client.post('/qa', data={'question': 'Any question?'})
 
     assert response.status_code == 400
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is False
     assert data['error'] == 'Missing Context'
 
@@ -96,10 +194,21 @@ def test_qa_missing_question(client):
     response = client.post('/qa', data={'question': ''})
 
     assert response.status_code == 400
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is False
     assert data['error'] == 'Missing Input'
 
+# --- Test /health Endpoint --- #
+
+def test_health_reports_cache_stats(client):
+    """Test that the health check lists the agent caches."""
+    response = client.get('/health')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'ok'
+    assert {'research', 'evaluation', 'qa_answers'} <= set(data['caches'])
+
 # Add more tests here for:
 # - Cases where agents return errors
 # - Cases where agents are not initialized
@@ -0,0 +1,43 @@
+from utils.cache import SemanticCache, TTLCache
+
+# --- Test TTLCache --- #
+
+def test_cache_evicts_least_recently_used():
+    """Test that the oldest untouched entry is evicted once maxsize is exceeded."""
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1 # Touch 'a' so 'b' becomes least recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+def test_cache_counts_hits_and_misses():
+    """Test that lookups are counted for the /health cache stats."""
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+    assert cache.stats() == {'size': 1, 'maxsize': 2, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+def test_cache_expires_entries(mocker):
+    """Test that entries past their TTL are treated as misses."""
+    clock = mocker.patch('utils.cache.time.monotonic', return_value=100.0)
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set('a', 1)
+    clock.return_value = 105.0
+    assert cache.get('a') == 1
+    clock.return_value = 111.0
+    assert cache.get('a', 'missing') == 'missing'
+    assert len(cache) == 0
+
+# --- Test SemanticCache --- #
+
+def test_semantic_cache_matches_similar_vectors_within_namespace():
+    """Test that near-duplicate vectors hit, dissimilar ones miss, and namespaces are isolated."""
+    cache = SemanticCache(threshold=0.97)
+    cache.set([1.0, 0.0, 0.0], 'verdict', namespace='acme')
+    assert cache.get([0.99, 0.05, 0.0], namespace='acme') == 'verdict'
+    assert cache.get([0.0, 1.0, 0.0], namespace='acme') is None
+    assert cache.get([1.0, 0.0, 0.0], namespace='other') is None
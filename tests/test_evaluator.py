@@ -0,0 +1,133 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agents.evaluator import EvaluatorAgent
+
+# --- Helpers --- #
+
+RESEARCH = {'brand_name': 'Acme', 'domain_availability': {'acme.com': 'taken'}}
+EVALUATION = {"la": "Easy to say.", "md": "Short and sharp.", "rel": "Abstract.", "av": "The .com is taken.", "s": 7}
+
+def fake_completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def answer_per_brand(answers):
+    """Completion side effect answering with `answers[brand]` for whichever brand the prompt is about."""
+    def create(messages, **kwargs):
+        brand = next(name for name in answers if f"**Brand Name:** {name}\n" in messages[-1]['content'])
+        return fake_completion(answers[brand])
+    return create
+
+@pytest.fixture
+def client(mocker):
+    """OpenAI client double whose completions always return EVALUATION."""
+    client = mocker.Mock()
+    client.chat.completions.create.return_value = fake_completion(json.dumps(EVALUATION))
+    return client
+
+@pytest.fixture
+def agent(client, mocker):
+    """Agent with no persistent cache, wired to the client double."""
+    agent = EvaluatorAgent(cache_dir=None)
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+    return agent
+
+# --- Test response parsing --- #
+
+def test_short_keys_are_expanded(agent, client):
+    """Test that the model's short keys come back under their public names, and repeats hit the cache."""
+    first = agent.evaluate('Acme', RESEARCH, 'test-key')
+    second = agent.evaluate('Acme', RESEARCH, 'test-key')
+
+    assert first == second == {
+        'linguistic_analysis': 'Easy to say.',
+        'memorability_distinctiveness': 'Short and sharp.',
+        'relevance': 'Abstract.',
+        'availability_summary': 'The .com is taken.',
+        'overall_score': 7,
+    }
+    assert client.chat.completions.create.call_count == 1
+
+def test_string_score_is_coerced(agent, client):
+    """Test that a quoted score is read as an integer."""
+    client.chat.completions.create.return_value = fake_completion(json.dumps(dict(EVALUATION, s="8")))
+
+    assert agent.evaluate('Acme', RESEARCH, 'test-key')['overall_score'] == 8
+
+def test_unknown_field_keeps_known_fields_with_a_warning(agent, client):
+    """Test that an extra key is dropped, the analyses are kept, and the partial result isn't cached."""
+    client.chat.completions.create.return_value = fake_completion(json.dumps(dict(EVALUATION, extra="?")))
+
+    result = agent.evaluate('Acme', RESEARCH, 'test-key')
+    agent.evaluate('Acme', RESEARCH, 'test-key')
+
+    assert result['warning'] == 'partial parse'
+    assert result['overall_score'] == 7
+    assert result['relevance'] == 'Abstract.'
+    assert 'extra' not in result
+    assert client.chat.completions.create.call_count == 2
+
+def test_score_is_salvaged_from_mismatched_keys(agent, client):
+    """Test that only the score survives a response whose analysis keys are all wrong."""
+    client.chat.completions.create.return_value = fake_completion('{"analysis": "Fine.", "s": 6}')
+
+    result = agent.evaluate('Acme', RESEARCH, 'test-key')
+
+    assert (result['overall_score'], result['warning']) == (6, 'partial parse')
+    assert 'analysis' not in result
+
+@pytest.mark.parametrize('raw', ['[1, 2]', '{"analysis": "Fine."}', 'not json'])
+def test_unusable_responses_are_errors(agent, client, raw):
+    """Test that a top-level array, a response with no score and invalid JSON are reported, not raised."""
+    client.chat.completions.create.return_value = fake_completion(raw)
+
+    result = agent.evaluate('Acme', RESEARCH, 'test-key')
+
+    assert result['error']
+    assert result['raw_response'] == raw
+
+# --- Test prompt construction --- #
+
+def test_large_research_is_trimmed_to_the_token_budget():
+    """Test that oversized research data loses links and snippets before it is sent."""
+    agent = EvaluatorAgent(cache_dir=None, max_input_tokens=1500)
+    links = [{'url': f'https://example.com/{i}', 'title': f'Result {i}', 'snippet': 'lorem ipsum ' * 40} for i in range(50)]
+    research = dict(RESEARCH, web_search={'web_links': links})
+
+    prompt = agent._construct_prompt('Acme', research)
+
+    assert 'https://example.com/9"' in prompt
+    assert 'https://example.com/10"' not in prompt
+    assert 'lorem ipsum' not in prompt
+    assert len(research['web_search']['web_links']) == 50 # The caller's data is left alone
+
+# --- Test batch evaluation --- #
+
+def test_evaluate_many_keeps_partial_failures_per_brand(agent, client):
+    """Test that one brand's failure is reported under its name without affecting the others."""
+    client.chat.completions.create.side_effect = answer_per_brand({'Acme': json.dumps(EVALUATION), 'Zyxo': 'not json'})
+
+    results = agent.evaluate_many([('Acme', RESEARCH), ('Zyxo', RESEARCH), ('Empty', {})], 'test-key')
+
+    assert results['Acme']['overall_score'] == 7
+    assert results['Zyxo']['error'] == 'Failed to parse LLM JSON response.'
+    assert results['Empty'] == {'error': 'Missing research data for evaluation.'}
+
+def test_evaluate_batch_returns_results_in_request_order(agent, mocker):
+    """Test that async batch results are keyed, in order, by the requested names."""
+    answers = {'Zyxo': json.dumps(dict(EVALUATION, s=4)), 'Acme': json.dumps(EVALUATION), 'Broken': '[]'}
+    create = answer_per_brand(answers)
+    async_client = mocker.Mock()
+    async_client.chat.completions.create = mocker.AsyncMock(side_effect=lambda **kwargs: create(**kwargs))
+    async_client.close = mocker.AsyncMock()
+    mocker.patch.object(agent, '_get_async_openai_client', return_value=async_client)
+
+    results = asyncio.run(agent.evaluate_batch(list(answers), {name: RESEARCH for name in answers}, 'test-key'))
+
+    assert list(results) == ['Zyxo', 'Acme', 'Broken']
+    assert [results['Zyxo']['overall_score'], results['Acme']['overall_score']] == [4, 7]
+    assert results['Broken']['error'] == 'LLM response format error (expected a JSON object).'
+    async_client.close.assert_awaited_once()
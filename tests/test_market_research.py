@@ -0,0 +1,170 @@
+import httpx
+import pytest
+import urllib3
+
+from agents import market_research
+from agents.market_research import MarketResearchAgent
+from agents.reporter import ReporterAgent
+
+# --- Helpers --- #
+
+BRAVE_RESULTS = {"web": {"results": [
+    {"url": "https://www.acme.com/about", "title": "Acme Corp", "description": "Official site"},
+    {"url": "https://example.org/news", "title": "Unrelated news", "description": "..."},
+    {"url": "https://twitter.com/acme", "title": "Profile", "description": "..."},
+]}}
+
+class FakeWhois:
+    def __init__(self, creation_date):
+        self.creation_date = creation_date
+
+@pytest.fixture
+def agent(mocker):
+    """Agent whose Brave calls hit an in-memory transport and whose WHOIS lookups are faked."""
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=BRAVE_RESULTS))
+    real_client = httpx.AsyncClient
+    mocker.patch.object(market_research.httpx, 'AsyncClient', lambda **kwargs: real_client(transport=transport, **kwargs))
+    mocker.patch.object(market_research.whois, 'whois',
+                        side_effect=lambda domain: FakeWhois('2001-01-01' if domain.endswith('.com') else None))
+    mocker.patch.object(market_research._RateLimiter, 'reserve', return_value=0.0) # No real services to be polite to
+    return MarketResearchAgent(whois_cache_path=None) # Keep tests off the persistent WHOIS cache
+
+# --- Test research --- #
+
+def test_research_runs_all_checks(agent):
+    """Test that the concurrent research path consolidates every check."""
+    results = agent.research('Acme', 'test-key')
+
+    assert results['brand_name'] == 'Acme'
+    assert results['error'] is None
+    assert [c.url for c in results['web_search']['potential_conflicts']] == ['https://www.acme.com/about']
+    assert results['social_media_search']['platform_results']['Twitter'] == 'used_mentioned'
+    assert results['social_media_search']['platform_results']['Instagram'] == 'potentially_available_low_presence'
+    assert results['trademark_check']['status'] == 'potential_conflict_found_on_site'
+    assert results['domain_availability']['acme.com'] == 'taken'
+    assert results['domain_availability']['acme.io'] == 'potentially_available'
+
+def test_research_without_brave_key(agent):
+    """Test that a missing Brave key is reported per check instead of raising."""
+    results = agent.research('Acme', None)
+
+    assert results['web_search']['error'] == 'Brave API Key is missing.'
+    assert results['domain_availability']['acme.com'] == 'taken' # WHOIS needs no key
+
+def test_research_cache_is_per_brave_key(agent):
+    """Test that cached research is only reused for the Brave key that paid for it."""
+    agent.research('Acme', 'test-key')
+
+    assert agent.research('acme', 'test-key')['web_search']['error'] is None
+    assert agent.research('Acme', None)['web_search']['error'] == 'Brave API Key is missing.'
+    assert agent._research_cache_get('Acme', 'other-key') is None
+
+def test_research_marks_checks_failed_on_unexpected_brave_errors(agent):
+    """Test that a Brave call raising outside its handled errors fails its own check, not the run."""
+    results = agent.research('Acme', 'k\u20acy') # Not latin-1: can't be sent as a header
+
+    assert 'Unexpected error calling Brave API' in results['web_search']['error']
+    assert 'Unexpected error calling Brave API' in results['trademark_check']['error']
+    assert results['domain_availability']['acme.com'] == 'taken'
+
+def test_research_renders_in_reports_as_plain_data(agent):
+    """Test that web hits and conflicts show up in the markdown report as fields, not dataclass reprs."""
+    report = ReporterAgent().prerender_static('Acme', agent.research('Acme', 'test-key'))
+
+    assert "'url': 'https://www.acme.com/about'" in report
+    assert 'WebHit(' not in report and 'Conflict(' not in report
+
+def test_research_batch_returns_results_per_name(agent):
+    """Test that batch research keys its results by the requested names."""
+    results = agent.research_batch(['Acme', 'Zyxo'], 'test-key')
+
+    assert list(results) == ['Acme', 'Zyxo']
+    assert results['Zyxo']['brand_name'] == 'Zyxo'
+    assert results['Zyxo']['domain_availability']['zyxo.com'] == 'taken'
+
+def test_whois_statuses_persist_across_agents(mocker, tmp_path):
+    """Test that a fresh agent reuses WHOIS statuses from the SQLite cache instead of querying again."""
+    lookup = mocker.patch.object(market_research.whois, 'whois', return_value=FakeWhois('2001-01-01'))
+    cache_path = str(tmp_path / 'whois.sqlite')
+
+    with MarketResearchAgent(whois_cache_path=cache_path) as first:
+        assert first.check_domain_availability('Acme', tlds=['.com'])['results'] == {'acme.com': 'taken'}
+    with MarketResearchAgent(whois_cache_path=cache_path) as second:
+        assert second.check_domain_availability('Acme', tlds=['.com'])['results'] == {'acme.com': 'taken'}
+    assert lookup.call_count == 1
+
+def test_whois_cache_reconnects_after_fork(mocker, tmp_path):
+    """Test that the SQLite connection is opened lazily and not reused by a forked process."""
+    agent = MarketResearchAgent(whois_cache_path=str(tmp_path / 'whois.sqlite'))
+    assert agent._whois_db is None # Nothing opened at construction (e.g. in a preloading gunicorn master)
+
+    agent._store_whois_status('acme.com', 'taken', None)
+    parent_db = agent._whois_db
+    mocker.patch.object(market_research.os, 'getpid', return_value=-1) # Now "in a worker"
+
+    assert agent._whois_db_get('acme.com') == 'taken'
+    assert agent._whois_db is not parent_db
+    agent.close()
+    parent_db.close()
+
+def test_social_media_falls_back_to_per_platform_queries(agent, mocker):
+    """Test that a failed combined social query is retried as one query per platform."""
+    responses = iter([{"error": "Brave API request failed (Status: 400)"}] + [BRAVE_RESULTS] * 5)
+    request = mocker.patch.object(agent, '_make_brave_request', side_effect=lambda **kwargs: next(responses))
+    mocker.patch.object(market_research.time, 'sleep')
+
+    results = agent.search_social_media('Acme', 'test-key')
+
+    assert request.call_count == 6
+    assert results['error'] is None
+    assert results['platform_results']['Instagram'] == 'used_mentioned'
+
+def test_brave_429_is_retried_after_retry_after(mocker):
+    """Test that a rate-limited Brave request waits out Retry-After and is retried."""
+    responses = iter([httpx.Response(429, headers={'Retry-After': '2'}), httpx.Response(200, json=BRAVE_RESULTS)])
+    transport = httpx.MockTransport(lambda request: next(responses))
+    sleeps = []
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+    mocker.patch.object(market_research.asyncio, 'sleep', fake_sleep)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await agent._make_brave_request_async(client, 'Acme', 'test-key')
+
+    agent = MarketResearchAgent(whois_cache_path=None)
+    result = market_research.asyncio.run(run())
+
+    assert result == BRAVE_RESULTS
+    assert 2.0 in sleeps
+
+def test_sync_brave_retries_cap_retry_after():
+    """Test that the sync session honors Retry-After only up to the same cap as the async path."""
+    agent = MarketResearchAgent(whois_cache_path=None)
+    retry = agent._session.get_adapter('https://api.search.brave.com').max_retries
+    response = urllib3.HTTPResponse(status=429, headers={'Retry-After': '3600'})
+
+    retried = retry.increment(method='GET', url='/res/v1/web/search', response=response)
+    assert retried.get_retry_after(response) == market_research._BRAVE_RETRY_AFTER_CAP
+    agent.close()
+
+def test_rate_limiter_backs_off_and_recovers():
+    """Test that the limiter halves its rate when throttled and creeps back on success."""
+    limiter = market_research._RateLimiter(capacity=1, rate=4.0)
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() > 0 # Bucket empty: the caller is told to wait
+    limiter.on_throttle()
+    assert limiter.rate == 2.0
+    for _ in range(5):
+        limiter.on_success()
+    assert limiter.rate == 4.0 # Capped at the configured rate
+
+def test_research_rejects_name_without_domain_form(agent, mocker):
+    """Test that a name with no usable base domain fails before any Brave or WHOIS call."""
+    request = mocker.patch.object(agent, '_make_brave_request_async')
+
+    results = agent.research('!!!', 'test-key')
+
+    assert results['error'] == 'Invalid base domain generated'
+    request.assert_not_called()
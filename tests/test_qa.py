@@ -0,0 +1,153 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agents.qa import QAAgent
+
+# --- Helpers --- #
+
+RESEARCH = {'brand_name': 'Acme', 'domain_availability': {'acme.com': 'taken'}}
+
+def fake_completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def client(mocker):
+    """OpenAI client double whose completions always answer 'Taken.'."""
+    client = mocker.Mock()
+    client.chat.completions.create.return_value = fake_completion(' Taken. ')
+    return client
+
+# --- Test answer cache --- #
+
+def test_repeated_question_is_served_from_cache(client, mocker):
+    """Test that re-asking a question about the same analysis skips the LLM call."""
+    agent = QAAgent()
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+
+    first = agent.answer_followup('Who owns the .com?', RESEARCH, None, 'test-key')
+    second = agent.answer_followup('  who owns the .COM? ', RESEARCH, None, 'test-key')
+
+    assert first == second == {'answer': 'Taken.'}
+    assert client.chat.completions.create.call_count == 1
+
+def test_answer_cache_is_scoped_to_the_analysis(client, mocker):
+    """Test that the same question about a different analysis is answered again."""
+    agent = QAAgent()
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+
+    agent.answer_followup('Who owns the .com?', RESEARCH, None, 'test-key')
+    agent.answer_followup('Who owns the .com?', dict(RESEARCH, brand_name='Zyxo'), None, 'test-key')
+
+    assert client.chat.completions.create.call_count == 2
+
+def test_paraphrased_question_is_served_from_semantic_cache(client, mocker):
+    """Test that a paraphrase about the same analysis reuses the answer, and other analyses don't."""
+    agent = QAAgent(semantic_threshold=0.92)
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+    embeddings = {'Who owns the .com?': [1.0, 0.0], 'Who is the owner of the .com?': [0.99, 0.05]}
+    client.embeddings.create.side_effect = lambda model, input: SimpleNamespace(data=[SimpleNamespace(embedding=embeddings[input])])
+
+    agent.answer_followup('Who owns the .com?', RESEARCH, None, 'test-key')
+    paraphrase = agent.answer_followup('Who is the owner of the .com?', RESEARCH, None, 'test-key')
+    agent.answer_followup('Who is the owner of the .com?', dict(RESEARCH, brand_name='Zyxo'), None, 'test-key')
+
+    assert paraphrase == {'answer': 'Taken.'}
+    assert client.chat.completions.create.call_count == 2
+
+# --- Test streamed answers --- #
+
+def test_streamed_answer_yields_deltas_then_full_answer(client, mocker):
+    """Test that a streamed answer arrives piece by piece and is then cached whole."""
+    agent = QAAgent()
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+    chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]) for text in ('Tak', 'en.', None)]
+    client.chat.completions.create.return_value = iter(chunks)
+
+    events = list(agent.stream_followup('Who owns the .com?', RESEARCH, None, 'test-key'))
+
+    assert events == [{'delta': 'Tak'}, {'delta': 'en.'}, {'answer': 'Taken.'}]
+    assert agent.answer_followup('Who owns the .com?', RESEARCH, None, 'test-key') == {'answer': 'Taken.'}
+    assert client.chat.completions.create.call_count == 1
+
+# --- Test batched questions --- #
+
+def test_batch_answers_questions_in_one_request(client, mocker):
+    """Test that several questions share one request and come back in order."""
+    agent = QAAgent()
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+    client.chat.completions.create.return_value = fake_completion('{"answers": ["Taken.", "Available."]}')
+
+    results = agent.answer_followups_batch(['Who owns the .com?', 'Who owns the .io?'], RESEARCH, None, 'test-key')
+
+    assert results == [{'answer': 'Taken.'}, {'answer': 'Available.'}]
+    assert client.chat.completions.create.call_count == 1
+
+def test_batch_falls_back_to_single_questions(client, mocker):
+    """Test that an unparseable batched response is retried one question at a time."""
+    agent = QAAgent()
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+    client.chat.completions.create.return_value = fake_completion('not json')
+    single = mocker.patch.object(agent, 'answer_followups', return_value=[{'answer': 'A'}, {'answer': 'B'}])
+
+    results = agent.answer_followups_batch(['Q1?', 'Q2?'], RESEARCH, None, 'test-key')
+
+    assert results == [{'answer': 'A'}, {'answer': 'B'}]
+    single.assert_called_once()
+
+# --- Test context budget --- #
+
+def test_large_context_keeps_only_relevant_parts():
+    """Test that an over-budget context drops the social statuses unless the question is about social media."""
+    agent = QAAgent(context_budget_tokens=100)
+    research = dict(RESEARCH, social_media_search={'platform_results': {f'Platform{n}': 'used_mentioned' for n in range(50)}})
+
+    domain_prompt = agent._construct_qa_messages('Is the .com taken?', research, None)[1]['content']
+    social_prompt = agent._construct_qa_messages('Is the Twitter handle free?', research, None)[1]['content']
+
+    assert 'acme.com' in domain_prompt and 'Platform0' not in domain_prompt
+    assert 'Platform0' in social_prompt
+
+# --- Test message layout --- #
+
+def test_messages_put_the_question_after_the_shared_prefix():
+    """Test that instructions and context come first, and only Anthropic messages get cache markers."""
+    openai_messages = QAAgent()._construct_qa_messages('Is the .com taken?', RESEARCH, None)
+    anthropic_messages = QAAgent(provider='anthropic')._construct_qa_messages('Is the .com taken?', RESEARCH, None)
+
+    assert [m['role'] for m in openai_messages] == ['system', 'user', 'user']
+    assert openai_messages[2]['content'].endswith('Is the .com taken?')
+    assert [m['content'][0]['cache_control'] for m in anthropic_messages[:2]] == [{'type': 'ephemeral'}] * 2
+    assert anthropic_messages[2] == openai_messages[2]
+
+# --- Test question routing --- #
+
+def test_domain_lookup_is_answered_without_the_llm(client, mocker):
+    """Test that a domain status question is read straight off the research data."""
+    agent = QAAgent()
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+
+    result = agent.answer_followup('Is the .com available?', RESEARCH, None, 'test-key')
+
+    assert result == {'answer': 'According to the analysis, **acme.com** is taken (it is registered).'}
+    client.chat.completions.create.assert_not_called()
+
+def test_domain_lookup_matches_whole_domains_only():
+    """Test that direct answers need an exact domain or a standalone TLD, not a substring of another host."""
+    agent = QAAgent()
+    research = dict(RESEARCH, domain_availability={'acme.com': 'taken', 'acme.co': 'potentially_available'})
+
+    assert '**acme.com**' in agent._direct_answer('Is acme.com available?', research)
+    assert '**acme.co**' in agent._direct_answer('Is the .co free?', research)
+    assert agent._direct_answer('Is the name available on instagram.com?', research) is None
+    assert agent._direct_answer('Is the handle free on x.com?', research) is None
+
+def test_lookups_use_the_cheaper_model(client, mocker):
+    """Test that plain lookups go to the lookup model and suggestions to the main model."""
+    agent = QAAgent(model='gpt-4o', lookup_model='gpt-4o-mini')
+    mocker.patch.object(agent, '_get_openai_client', return_value=client)
+
+    agent.answer_followup('Which trademark database was checked?', RESEARCH, None, 'test-key')
+    agent.answer_followup('Suggest 3 alternative names.', RESEARCH, None, 'test-key')
+
+    assert [c.kwargs['model'] for c in client.chat.completions.create.call_args_list] == ['gpt-4o-mini', 'gpt-4o']
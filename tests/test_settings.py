@@ -0,0 +1,17 @@
+# --- Test /api/settings Endpoint --- #
+
+def test_settings_save_and_clear_keys(client):
+    """Test that keys are saved to the session, reported as set, and cleared by an empty value."""
+    response = client.post('/api/settings', json={'openai_key': 'sk-test', 'brave_key': 'brave-test'})
+    assert response.get_json()['success'] is True
+    with client.session_transaction() as sess:
+        assert (sess.get('USER_OPENAI_KEY'), sess.get('USER_BRAVE_KEY')) == ('sk-test', 'brave-test')
+
+    client.post('/api/settings', json={'openai_key': ''})
+    status = client.get('/api/settings').get_json()
+    assert (status['openai_key_set'], status['brave_key_set']) == (False, True)
+
+def test_settings_rejects_non_object_body(client):
+    """Test that a JSON body that isn't an object is rejected."""
+    response = client.post('/api/settings', json=['sk-test'])
+    assert response.status_code == 400
@@ -0,0 +1,164 @@
+# brand_navigator/utils/analysis_store.py
+
+import dataclasses
+import hashlib
+import json
+import logging
+
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None # Falls back to the stdlib json module
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+def _default(value):
+    """JSON fallback for values the stdlib encoder doesn't know (research dataclasses, datetimes)."""
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+def _dumps(analysis: dict) -> bytes:
+    """Sorted-key JSON, so the same analysis always hashes to the same key."""
+    if orjson:
+        return orjson.dumps(analysis, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(analysis, sort_keys=True, separators=(",", ":"), default=_default).encode()
+
+
+_loads = orjson.loads if orjson else json.loads
+
+
+class AnalysisStore:
+    """
+    Keeps the analysis context (research and evaluation data) that follow-up questions are answered from.
+
+    Each analysis gets a content-hash key, kept in the session, and a decoded copy in a local in-process
+    cache: follow-ups served by this process get the same objects every time, so the QA agent renders
+    their prompt context once per analysis rather than once per question.
+    With a Redis client, the analysis is also stored once in Redis under that key with a TTL, and the
+    session only holds the key: session loads and saves stay small, and other processes decode the
+    analysis from one Redis GET. Without Redis, the data also stays in the session itself, as no other
+    store is shared by every worker.
+    Saving an analysis identical to the one the session already points at leaves the session untouched,
+    so a repeat analysis doesn't rewrite it.
+    """
+
+    _SESSION_KEY = 'analysis_key'
+
+    def __init__(self, redis_client=None, ttl: int = 1800, local_size: int = 128):
+        """
+        Args:
+            redis_client (redis.Redis, optional): Shared store. None keeps the analysis in the session.
+            ttl (int): Seconds an analysis is kept after it was stored.
+            local_size (int): Decoded analyses kept in-process (in front of Redis or the session).
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=local_size, ttl=ttl)
+
+    def save(self, session, brand_name: str, research_data: dict, evaluation_data: dict | None):
+        """Stores the analysis for follow-up questions and points the session at it."""
+        payload = _dumps({'research_data': research_data, 'evaluation_data': evaluation_data})
+        key = "analysis:" + hashlib.blake2b(payload, digest_size=16).hexdigest()
+        if self._local.get(key) is None:
+            self._local.set(key, _loads(payload)) # Decoded form, same as a later Redis or session read
+        shared = False
+        if self.redis is not None:
+            try:
+                self.redis.set(key, payload, ex=self.ttl) # Also restarts the TTL of an unchanged analysis
+                shared = True
+            except redis.RedisError as e:
+                logger.warning("Could not store the analysis in Redis (%s); keeping it in the session.", e)
+        # Same analysis already referenced (and stored the same way): don't modify the session
+        if (session.get(self._SESSION_KEY) == key and session.get('analyzed_brand') == brand_name
+                and ('research_data' in session) != shared):
+            return
+        self.clear(session)
+        session['analyzed_brand'] = brand_name
+        session[self._SESSION_KEY] = key
+        if not shared: # No store shared by every worker: keep the data in the session itself
+            session['research_data'] = research_data
+            session['evaluation_data'] = evaluation_data
+
+    def load(self, session) -> tuple[dict | None, dict | None, str | None]:
+        """Returns (research_data, evaluation_data, analyzed_brand) for the session; research_data is None if missing."""
+        brand_name = session.get('analyzed_brand')
+        key = session.get(self._SESSION_KEY)
+        if key:
+            analysis = self._local.get(key)
+            if analysis is None and self.redis is not None:
+                try:
+                    payload = self.redis.get(key)
+                except redis.RedisError as e:
+                    logger.warning("Could not read the analysis from Redis: %s", e)
+                    payload = None
+                if payload is not None:
+                    analysis = _loads(payload)
+                    self._local.set(key, analysis)
+            if analysis is not None:
+                return analysis['research_data'], analysis['evaluation_data'], brand_name
+        # Another process's analysis (session backend), or expired from Redis (no data: analyze again)
+        return session.get('research_data'), session.get('evaluation_data'), brand_name
+
+    def clear(self, session):
+        """Forgets the session's analysis (the shared copy expires on its own)."""
+        for name in (self._SESSION_KEY, 'research_data', 'evaluation_data', 'analyzed_brand'):
+            if name in session: # Popping a missing key still marks the session modified
+                session.pop(name)
+
+
+class AnalysisCache:
+    """
+    Finished analyses by key (see routes.analysis), so repeat analyses of a brand skip the agents.
+    With a Redis client they're shared by every worker and instance under the `analysis-cache:` prefix;
+    a local TTLCache keeps decoded copies in front either way. Same interface as TTLCache (get/set/stats).
+    """
+
+    _PREFIX = 'analysis-cache:'
+
+    def __init__(self, redis_client=None, ttl: int = 1800, local_size: int = 256):
+        """
+        Args:
+            redis_client (redis.Redis, optional): Shared store. None keeps the cache in-process only.
+            ttl (int): Seconds an analysis is served from the cache.
+            local_size (int): Decoded analyses kept in-process.
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=local_size, ttl=ttl)
+
+    def get(self, key: str, default=None):
+        """Returns the cached analysis for `key`, or `default`."""
+        value = self._local.get(key)
+        if value is None and self.redis is not None:
+            try:
+                payload = self.redis.get(self._PREFIX + key)
+            except redis.RedisError as e:
+                logger.warning("Could not read the analysis cache from Redis: %s", e)
+                payload = None
+            if payload is not None:
+                value = _loads(payload)
+                self._local.set(key, value)
+        return default if value is None else value
+
+    def set(self, key: str, value: dict):
+        """Caches `value` (JSON-serializable) under `key`, locally and in Redis if configured."""
+        self._local.set(key, value)
+        if self.redis is not None:
+            try:
+                self.redis.set(self._PREFIX + key, _dumps(value), ex=self.ttl)
+            except redis.RedisError as e:
+                logger.warning("Could not store the analysis cache in Redis: %s", e)
+
+    def stats(self) -> dict:
+        """The local cache's counters (lookups it missed went to Redis, if shared)."""
+        return dict(self._local.stats(), shared=self.redis is not None)
@@ -0,0 +1,127 @@
+# brand_navigator/utils/cache.py
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache with an optional time-to-live per entry.
+    Used to memoize expensive network/LLM results in-process.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None):
+        """
+        Args:
+            maxsize (int): Maximum number of entries; the least recently used entry is evicted first.
+            ttl (float | None): Default lifetime of an entry in seconds. None means entries never expire.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict() # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Returns the cached value for `key`, or `default` if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        """Stores `value` under `key`, using `ttl` (seconds) instead of the cache default if given."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Removes `key` and returns its value (or `default`)."""
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters since the cache was created, for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over embedding vectors: a lookup returns the value stored for the most similar
+    vector if its cosine similarity reaches `threshold`. Entries live in separate namespaces (e.g. one per
+    brand name) so near-identical inputs about different keys never match. Pure Python linear scan, which
+    is fast enough for the few thousand entries kept in-process.
+    """
+
+    def __init__(self, maxsize: int = 1024, threshold: float = 0.97):
+        """
+        Args:
+            maxsize (int): Maximum number of entries per namespace; the oldest entry is dropped first.
+            threshold (float): Minimum cosine similarity for a lookup to count as a hit.
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries = {} # namespace -> deque of (unit vector, value)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(vector) -> tuple:
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return tuple(x / norm for x in vector)
+
+    def get(self, vector, namespace=None, default=None):
+        """Returns the value of the most similar stored vector in `namespace`, or `default` below the threshold."""
+        query = self._unit(vector)
+        with self._lock:
+            entries = list(self._entries.get(namespace, ()))
+        best_score, best_value = self.threshold, default
+        for stored, value in entries:
+            score = sum(a * b for a, b in zip(query, stored))
+            if score >= best_score:
+                best_score, best_value = score, value
+        return best_value
+
+    def set(self, vector, value, namespace=None):
+        """Stores `value` under `vector` in `namespace`."""
+        with self._lock:
+            entries = self._entries.setdefault(namespace, deque(maxlen=self.maxsize))
+            entries.append((self._unit(vector), value))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
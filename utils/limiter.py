@@ -0,0 +1,52 @@
+# brand_navigator/utils/limiter.py
+
+import logging
+import threading
+
+from flask import jsonify
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimiter:
+    """
+    Caps how many LLM-bound requests (analyses, follow-up questions) a process serves at once.
+    A request that can't get a slot within `timeout` is refused right away (the routes answer 503)
+    instead of queueing: past a point, more requests in flight only add contention, timeouts and retries
+    against the OpenAI and Brave rate limits, and raise the latency of every request.
+    """
+
+    def __init__(self, limit: int = 8, timeout: float = 0.1):
+        """
+        Args:
+            limit (int): Requests allowed in flight at once in this process.
+            timeout (float): Seconds to wait for a free slot before giving up.
+        """
+        self.limit = limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        """Takes a slot, waiting at most `timeout`. Returns False (and counts a rejection) if none freed up."""
+        if self._slots.acquire(timeout=self.timeout):
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """Gives back a slot taken by `try_acquire`."""
+        self._slots.release()
+
+
+def too_busy_response():
+    """The 503 the routes return when `ConcurrencyLimiter.try_acquire` fails."""
+    logger.warning("Too many LLM-bound requests in progress; refusing this one.")
+    response = jsonify({
+        'success': False,
+        'error': 'Server Busy',
+        'details': 'Too many analyses and questions are in progress. Please try again in a moment.'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
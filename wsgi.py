@@ -0,0 +1,22 @@
+# brand_navigator/wsgi.py
+"""
+Production entry point for gunicorn with gevent workers:
+
+    gunicorn -k gevent -w 4 --worker-connections 1000 --preload -b 0.0.0.0:5001 wsgi:app
+
+Each gevent worker serves many requests at once, switching between them while they wait on
+Brave, WHOIS or OpenAI, instead of one request per worker as with sync workers or `flask run`.
+"""
+
+# Patch the standard library (sockets, ssl, threading, time.sleep) before anything else is imported,
+# so `requests`, httpx and the OpenAI SDK yield to other requests while waiting on the network, and
+# the locks created at import (caches, connection pools) are gevent-aware.
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:
+    pass # Plain sync/threaded workers (e.g. `gunicorn -w 4 --threads 8 wsgi:app`) need no patching
+
+from app import app # noqa: E402  (must come after monkey-patching)
+
+__all__ = ['app']